@@ -1,50 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
-import json
-
-# Load team data from a JSON file
-def load_team_data(file_path):
-    with open(file_path, 'r') as file:
-        data = json.load(file)
-    return data['teams']
-
-# Initialize team standings
-def initialize_standings(teams):
-    standings = {team['name']: {
-        'wins': 0,
-        'losses': 0,
-        'ties': 0,
-        'division_wins': 0,
-        'conference_wins': 0,
-        'points_scored': 0,
-        'points_allowed': 0
-    } for team in teams}
-    return standings
-
-# Update standings based on game results
-def update_standings(standings, game_result):
-    home_team = game_result['home_team']
-    away_team = game_result['away_team']
-    home_score = game_result['home_score']
-    away_score = game_result['away_score']
-
-    if home_score > away_score:
-        standings[home_team]['wins'] += 1
-        standings[away_team]['losses'] += 1
-    elif away_score > home_score:
-        standings[away_team]['wins'] += 1
-        standings[home_team]['losses'] += 1
-    else:
-        standings[home_team]['ties'] += 1
-        standings[away_team]['ties'] += 1
-
-    standings[home_team]['points_scored'] += home_score
-    standings[home_team]['points_allowed'] += away_score
-    standings[away_team]['points_scored'] += away_score
-    standings[away_team]['points_allowed'] += home_score
+from league import load_team_data, load_league_config, initialize_standings, update_standings
 
 # Function to create the GUI
-def create_gui(teams):
+def create_gui(teams, config):
     root = tk.Tk()
     root.title("NFL Playoff Machine")
 
@@ -63,7 +22,7 @@ def create_gui(teams):
     tab_frame.pack(side='top', fill='x')
 
     # Create a grid layout for the tabs
-    for week in range(1, 18):
+    for week in range(1, config.weeks + 1):
         tab = ttk.Frame(tab_control)
         row = (week - 1) // 4
         col = (week - 1) % 4
@@ -76,7 +35,7 @@ def create_gui(teams):
         tk.Label(tab, text="Away Team").grid(row=0, column=1, padx=5, pady=5)
         tk.Label(tab, text="Result").grid(row=0, column=2, padx=5, pady=5)
 
-        for game in range(16):
+        for game in range(config.games_per_week):
             home_team_var = tk.StringVar()
             away_team_var = tk.StringVar()
             result_var = tk.StringVar()
@@ -102,8 +61,9 @@ def main():
     team_data_file = 'team_data.json'  # Ensure this path is correct
     teams = load_team_data(team_data_file)
     standings = initialize_standings(teams)
+    config = load_league_config(team_data_file, teams)
 
-    create_gui(teams)
+    create_gui(teams, config)
 
 if __name__ == "__main__":
     main()
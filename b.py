@@ -137,9 +137,9 @@ def load_game_data_with_gui(file_path, standings_tab, playoff_picture_tab, teams
         global standings
         standings = loaded_data['standings']
         week_data = loaded_data['week_data']
+        # Redraw the existing tabs in place rather than opening a second Tk root
         display_standings(standings_tab, standings, teams)
         update_playoff_picture(playoff_picture_tab, standings, teams)
-        create_gui(teams)  # Recreate GUI with loaded data
     else:
         print("No 'standings' data found in loaded data.")
 
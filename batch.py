@@ -0,0 +1,102 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from league import evaluate, load_league_config, load_team_data, read_scenario
+from schedule_import import TeamIndex
+
+CSV_FIELDS = ('scenario', 'rank', 'team', 'conference', 'division', 'wins', 'losses', 'ties', 'seed',
+              'playoffs', 'division_title', 'top_seed')
+
+# Per-process state set once by the pool initializer instead of being pickled with every task
+_worker = {}
+
+
+def _init_worker(team_data_file):
+    _worker['teams'] = load_team_data(team_data_file)
+    _worker['index'] = TeamIndex(_worker['teams'])
+    _worker['config'] = load_league_config(team_data_file, _worker['teams'])
+
+
+def evaluate_file(path, num_samples, seed):
+    try:
+        results, schedule = read_scenario(path, _worker['index'])
+        report = evaluate(_worker['teams'], results, schedule, num_samples, seed, _worker['config'].wildcards)
+    except Exception as error:
+        return {'scenario': path, 'error': f"{type(error).__name__}: {error}"}
+    return dict(scenario=path, **report)
+
+
+def csv_rows(report):
+    seeds = {name: seed for seeded in report['seeds'].values() for seed, name in enumerate(seeded, start=1)}
+    odds = report['odds'] or {}
+    for row in report['standings']:
+        team_odds = odds.get(row['team'])
+        yield {
+            'scenario': report['scenario'], 'rank': row['rank'], 'team': row['team'],
+            'conference': row['conference'], 'division': row['division'],
+            'wins': row['wins'], 'losses': row['losses'], 'ties': row['ties'],
+            'seed': seeds.get(row['team'], ''),
+            'playoffs': f"{team_odds['playoffs']:.4f}" if team_odds else '',
+            'division_title': f"{team_odds['division_title']:.4f}" if team_odds else '',
+            'top_seed': f"{team_odds['seeds'][0]:.4f}" if team_odds else '',
+        }
+
+
+def expand(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        paths.extend(matches if matches else [pattern])
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate scenario files without the GUI and write seeds, "
+                                                 "standings and playoff odds as each one finishes.")
+    parser.add_argument('scenarios', nargs='+', help="scenario files (.json, .csv or .jsonl) or glob patterns")
+    parser.add_argument('--teams', default='team_data.json', help="team data file")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl',
+                        help="one JSON object per scenario, or one CSV row per team and scenario")
+    parser.add_argument('--output', default='-', help="output file, '-' for stdout")
+    parser.add_argument('--samples', type=int, default=0, help="simulated seasons per scenario for odds, 0 to skip")
+    parser.add_argument('--seed', type=int, default=None, help="random seed so odds are reproducible")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    paths = expand(args.scenarios)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    writer = None
+    if args.format == 'csv':
+        writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+    failures = 0
+    workers = min(args.workers or os.cpu_count() or 1, len(paths))
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(args.teams,)) as pool:
+            futures = [pool.submit(evaluate_file, path, args.samples, args.seed) for path in paths]
+            # Written in completion order so long runs show results as soon as they exist
+            for future in as_completed(futures):
+                report = future.result()
+                if 'error' in report:
+                    failures += 1
+                    print(f"{report['scenario']}: {report['error']}", file=sys.stderr)
+                    if writer is None:
+                        output.write(json.dumps(report) + '\n')
+                elif writer is None:
+                    output.write(json.dumps(report) + '\n')
+                else:
+                    writer.writerows(csv_rows(report))
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from league import calculate_standings, initialize_standings, update_standings
+from season_engine import SeasonEngine
+from session_store import SessionStore, restore_engine
+
+# Times the engine hot paths and GUI startup on synthetic leagues of growing size, writes the
+# timings as JSON and, given a baseline from an earlier run, fails on slowdowns past a threshold.
+
+DEFAULT_SIZES = (32, 256, 1024, 4096)
+
+
+# Teams in the team_data.json schema, spread evenly over conferences and divisions
+def synthetic_league(num_teams, num_conferences=2, divisions_per_conference=4):
+    teams = []
+    groups = num_conferences * divisions_per_conference
+    for idx in range(num_teams):
+        group = idx % groups
+        teams.append({
+            'name': f"Team {idx:05d}",
+            'abbreviation': f"T{idx:04d}",
+            'logo': f"logos/Team {idx:05d}.png",
+            'conference': f"C{group // divisions_per_conference + 1}",
+            'division': f"D{group % divisions_per_conference + 1}",
+        })
+    return teams
+
+
+# Scored games for a season where every team plays once a week against a random opponent
+def synthetic_season(teams, num_weeks=17, seed=0):
+    rng = random.Random(seed)
+    names = [team['name'] for team in teams]
+    weeks = {}
+    for week in range(1, num_weeks + 1):
+        rng.shuffle(names)
+        weeks[week] = [{'home_team': names[idx], 'away_team': names[idx + 1],
+                        'home_score': rng.randint(0, 45), 'away_score': rng.randint(0, 45)}
+                       for idx in range(0, len(names) - 1, 2)]
+    return weeks
+
+
+# Best of several runs; setup() output is passed to fn and is not timed
+def measure(fn, setup=None, repeats=3):
+    best = None
+    for _ in range(repeats):
+        argument = setup() if setup is not None else None
+        gc.collect()
+        start = time.perf_counter()
+        fn(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def engine_for(teams, weeks):
+    engine = SeasonEngine(teams)
+    for week, games in weeks.items():
+        for game, game_result in enumerate(games):
+            engine.set_result(week, game, game_result)
+    return engine
+
+
+def bench_league(num_teams, repeats):
+    teams = synthetic_league(num_teams)
+    weeks = synthetic_season(teams)
+    games = [game for week in weeks.values() for game in week]
+    engine = engine_for(teams, weeks)
+    week_data = {week: [dict(home_team=game['home_team'], away_team=game['away_team'], result='')
+                        for game in games_of_week] for week, games_of_week in weeks.items()}
+
+    def replay(standings):
+        for game_result in games:
+            update_standings(standings, game_result)
+
+    def standings_after_season():
+        standings = initialize_standings(teams)
+        replay(standings)
+        return standings
+
+    def cold_seeds(engine):
+        engine._seeds.clear()
+        engine.playoff_teams()
+
+    def reset_seeds():
+        engine._seeds.clear()
+        return engine
+
+    results = {
+        'update_standings': measure(replay, lambda: initialize_standings(teams), repeats),
+        'calculate_standings': measure(lambda standings: calculate_standings(teams, standings), standings_after_season,
+                                       repeats),
+        'engine_replay': measure(lambda _: engine_for(teams, weeks), None, repeats),
+        'playoff_seeding': measure(cold_seeds, reset_seeds, repeats),
+    }
+
+    directory = tempfile.mkdtemp(prefix='bench-')
+    try:
+        path = os.path.join(directory, 'game_data.json')
+
+        def save(session):
+            session.compact(week_data, engine)
+
+        def load(session):
+            restore_engine(teams, session.load())
+
+        results['save'] = measure(save, lambda: SessionStore(path), repeats)
+        results['load'] = measure(load, lambda: SessionStore(path), repeats)
+    finally:
+        shutil.rmtree(directory)
+    return results
+
+
+# Build the GUI once in this process, without entering the main loop, and print the seconds taken
+def gui_child(team_data_file):
+    import tkinter as tk
+    import c
+
+    tk.Misc.mainloop = lambda self, n=0: self.destroy()
+    directory = tempfile.mkdtemp(prefix='bench-gui-')
+    try:
+        teams = c.load_team_data(team_data_file)
+        c.config = c.load_league_config(team_data_file, teams)
+        c.session = SessionStore(os.path.join(directory, 'game_data.json'), num_weeks=c.config.weeks,
+                                 games_per_week=c.config.games_per_week)
+        c.seed_cache = None
+        c.team_index = c.TeamIndex(teams)
+        c.load_session(teams)
+        start = time.perf_counter()
+        c.create_gui(teams)
+        print(json.dumps({'seconds': time.perf_counter() - start}))
+    finally:
+        c.session.close()
+        shutil.rmtree(directory)
+
+
+# Cold create_gui in fresh interpreters, on the current display or a private Xvfb one
+def bench_gui(teams, repeats):
+    directory = tempfile.mkdtemp(prefix='bench-gui-')
+    xvfb = None
+    env = dict(os.environ)
+    try:
+        team_data_file = os.path.join(directory, 'team_data.json')
+        with open(team_data_file, 'w') as file:
+            json.dump({'teams': teams}, file)
+        if not env.get('DISPLAY'):
+            if shutil.which('Xvfb') is None:
+                return None, "no DISPLAY and Xvfb is not installed"
+            xvfb = subprocess.Popen(['Xvfb', ':97', '-nolisten', 'tcp'], stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL)
+            env['DISPLAY'] = ':97'
+            time.sleep(1)
+        best = None
+        for _ in range(repeats):
+            child = subprocess.run([sys.executable, os.path.abspath(__file__), '--gui-child', team_data_file],
+                                   env=env, cwd=directory, capture_output=True, text=True)
+            if child.returncode != 0:
+                return None, child.stderr.strip().splitlines()[-1] if child.stderr.strip() else "create_gui failed"
+            seconds = json.loads(child.stdout.strip().splitlines()[-1])['seconds']
+            best = seconds if best is None else min(best, seconds)
+        return best, None
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+        shutil.rmtree(directory)
+
+
+# Entries of current slower than baseline by more than the allowed factor
+def regressions(current, baseline, threshold):
+    previous = {(entry['name'], entry['teams']): entry['seconds'] for entry in baseline['results']}
+    slower = []
+    for entry in current['results']:
+        before = previous.get((entry['name'], entry['teams']))
+        if before and entry['seconds'] > before * threshold:
+            slower.append(dict(entry, baseline=before, ratio=entry['seconds'] / before))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark standings, seeding, save/load and GUI startup.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="league sizes in teams")
+    parser.add_argument('--repeats', type=int, default=3, help="runs per measurement, the best one is kept")
+    parser.add_argument('--output', default='bench_output.txt', help="JSON results file, '-' for stdout")
+    parser.add_argument('--baseline', help="earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="fail when a timing exceeds the baseline by this factor")
+    parser.add_argument('--teams', default='team_data.json', help="team data file the GUI is built with")
+    parser.add_argument('--no-gui', action='store_true', help="skip the create_gui measurement")
+    parser.add_argument('--gui-child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.gui_child:
+        gui_child(args.gui_child)
+        return 0
+
+    report = {'python': sys.version.split()[0], 'repeats': args.repeats, 'results': [], 'skipped': []}
+    for num_teams in args.sizes:
+        for name, seconds in bench_league(num_teams, args.repeats).items():
+            report['results'].append({'name': name, 'teams': num_teams, 'seconds': seconds})
+            print(f"{name:<20} {num_teams:>6} teams {seconds * 1000:10.2f} ms", file=sys.stderr)
+    if not args.no_gui:
+        # The GUI lays out the standard league only
+        with open(args.teams, 'r') as file:
+            teams = json.load(file)['teams']
+        seconds, reason = bench_gui(teams, args.repeats)
+        if seconds is None:
+            report['skipped'].append({'name': 'create_gui', 'reason': reason})
+            print(f"create_gui skipped: {reason}", file=sys.stderr)
+        else:
+            report['results'].append({'name': 'create_gui', 'teams': len(teams), 'seconds': seconds})
+            print(f"{'create_gui':<20} {len(teams):>6} teams {seconds * 1000:10.2f} ms", file=sys.stderr)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            report['regressions'] = regressions(report, json.load(file), args.threshold)
+        for entry in report['regressions']:
+            print(f"REGRESSION {entry['name']} at {entry['teams']} teams: {entry['seconds'] * 1000:.2f} ms vs "
+                  f"{entry['baseline'] * 1000:.2f} ms ({entry['ratio']:.2f}x)", file=sys.stderr)
+        status = 1 if report['regressions'] else 0
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
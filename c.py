@@ -1,141 +1,92 @@
-import tkinter as tk
-from tkinter import ttk
-import json
 import os
-
-# Load team data from a JSON file
-def load_team_data(file_path):
-    with open(file_path, 'r') as file:
-        data = json.load(file)
-    print("Team data loaded successfully.")
-    return data['teams']
-
-# Initialize team standings
-def initialize_standings(teams):
-    standings = {team['name']: {
-        'wins': 0,
-        'losses': 0,
-        'ties': 0,
-        'division_wins': 0,
-        'conference_wins': 0,
-        'points_scored': 0,
-        'points_allowed': 0
-    } for team in teams}
-    return standings
-
-# Update standings based on game results
-def update_standings(standings, game_result):
-    home_team = game_result['home_team']
-    away_team = game_result['away_team']
-    home_score = game_result['home_score']
-    away_score = game_result['away_score']
-
-    if home_score > away_score:
-        standings[home_team]['wins'] += 1
-        standings[away_team]['losses'] += 1
-    elif away_score > home_score:
-        standings[away_team]['wins'] += 1
-        standings[home_team]['losses'] += 1
-    else:
-        standings[home_team]['ties'] += 1
-        standings[away_team]['ties'] += 1
-
-    standings[home_team]['points_scored'] += home_score
-    standings[home_team]['points_allowed'] += away_score
-    standings[away_team]['points_scored'] += away_score
-    standings[away_team]['points_allowed'] += home_score
-
-# Function to calculate standings
-def calculate_standings(teams, standings):
-    sorted_teams = sorted(teams, key=lambda x: (
-        standings[x['name']]['wins'],
-        -standings[x['name']]['losses'],
-        standings[x['name']]['ties'],
-        standings[x['name']]['division_wins'],
-        standings[x['name']]['conference_wins'],
-        standings[x['name']]['points_scored'] - standings[x['name']]['points_allowed'],
-        standings[x['name']]['points_scored']
-    ), reverse=True)
-    return sorted_teams
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from league import load_team_data, load_league_config, remaining_games, remaining_slots, result_scores
+from season_engine import SeasonEngine
+from standings_view import StandingsView, PlayoffPictureView, OddsView, ClinchView, RootingView, DiagnosticsView
+from compute_scheduler import ComputeScheduler
+from session_store import SessionStore, restore_engine
+from standings_store import StandingsStore
+from clinch import ClinchSolver
+from schedule_import import TeamIndex, ScheduleError, import_schedule
+from seeding_cache import SeedingCache, league_shape
+from scenario_branches import ScenarioTree, season_base
+from game_model import EloModel
+from logo_cache import LogoCache
+from instrumentation import profiler, timed
 
 # Function to display standings
-def display_standings(tab, standings, teams):
-    for widget in tab.winfo_children():
-        widget.destroy()
-    sorted_teams = calculate_standings(teams, standings)
-    for idx, team in enumerate(sorted_teams, start=1):
-        tk.Label(tab, text=f"{idx}. {team['name']} (Wins: {standings[team['name']]['wins']}, Losses: {standings[team['name']]['losses']}, Ties: {standings[team['name']]['ties']})").pack()
+@timed('render.standings')
+def display_standings(standings_view, engine):
+    standings_view.render(engine)
 
 # Function to update the GUI with playoff picture
-def update_playoff_picture(tab, standings, teams):
-    for widget in tab.winfo_children():
-        widget.destroy()
-    display_playoff_picture(tab, standings, teams)
+@timed('render.playoff_picture')
+def update_playoff_picture(playoff_view, engine):
+    display_playoff_picture(playoff_view, engine)
 
 # Function to display playoff picture
-def display_playoff_picture(tab, standings, teams):
-    conferences = {'NFC': [], 'AFC': []}
-    for team in teams:
-        conferences[team['conference']].append(team)
-
-    playoff_teams = {'NFC': [], 'AFC': []}
-    for conference, conference_teams in conferences.items():
-        divisions = {team['division'] for team in conference_teams}
-        division_leaders = []
-        for division in divisions:
-            division_teams = [team for team in conference_teams if team['division'] == division]
-            sorted_division_teams = sorted(division_teams, key=lambda x: (
-                standings[x['name']]['wins'],
-                -standings[x['name']]['losses'],
-                standings[x['name']]['ties'],
-                standings[x['name']]['division_wins'],
-                standings[x['name']]['conference_wins'],
-                standings[x['name']]['points_scored'] - standings[x['name']]['points_allowed'],
-                standings[x['name']]['points_scored']
-            ), reverse=True)
-            division_leaders.append(sorted_division_teams[0])
-
-        remaining_teams = [team for team in conference_teams if team not in division_leaders]
-        sorted_remaining_teams = sorted(remaining_teams, key=lambda x: (
-            standings[x['name']]['wins'],
-            -standings[x['name']]['losses'],
-            standings[x['name']]['ties'],
-            standings[x['name']]['division_wins'],
-            standings[x['name']]['conference_wins'],
-            standings[x['name']]['points_scored'] - standings[x['name']]['points_allowed'],
-            standings[x['name']]['points_scored']
-        ), reverse=True)
-        playoff_teams[conference] = division_leaders + sorted_remaining_teams[:3]
-
-    nfc_frame = ttk.Frame(tab)
-    afc_frame = ttk.Frame(tab)
-    nfc_frame.pack(side='left', fill='both', expand=True)
-    afc_frame.pack(side='right', fill='both', expand=True)
-
-    tk.Label(nfc_frame, text="NFC Playoff Picture").pack()
-    for idx, team in enumerate(playoff_teams['NFC'], start=1):
-        tk.Label(nfc_frame, text=f"{idx}. {team['name']} (Wins: {standings[team['name']]['wins']}, Losses: {standings[team['name']]['losses']}, Ties: {standings[team['name']]['ties']})").pack()
-
-    tk.Label(afc_frame, text="AFC Playoff Picture").pack()
-    for idx, team in enumerate(playoff_teams['AFC'], start=1):
-        tk.Label(afc_frame, text=f"{idx}. {team['name']} (Wins: {standings[team['name']]['wins']}, Losses: {standings[team['name']]['losses']}, Ties: {standings[team['name']]['ties']})").pack()
-
-# Function to save game session data to a file
-def save_game_data(file_path, standings):
-    with open(file_path, 'w') as file:
-        json.dump(standings, file)
+def display_playoff_picture(playoff_view, engine):
+    playoff_view.render(engine.playoff_teams(), engine.standings, config.playoff_byes)
+
+# Process pool for playoff odds, started on first use and kept for later refreshes
+simulator = None
+
+# Function to compute playoff odds; runs on the scheduler's worker thread and stops
+# once every team's playoff odds are within half a percentage point
+def compute_playoff_odds(cancelled, teams, standings, games, model, played, num_samples=200000, tolerance=0.005):
+    global simulator
+    if simulator is None:
+        from simulation import ParallelSimulator
+        simulator = ParallelSimulator()
+    # A fixed seed keeps the odds steady when the same picks are recomputed
+    return simulator.run(teams, standings, games, num_samples, num_wildcards=config.wildcards, seed=0,
+                         tolerance=tolerance, cancelled=cancelled, model=model, played=played)
+
+# Function to compute the rooting guide; one simulation answers every team and week
+def compute_rooting_guide(cancelled, teams, standings, slots, model, played, num_samples=20000):
+    from rooting import RootingGuide
+    guide = RootingGuide(teams, standings, slots, num_samples, num_wildcards=config.wildcards, seed=0,
+                         cancelled=cancelled, model=model, played=played)
+    return guide if guide.complete else None
+
+# Function to work out every team's clinch and elimination status; finding the fewest clinching
+# picks can take seconds in midseason, so it runs on the scheduler's worker thread
+def compute_clinch_report(cancelled, teams, standings, games):
+    engine = SeasonEngine(teams, StandingsStore.from_dict(teams, standings), num_wildcards=config.wildcards)
+    return ClinchSolver(engine, games).report(cancelled=cancelled)
+
+# Function to compute one team's rooting report; its best-week replay is too slow for the Tk thread
+def compute_rooting_report(cancelled, guide, name):
+    return guide, name, guide.report(name)
+
+# Function to save game session data: a full snapshot that also empties the journal
+@timed('session.save')
+def save_game_data(session, week_data, engine):
+    session.compact(week_data, engine)
     print("Game data saved successfully.")
 
-# Function to load game session data from a file
-def load_game_data(file_path):
-    if os.path.exists(file_path):
-        with open(file_path, 'r') as file:
-            data = json.load(file)
+# Function to load game session data: the last snapshot with the journal replayed on top
+@timed('session.read')
+def load_game_data(session):
+    data = session.load()
+    if data is not None:
         print("Game data loaded successfully.")
-        return data
     else:
         print("No saved game data found.")
-    return None
+    return data
+
+# Function to replace the current session with the saved one, engine replay included
+@timed('session.load')
+def load_session(teams):
+    global standings, engine, week_data, branches, current_branch, game_model
+    data = load_game_data(session)
+    game_model = EloModel(teams)
+    engine = restore_engine(teams, data, seed_cache, game_model, config.wildcards)
+    standings = engine.standings
+    week_data = data['week_data'] if data else config.empty_week_data()
+    branches = ScenarioTree(season_base(week_data, engine))
+    current_branch = 'main'
 
 # Function to create the GUI
 def create_gui(teams):
@@ -144,126 +95,420 @@ def create_gui(teams):
 
     tab_control = ttk.Notebook(root)
 
-    team_acronyms = [team['abbreviation'] for team in teams]
-    team_names = {team['abbreviation']: team['name'] for team in teams}
+    # Logos are decoded on first display and shared by every row showing them
+    logos = LogoCache(root, teams)
+    ttk.Style(root).configure('Treeview', rowheight=logos.size + 4)
+
+    team_acronyms = team_index.abbreviations
 
-    def autocomplete(event, combobox, team_names):
-        entry = combobox.get().upper()
-        if entry in team_names:
-            combobox.set(team_names[entry])
+    def autocomplete(event, combobox, team_index):
+        name = team_index.lookup(combobox.get())
+        if name is not None:
+            combobox.set(name)
 
     # Create a frame to hold the tabs
     tab_frame = tk.Frame(root)
     tab_frame.pack(side='top', fill='x')
 
-    # Create a grid layout for the tabs
-    for week in range(1, 18):
+    # Create a grid layout for the tabs; their game rows are only built when a week is first shown
+    week_tabs = {}
+    for week in range(1, config.weeks + 1):
         tab = ttk.Frame(tab_control)
         row = (week - 1) // 4
         col = (week - 1) % 4
         tab_button = ttk.Button(tab_frame, text=f"Week {week}", command=lambda t=tab: tab_control.select(t))
         tab_button.grid(row=row, column=col, padx=5, pady=5)
         tab_control.add(tab, text=f"Week {week}")
-
-        # Labels for columns
-        tk.Label(tab, text="Home Team").grid(row=0, column=0, padx=5, pady=5)
-        tk.Label(tab, text="Away Team").grid(row=0, column=1, padx=5, pady=5)
-        tk.Label(tab, text="Result").grid(row=0, column=2, padx=5, pady=5)
-
-        for game in range(16):
+        week_tabs[str(tab)] = week
+
+    # One set of game rows shared by every week tab, re-gridded into whichever week is selected.
+    # Their parent is the notebook so they can be managed inside any of its tabs.
+    game_rows = []
+    current_week = [None]
+
+    def store_field(game, field, var):
+        if current_week[0] is not None:
+            week_data[current_week[0]][game][field] = var.get()
+
+    def show_logo(label, var):
+        name = team_index.lookup(var.get())
+        label.configure(image=(logos.team_logo(name) if name else None) or '')
+
+    def build_game_rows():
+        # Each row is (widget, week_data field) pairs; logo labels have no field
+        headers = [(tk.Label(tab_control, text=text), None) for text in ("", "Home Team", "", "Away Team", "Result")]
+        game_rows.append(headers)
+        for game in range(config.games_per_week):
             home_team_var = tk.StringVar()
             away_team_var = tk.StringVar()
             result_var = tk.StringVar()
 
             # Create Combobox with team acronyms for autocomplete
-            home_team_menu = ttk.Combobox(tab, textvariable=home_team_var, values=team_acronyms)
-            home_team_menu.grid(row=game + 1, column=0, padx=5, pady=5)
-            home_team_menu.bind('<FocusOut>', lambda e, c=home_team_menu: autocomplete(e, c, team_names))
+            home_team_menu = ttk.Combobox(tab_control, textvariable=home_team_var, values=team_acronyms)
+            home_team_menu.bind('<FocusOut>', lambda e, c=home_team_menu: autocomplete(e, c, team_index))
 
-            away_team_menu = ttk.Combobox(tab, textvariable=away_team_var, values=team_acronyms)
-            away_team_menu.grid(row=game + 1, column=1, padx=5, pady=5)
-            away_team_menu.bind('<FocusOut>', lambda e, c=away_team_menu: autocomplete(e, c, team_names))
+            away_team_menu = ttk.Combobox(tab_control, textvariable=away_team_var, values=team_acronyms)
+            away_team_menu.bind('<FocusOut>', lambda e, c=away_team_menu: autocomplete(e, c, team_index))
 
-            result_menu = ttk.Combobox(tab, textvariable=result_var)
+            result_menu = ttk.Combobox(tab_control, textvariable=result_var)
             result_menu['values'] = ["Home Win", "Away Win", "Tie"]
-            result_menu.grid(row=game + 1, column=2, padx=5, pady=5)
+
+            home_logo = tk.Label(tab_control)
+            away_logo = tk.Label(tab_control)
+            home_team_var.trace_add('write', lambda *args, l=home_logo, v=home_team_var: show_logo(l, v))
+            away_team_var.trace_add('write', lambda *args, l=away_logo, v=away_team_var: show_logo(l, v))
+
+            # Entries are kept in week_data, the widgets only mirror the week on screen
+            for field, var in (('home_team', home_team_var), ('away_team', away_team_var), ('result', result_var)):
+                var.trace_add('write', lambda *args, g=game, f=field, v=var: store_field(g, f, v))
 
             # Update standings when result is selected
-            result_menu.bind('<<ComboboxSelected>>', lambda e, h=home_team_var, a=away_team_var, r=result_var: record_game_result(h, a, r))
+            result_menu.bind('<<ComboboxSelected>>', lambda e, h=home_team_var, a=away_team_var, r=result_var, g=game: on_result_selected(h, a, r, g))
+            # A final score such as "24-17" (home-away) can also be typed in
+            result_menu.bind('<Return>', lambda e, h=home_team_var, a=away_team_var, r=result_var, g=game: on_result_selected(h, a, r, g))
+            game_rows.append([(home_logo, None), (home_team_menu, 'home_team'), (away_logo, None),
+                              (away_team_menu, 'away_team'), (result_menu, 'result')])
+
+    # Record the pick, then refresh both views in place
+    def on_result_selected(home_team_var, away_team_var, result_var, game):
+        record_game_result(home_team_var, away_team_var, result_var, current_week[0], game)
+        update_all(standings_view, playoff_view, engine)
+        request_odds()
+
+    # Odds run in the background on a snapshot; rapid picks collapse into one run
+    def request_odds():
+        snapshot = (teams, engine.standings.to_dict(), remaining_games(week_data, engine.standings), game_model.copy(),
+                    list(engine.slots.values()))
+        scheduler.submit('odds', compute_playoff_odds, snapshot, callback=show_odds)
+        # The rooting guide and clinch statuses go stale with the odds
+        request_rooting()
+        request_clinch()
+
+    def show_odds(odds):
+        if odds is not None:
+            with profiler.span('render.odds'):
+                odds_view.render(teams, odds)
+
+    def show_week(week, tab):
+        if not game_rows:
+            build_game_rows()
+        current_week[0] = None
+        for row, widgets in enumerate(game_rows):
+            for col, (widget, field) in enumerate(widgets):
+                widget.grid(in_=tab, row=row, column=col, padx=5, pady=5)
+                widget.lift(tab)
+                if row and field:
+                    widget.set(week_data[week][row - 1].get(field, ''))
+        current_week[0] = week
+
+    def on_tab_changed(event):
+        tab = tab_control.select()
+        if tab in week_tabs:
+            show_week(week_tabs[tab], tab)
+        elif tab == str(rooting_tab):
+            if rooting['guide'] is None:
+                request_rooting()
+            else:
+                show_rooting()
+        elif tab == str(clinch_tab):
+            if clinch['report'] is None:
+                request_clinch()
+        elif tab == str(diagnostics_tab):
+            show_diagnostics()
+
+    # Redraw everything after the session was replaced
+    def refresh_all():
+        refresh_branches()
+        on_tab_changed(None)
+        update_all(standings_view, playoff_view, engine)
+        request_odds()
+
+    tab_control.bind('<<NotebookTabChanged>>', on_tab_changed)
 
     # Add Standings and Playoff Picture tabs
     standings_tab = ttk.Frame(tab_control)
     playoff_picture_tab = ttk.Frame(tab_control)
     tab_control.add(standings_tab, text="Standings")
     tab_control.add(playoff_picture_tab, text="Playoff Picture")
+    odds_tab = ttk.Frame(tab_control)
+    tab_control.add(odds_tab, text="Playoff Odds")
+    standings_view = StandingsView(standings_tab, logos.team_logo)
+    playoff_view = PlayoffPictureView(playoff_picture_tab, logos.team_logo)
+    odds_view = OddsView(odds_tab)
+
+    # Clinched and eliminated teams, worked out only while the tab is on screen
+    clinch_tab = ttk.Frame(tab_control)
+    tab_control.add(clinch_tab, text="Clinching")
+    clinch_view = ClinchView(clinch_tab)
+    clinch = {'report': None}
+
+    def request_clinch():
+        clinch['report'] = None
+        if tab_control.select() == str(clinch_tab):
+            snapshot = (teams, engine.standings.to_dict(), remaining_games(week_data, engine.standings))
+            scheduler.submit('clinch', compute_clinch_report, snapshot, callback=show_clinch)
+
+    def show_clinch(report):
+        if report is not None:
+            clinch['report'] = report
+            with profiler.span('render.clinch'):
+                clinch_view.render(teams, report)
+
+    # Rooting guide for the chosen team, rebuilt only while its tab is on screen
+    rooting_tab = ttk.Frame(tab_control)
+    tab_control.add(rooting_tab, text="Rooting Guide")
+    rooting_controls = tk.Frame(rooting_tab)
+    rooting_controls.pack(side='top', fill='x')
+    ttk.Label(rooting_controls, text="Team").pack(side='left', padx=5, pady=5)
+    rooting_team_var = tk.StringVar(value=teams[0]['name'])
+    rooting_team_menu = ttk.Combobox(rooting_controls, textvariable=rooting_team_var, state='readonly', width=28,
+                                     values=team_index.names)
+    rooting_team_menu.pack(side='left', padx=5)
+    rooting_team_menu.bind('<<ComboboxSelected>>', lambda e: show_rooting())
+    rooting_view = RootingView(rooting_tab)
+    # Reports already worked out for the current guide, by team
+    rooting = {'guide': None, 'reports': {}}
+
+    def request_rooting():
+        rooting['guide'] = None
+        rooting['reports'] = {}
+        if tab_control.select() == str(rooting_tab):
+            snapshot = (teams, engine.standings.to_dict(), remaining_slots(week_data, engine.standings), game_model.copy(),
+                        list(engine.slots.values()))
+            scheduler.submit('rooting', compute_rooting_guide, snapshot, callback=show_rooting)
+
+    def show_rooting(guide=None):
+        if guide is not None:
+            rooting['guide'] = guide
+            rooting['reports'] = {}
+        if rooting['guide'] is None:
+            return
+        name = rooting_team_var.get()
+        if name in rooting['reports']:
+            with profiler.span('render.rooting'):
+                rooting_view.render(rooting['reports'][name])
+        else:
+            scheduler.submit('rooting_report', compute_rooting_report, (rooting['guide'], name), callback=show_report)
+
+    def show_report(result):
+        guide, name, report = result
+        # A report for a guide that was replaced meanwhile is dropped
+        if guide is rooting['guide']:
+            rooting['reports'][name] = report
+            if name == rooting_team_var.get():
+                show_rooting()
+
+    # Diagnostics: where the time went, without an external profiler
+    diagnostics_tab = ttk.Frame(tab_control)
+    tab_control.add(diagnostics_tab, text="Diagnostics")
+    diagnostics_controls = tk.Frame(diagnostics_tab)
+    diagnostics_controls.pack(side='top', fill='x')
+    profiling_var = tk.BooleanVar(value=profiler.enabled)
+    ttk.Checkbutton(diagnostics_controls, text="Enable profiling", variable=profiling_var,
+                    command=lambda: setattr(profiler, 'enabled', profiling_var.get())).pack(side='left', padx=5, pady=5)
+    ttk.Button(diagnostics_controls, text="Refresh", command=lambda: show_diagnostics()).pack(side='left', padx=5)
+    ttk.Button(diagnostics_controls, text="Reset", command=lambda: (profiler.reset(), show_diagnostics())).pack(side='left', padx=5)
+    ttk.Button(diagnostics_controls, text="Export JSON", command=lambda: export_profile(profiler.export_json, ".json")).pack(side='left', padx=5)
+    ttk.Button(diagnostics_controls, text="Export Chrome Trace", command=lambda: export_profile(profiler.export_chrome_trace, ".trace.json")).pack(side='left', padx=5)
+    diagnostics_view = DiagnosticsView(diagnostics_tab)
+
+    def show_diagnostics():
+        diagnostics_view.render(profiler, seed_cache.stats())
+    scheduler = ComputeScheduler(root)
 
     # Add "Show Standings" button
-    show_standings_button = ttk.Button(tab_frame, text="Show Standings", command=lambda: display_standings(standings_tab, standings, teams))
-    show_standings_button.grid(row=5, columnspan=4, padx=5, pady=5)
+    show_standings_button = ttk.Button(tab_frame, text="Show Standings", command=lambda: display_standings(standings_view, engine))
+    # Buttons go below however many rows of week buttons there are
+    button_row = (config.weeks + 3) // 4
+    show_standings_button.grid(row=button_row, columnspan=4, padx=5, pady=5)
 
     # Add "Show Playoff Picture" button
-    show_playoff_picture_button = ttk.Button(tab_frame, text="Show Playoff Picture", command=lambda: update_playoff_picture(playoff_picture_tab, standings, teams))
-    show_playoff_picture_button.grid(row=6, columnspan=4, padx=5, pady=5)
+    show_playoff_picture_button = ttk.Button(tab_frame, text="Show Playoff Picture", command=lambda: update_playoff_picture(playoff_view, engine))
+    show_playoff_picture_button.grid(row=button_row + 1, columnspan=4, padx=5, pady=5)
 
     # Add "Update Standings and Playoff Picture" button
-    update_button = ttk.Button(tab_frame, text="Update Standings and Playoff Picture", command=lambda: update_all(standings_tab, playoff_picture_tab, standings, teams))
-    update_button.grid(row=7, columnspan=4, padx=5, pady=5)
+    update_button = ttk.Button(tab_frame, text="Update Standings and Playoff Picture", command=lambda: (update_all(standings_view, playoff_view, engine), request_odds()))
+    update_button.grid(row=button_row + 2, columnspan=4, padx=5, pady=5)
 
     # Add "Save Game Data" button
-    save_button = ttk.Button(tab_frame, text="Save Game Data", command=lambda: save_game_data('game_data.json', standings))
-    save_button.grid(row=8, columnspan=4, padx=5, pady=5)
+    save_button = ttk.Button(tab_frame, text="Save Game Data", command=lambda: save_game_data(session, week_data, engine))
+    save_button.grid(row=button_row + 3, columnspan=4, padx=5, pady=5)
 
     # Add "Load Game Data" button
-    load_button = ttk.Button(tab_frame, text="Load Game Data", command=lambda: load_game_data('game_data.json'))
-    load_button.grid(row=9, columnspan=4, padx=5, pady=5)
+    load_button = ttk.Button(tab_frame, text="Load Game Data", command=lambda: (load_session(teams), refresh_all()))
+    load_button.grid(row=button_row + 4, columnspan=4, padx=5, pady=5)
 
     # Add "Clear Data" button
-    clear_button = ttk.Button(tab_frame, text="Clear Data", command=lambda: clear_data(teams))
-    clear_button.grid(row=10, columnspan=4, padx=5, pady=5)
-
+    clear_button = ttk.Button(tab_frame, text="Clear Data", command=lambda: clear_data(teams) and refresh_all())
+    clear_button.grid(row=button_row + 5, columnspan=4, padx=5, pady=5)
+
+    # Branch selector: forking is instant and switching replays only the games that differ
+    branch_frame = tk.Frame(tab_frame)
+    branch_frame.grid(row=button_row + 7, columnspan=4, padx=5, pady=5)
+    ttk.Label(branch_frame, text="Scenario").pack(side='left')
+    branch_var = tk.StringVar(value=current_branch)
+    branch_menu = ttk.Combobox(branch_frame, textvariable=branch_var, values=branches.names(), state='readonly', width=16)
+    branch_menu.pack(side='left', padx=5)
+    new_branch_var = tk.StringVar()
+    ttk.Entry(branch_frame, textvariable=new_branch_var, width=16).pack(side='left', padx=5)
+
+    def on_branch_selected(event):
+        switch_branch(branch_var.get())
+        refresh_all()
+
+    def on_fork():
+        if fork_branch(new_branch_var.get()):
+            new_branch_var.set('')
+            refresh_branches()
+
+    def refresh_branches():
+        branch_menu['values'] = branches.names()
+        branch_var.set(current_branch)
+
+    branch_menu.bind('<<ComboboxSelected>>', on_branch_selected)
+    ttk.Button(branch_frame, text="New Branch", command=on_fork).pack(side='left', padx=5)
+
+    # Add "Import Schedule" button
+    import_button = ttk.Button(tab_frame, text="Import Schedule", command=lambda: (import_schedule_file(), refresh_all()))
+    import_button.grid(row=button_row + 6, columnspan=4, padx=5, pady=5)
+
+    def on_close():
+        scheduler.shutdown()
+        if simulator is not None:
+            simulator.shutdown()
+        save_game_data(session, week_data, engine)
+        root.destroy()
+
+    root.protocol('WM_DELETE_WINDOW', on_close)
     tab_control.pack(expand=1, fill='both')
     root.mainloop()
 
 # Function to record game results and update standings
-def record_game_result(home_team_var, away_team_var, result_var):
+@timed('record_game_result')
+def record_game_result(home_team_var, away_team_var, result_var, week, game):
     home_team = home_team_var.get()
     away_team = away_team_var.get()
     result = result_var.get()
-    if home_team and away_team and result:
-        if result == "Home Win":
-            game_result = {'home_team': home_team, 'away_team': away_team, 'home_score': 1, 'away_score': 0}
-        elif result == "Away Win":
-            game_result = {'home_team': home_team, 'away_team': away_team, 'home_score': 0, 'away_score': 1}
-        else:  # Tie
-            game_result = {'home_team': home_team, 'away_team': away_team, 'home_score': 0, 'away_score': 0}
-        update_standings(standings, game_result)
+    if home_team in standings and away_team in standings and result:
+        scores = result_scores(home_team, away_team, result, game_model, (week, game))
+        if scores is None:
+            # Unscorable text leaves the game unplayed, as remaining_slots sees it, so a result the
+            # slot held before is cleared rather than counted alongside the simulated game
+            messagebox.showerror("Result", f"{result!r} is not Home Win, Away Win, Tie or a score such as 24-17; "
+                                           "the game counts as unplayed.")
+            if engine.result(week, game) is not None:
+                engine.set_result(week, game, None)
+                record_changes([(week, game, {'home_team': home_team, 'away_team': away_team, 'result': result}, None)])
+            return
+        game_result = {'home_team': home_team, 'away_team': away_team, 'home_score': scores[0], 'away_score': scores[1]}
+        # Replaces whatever result this game slot held before
+        engine.set_result(week, game, game_result)
+        record_changes([(week, game, {'home_team': home_team, 'away_team': away_team, 'result': result}, game_result)])
+
+# Function to note changed game slots in the current branch and autosave them: one journal line
+# per slot, folded into a snapshot every so often
+def record_changes(changed, in_branch=True):
+    for week, game, slot, game_result in changed:
+        if in_branch:
+            branches.set(current_branch, (week, game), (slot, game_result) if slot else None)
+        session.record(week, game, slot, game_result)
+    profiler.count('journal.entries', len(changed))
+    if session.should_compact():
+        save_game_data(session, week_data, engine)
+
+# Function to import a schedule file, with any final scores, into week_data and the engine
+@timed('schedule.import')
+def import_schedule_file():
+    path = filedialog.askopenfilename(title="Import Schedule",
+                                      filetypes=[("Schedules", "*.csv *.json *.jsonl *.ndjson"), ("All files", "*.*")])
+    if not path:
+        return
+    try:
+        schedule = import_schedule(path, team_index, config.weeks, config.games_per_week)
+    except (OSError, ScheduleError) as error:
+        messagebox.showerror("Import Schedule", f"Could not import {path}:\n{error}")
+        return
+    changed = schedule.apply(week_data, engine)
+    record_changes(changed)
+    print(f"Schedule imported: {len(changed)} game slots changed.")
+
+# Function to start a new what-if branch from the current one and switch to it
+def fork_branch(name):
+    global current_branch
+    name = name.strip()
+    if not name or name in branches.heads:
+        messagebox.showerror("New Branch", f"Choose a new, non-empty branch name (not {name!r}).")
+        return False
+    branches.fork(current_branch, name)
+    current_branch = name
+    return True
+
+# Function to show another branch; only the games where the two branches differ are replayed
+@timed('branch.switch')
+def switch_branch(name):
+    global current_branch
+    if name == current_branch or name not in branches.heads:
+        return
+    changed = branches.checkout(current_branch, name, engine, week_data)
+    current_branch = name
+    # The saved session follows whichever branch is on screen
+    record_changes(changed, in_branch=False)
+
+# Function to write the profiler's results to a file the user picks
+def export_profile(export, extension):
+    path = filedialog.asksaveasfilename(title="Export Profile", defaultextension=extension,
+                                        filetypes=[("JSON", "*.json"), ("All files", "*.*")])
+    if not path:
+        return
+    try:
+        export(path)
+    except OSError as error:
+        messagebox.showerror("Export Profile", f"Could not write {path}:\n{error}")
+        return
+    print(f"Profile exported to {path}.")
 
 # Function to update both standings and playoff picture
-def update_all(standings_tab, playoff_picture_tab, standings, teams):
-    display_standings(standings_tab, standings, teams)
-    update_playoff_picture(playoff_picture_tab, standings, teams)
+def update_all(standings_view, playoff_view, engine):
+    display_standings(standings_view, engine)
+    update_playoff_picture(playoff_view, engine)
 
-# Function to clear all data
+# Function to clear all data once the user confirms, returns whether it did
 def clear_data(teams):
-    global standings
-    standings = initialize_standings(teams)
+    global standings, engine, week_data, branches, current_branch, game_model
+    if not messagebox.askyesno("Clear Data", "Clear every result and branch? The saved season is overwritten."):
+        return False
+    game_model = EloModel(teams)
+    engine = SeasonEngine(teams, num_wildcards=config.wildcards, seed_cache=seed_cache, game_model=game_model)
+    standings = engine.standings
+    week_data = config.empty_week_data()
+    branches = ScenarioTree()
+    current_branch = 'main'
+    save_game_data(session, week_data, engine)
     print("All data cleared.")
+    return True
 
 # Main function
 def main():
     team_data_file = 'team_data.json'  # Ensure this path is correct
-    global standings
+    global session, team_index, seed_cache, config
+    # PLAYOFF_PROFILE=1 turns profiling on from the start, so loading the save is measured too
+    profiler.enabled = os.environ.get('PLAYOFF_PROFILE', '') not in ('', '0')
     teams = load_team_data(team_data_file)
+    print("Team data loaded successfully.")
+    config = load_league_config(team_data_file, teams)
+    team_index = TeamIndex(teams)
+
+    # Seedings already worked out in earlier sessions are reused when the same outcomes come back
+    seed_cache = SeedingCache(shape=league_shape(teams, config.wildcards))
+    seed_cache.load('seed_cache.json')
 
     # Load existing game data if available
-    game_data_file = 'game_data.json'
-    loaded_standings = load_game_data(game_data_file)
-    if loaded_standings:
-        standings = loaded_standings
-    else:
-        standings = initialize_standings(teams)
+    session = SessionStore('game_data.json', num_weeks=config.weeks, games_per_week=config.games_per_week)
+    load_session(teams)
 
     create_gui(teams)
+    session.close()
+    seed_cache.save('seed_cache.json')
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,270 @@
+from collections import deque
+
+CLINCHED = 'clinched'
+ELIMINATED = 'eliminated'
+ALIVE = 'alive'
+
+
+# Edmonds-Karp maximum flow over a {node: {node: capacity}} graph
+def max_flow(capacity, source, sink):
+    residual = {node: dict(edges) for node, edges in capacity.items()}
+    for node, edges in capacity.items():
+        for other in edges:
+            residual.setdefault(other, {}).setdefault(node, 0)
+    flow = 0
+    while True:
+        parent = {source: None}
+        queue = deque([source])
+        while queue and sink not in parent:
+            node = queue.popleft()
+            for other, remaining in residual[node].items():
+                if remaining > 0 and other not in parent:
+                    parent[other] = node
+                    queue.append(other)
+        if sink not in parent:
+            return flow
+        bottleneck = None
+        node = sink
+        while parent[node] is not None:
+            remaining = residual[parent[node]][node]
+            bottleneck = remaining if bottleneck is None else min(bottleneck, remaining)
+            node = parent[node]
+        node = sink
+        while parent[node] is not None:
+            residual[parent[node]][node] -= bottleneck
+            residual[node][parent[node]] += bottleneck
+            node = parent[node]
+        flow += bottleneck
+
+
+# Clinch and elimination checks on standings points (2 per win, 1 per tie).
+# A team only counts as clinched or eliminated when no tiebreaker could change it.
+class ClinchSolver:
+    def __init__(self, engine, remaining_games):
+        self.engine = engine
+        self.teams = engine.teams
+        team_ids = engine.standings.team_ids
+        counters = engine.standings.counters
+        self.points = [2 * counters['wins'][team_id] + counters['ties'][team_id] for team_id in range(len(self.teams))]
+        self.games = [(team_ids[game['home_team']], team_ids[game['away_team']]) for game in remaining_games]
+        self.remaining_games = remaining_games
+        self.games_of = [[] for _ in self.teams]
+        for index, (home_id, away_id) in enumerate(self.games):
+            self.games_of[home_id].append(index)
+            self.games_of[away_id].append(index)
+        self.division_of = engine.division_of
+        self.conference_teams = {}
+        self.division_teams = {}
+        for team_id in range(len(self.teams)):
+            self.conference_teams.setdefault(engine.conference_of[team_id], []).append(team_id)
+            self.division_teams.setdefault(engine.division_of[team_id], []).append(team_id)
+
+    # Lowest and highest final points of every team once the outcomes in fixed are decided;
+    # fixed maps a game index to the id of its winner
+    def bounds(self, fixed=None):
+        fixed = fixed or {}
+        low = list(self.points)
+        high = list(self.points)
+        for index, (home_id, away_id) in enumerate(self.games):
+            if index in fixed:
+                low[fixed[index]] += 2
+                high[fixed[index]] += 2
+            else:
+                high[home_id] += 2
+                high[away_id] += 2
+        return low, high
+
+    def _rivals(self, team_id):
+        return [other for other in self.division_teams[self.division_of[team_id]] if other != team_id]
+
+    def _others(self, team_id):
+        return [other for other in self.conference_teams[self.engine.conference_of[team_id]] if other != team_id]
+
+    def division_status(self, team_id, fixed=None):
+        fixed = fixed or {}
+        low, high = self.bounds(fixed)
+        rivals = self._rivals(team_id)
+        if all(high[rival] < low[team_id] for rival in rivals):
+            return CLINCHED
+        if self._division_eliminated(team_id, rivals, fixed, low, high):
+            return ELIMINATED
+        return ALIVE
+
+    # Baseball-style elimination: with the team winning out, can the games left between its
+    # rivals be split so that none of them finishes ahead of it?
+    def _division_eliminated(self, team_id, rivals, fixed, low, high):
+        rival_set = set(rivals)
+        capacity = {'source': {}}
+        total = 0
+        for rival in rivals:
+            # Rivals lose every open game outside the division race
+            room = high[team_id] - low[rival]
+            if room < 0:
+                return True
+            capacity[('team', rival)] = {'sink': room}
+        for index, (home_id, away_id) in enumerate(self.games):
+            if index in fixed or home_id not in rival_set or away_id not in rival_set:
+                continue
+            capacity['source'][('game', index)] = 2
+            capacity[('game', index)] = {('team', home_id): 2, ('team', away_id): 2}
+            total += 2
+        return total > 0 and max_flow(capacity, 'source', 'sink') < total
+
+    # Conference teams that could still finish level with or ahead of the given points
+    def _threats(self, team_id, floor, high):
+        return [other for other in self._others(team_id) if high[other] >= floor]
+
+    # Most non-division-winners that can finish level with or ahead of the team when it misses its division
+    def _wildcard_threat_count(self, threats):
+        by_division = {}
+        for other in threats:
+            by_division[self.division_of[other]] = by_division.get(self.division_of[other], 0) + 1
+        return sum(count - 1 for count in by_division.values())
+
+    # In whatever happens: no division rival can catch the team, or too few other teams can
+    def _playoff_clinched(self, team_id, low, high):
+        threats = self._threats(team_id, low[team_id], high)
+        division = self.division_of[team_id]
+        if not any(self.division_of[other] == division for other in threats):
+            return True
+        return self._wildcard_threat_count(threats) < self.engine.num_wildcards
+
+    def playoff_status(self, team_id, fixed=None):
+        fixed = fixed or {}
+        low, high = self.bounds(fixed)
+        if self._playoff_clinched(team_id, low, high):
+            return CLINCHED
+        if self.division_status(team_id, fixed) == ELIMINATED:
+            # Out of the wildcards too when enough teams are already sure to finish ahead
+            ahead = [other for other in self._others(team_id) if low[other] > high[team_id]]
+            if self._wildcard_threat_count(ahead) >= self.engine.num_wildcards:
+                return ELIMINATED
+        return ALIVE
+
+    def top_seed_status(self, team_id, fixed=None):
+        fixed = fixed or {}
+        low, high = self.bounds(fixed)
+        division = self.division_status(team_id, fixed)
+        others = self._others(team_id)
+        if division == CLINCHED and all(high[other] < low[team_id] for other in others):
+            return CLINCHED
+        if division == ELIMINATED or any(low[other] > high[team_id] for other in others):
+            return ELIMINATED
+        return ALIVE
+
+    # Wins by the team plus losses by its closest rival needed to clinch the division
+    def division_magic_number(self, team_id):
+        _, high = self.bounds()
+        rivals = self._rivals(team_id)
+        if not rivals:
+            return 0
+        return max(0, max((high[rival] - self.points[team_id] + 2) // 2 for rival in rivals))
+
+    # Outcomes that can only help the team: its own wins and losses by teams that could still pass it
+    def _helpful_outcomes(self, team_id, fixed, low, high):
+        threats = set(self._threats(team_id, low[team_id], high))
+        outcomes = []
+        for index, (home_id, away_id) in enumerate(self.games):
+            if index in fixed:
+                continue
+            if team_id in (home_id, away_id):
+                outcomes.append((index, team_id))
+                continue
+            if home_id in threats:
+                outcomes.append((index, away_id))
+            if away_id in threats:
+                outcomes.append((index, home_id))
+        return outcomes
+
+    # Fewest extra outcomes that could still clinch. Each win raises the team's floor and may
+    # also be a loss for a threat; every other threat that has to drop costs one loss per 2 points
+    def _lower_bound(self, team_id, fixed, low, high):
+        open_games = [index for index in self.games_of[team_id] if index not in fixed]
+        division = self.division_of[team_id]
+        bound = None
+        for wins in range(len(open_games) + 1):
+            floor = low[team_id] + 2 * wins
+            threats = self._threats(team_id, floor, high)
+            threat_set = set(threats)
+            head_to_head = sum(1 for index in open_games if set(self.games[index]) & threat_set)
+            by_division = {}
+            for other in threats:
+                by_division.setdefault(self.division_of[other], []).append((high[other] - floor + 2) // 2)
+            division_cost = sum(by_division.get(division, []))
+            # Only dropping all but one threat of a division lowers the wildcard count
+            useful = sorted(cost for costs in by_division.values() for cost in sorted(costs)[:-1])
+            excess = self._wildcard_threat_count(threats) - self.engine.num_wildcards + 1
+            wildcard_cost = sum(useful[:max(0, excess)])
+            needed = wins + max(0, min(division_cost, wildcard_cost) - min(wins, head_to_head))
+            bound = needed if bound is None else min(bound, needed)
+        return bound
+
+    # Smallest set of outcomes after which the team is in the playoffs whatever else happens;
+    # None when it cannot clinch without tiebreakers or no set is found within the limits
+    def clinching_scenario(self, team_id, max_outcomes=8, max_nodes=5000):
+        status = self.playoff_status(team_id)
+        if status != ALIVE:
+            return [] if status == CLINCHED else None
+        low, high = self.bounds()
+        best_case = {}
+        for index, winner in self._helpful_outcomes(team_id, {}, low, high):
+            best_case.setdefault(index, winner)
+        if not self._playoff_clinched(team_id, *self.bounds(best_case)):
+            # Even the best case leaves it to the tiebreakers
+            return None
+        # Subproblems are keyed by the games still open and the points that still matter
+        failed = {}
+        fixed = {}
+        nodes = [0]
+
+        def search(start, budget):
+            nodes[0] += 1
+            if self._playoff_clinched(team_id, low, high):
+                return []
+            if nodes[0] > max_nodes or self._lower_bound(team_id, fixed, low, high) > budget:
+                return None
+            threats = self._threats(team_id, low[team_id], high)
+            key = (start, low[team_id], tuple((other, high[other]) for other in threats))
+            if failed.get(key, -1) >= budget:
+                return None
+            # Outcomes are added in game order so each set is tried once
+            for index, winner in self._helpful_outcomes(team_id, fixed, low, high):
+                if index < start:
+                    continue
+                loser = self.games[index][0] if self.games[index][1] == winner else self.games[index][1]
+                fixed[index] = winner
+                low[winner] += 2
+                high[loser] -= 2
+                found = search(index + 1, budget - 1)
+                del fixed[index]
+                low[winner] -= 2
+                high[loser] += 2
+                if found is not None:
+                    return [(index, winner)] + found
+            failed[key] = budget
+            return None
+
+        for budget in range(max(1, self._lower_bound(team_id, fixed, low, high)), max_outcomes + 1):
+            found = search(0, budget)
+            if found is not None:
+                return [self._describe(index, winner) for index, winner in found]
+        return None
+
+    def _describe(self, index, winner):
+        game = self.remaining_games[index]
+        return dict(game, winner=self.teams[winner]['name'])
+
+    # Status of every team, keyed by team name; None once cancelled() turns true
+    def report(self, max_outcomes=8, cancelled=None):
+        report = {}
+        for team_id, team in enumerate(self.teams):
+            if cancelled is not None and cancelled():
+                return None
+            report[team['name']] = {
+                'division': self.division_status(team_id),
+                'playoffs': self.playoff_status(team_id),
+                'top_seed': self.top_seed_status(team_id),
+                'division_magic_number': self.division_magic_number(team_id),
+                'clinching_outcomes': self.clinching_scenario(team_id, max_outcomes),
+            }
+        return report
@@ -0,0 +1,99 @@
+import queue
+import threading
+import traceback
+
+
+# A submitted computation; cancelled() turns true once a newer job with the same key arrives
+class Job:
+    def __init__(self, key, generation, fn, args, callback):
+        self.key = key
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.callback = callback
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+
+# Runs computations on a worker thread and hands results back to the Tk thread.
+# Jobs are coalesced per key: only the newest request for a key is run or delivered.
+class ComputeScheduler:
+    def __init__(self, root, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._running = {}
+        self._generations = {}
+        self._results = queue.Queue()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._work, name='compute-scheduler', daemon=True)
+        self._thread.start()
+        self._poll_id = root.after(poll_ms, self._poll)
+
+    # Queue fn(cancelled, *args) under key; callback(result) runs on the Tk thread if it is still current
+    def submit(self, key, fn, args=(), callback=None):
+        with self._condition:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            if key in self._running:
+                self._running[key].cancel()
+            self._pending[key] = Job(key, generation, fn, args, callback)
+            self._condition.notify()
+            return generation
+
+    def cancel(self, key):
+        with self._condition:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._pending.pop(key, None)
+            if key in self._running:
+                self._running[key].cancel()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                key, job = next(iter(self._pending.items()))
+                del self._pending[key]
+                self._running[key] = job
+            try:
+                result, error = job.fn(job.cancelled, *job.args), None
+            except Exception:
+                result, error = None, traceback.format_exc()
+            with self._condition:
+                self._running.pop(key, None)
+            if not job.cancelled():
+                self._results.put((job, result, error))
+
+    # Deliver finished jobs on the Tk thread, dropping any that were superseded meanwhile
+    def _poll(self):
+        while True:
+            try:
+                job, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if job.generation != self._generations.get(job.key):
+                continue
+            if error is not None:
+                print(f"Background job '{job.key}' failed:\n{error}")
+            elif job.callback is not None:
+                job.callback(result)
+        if not self._stopped:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def shutdown(self):
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            for job in self._running.values():
+                job.cancel()
+            self._condition.notify()
+        self.root.after_cancel(self._poll_id)
@@ -0,0 +1,141 @@
+import math
+
+import numpy as np
+
+# Elo scale: 25 rating points are worth one point of expected margin, so a logistic margin with
+# scale 400 / (25 ln 10) has exactly the Elo win probability of being positive (sd about 12.6)
+POINTS_PER_RATING = 1 / 25
+MARGIN_SCALE = 400 / (25 * math.log(10))
+
+
+# Elo ratings with a logistic margin-of-victory model. Win probabilities and score samples are
+# computed for whole arrays of games at once; ratings move incrementally as results come in.
+class EloModel:
+    def __init__(self, teams, ratings=None, k=20.0, home_advantage=48.0, mean_total=44.0, total_sd=10.0,
+                 overtime_tie_prob=0.05):
+        self.names = [team['name'] for team in teams]
+        self.team_ids = {name: idx for idx, name in enumerate(self.names)}
+        if ratings is None:
+            ratings = [team.get('rating', 1500.0) for team in teams]
+        self.ratings = np.array(ratings, dtype=np.float64)
+        self.k = k
+        self.home_advantage = home_advantage
+        self.mean_total = mean_total
+        self.total_sd = total_sd
+        self.overtime_tie_prob = overtime_tie_prob
+        # Rating change applied for each game slot, the two teams' ratings going into it and the
+        # score, so a replaced result can be subtracted again and later slots worked out afresh
+        self.applied = {}
+
+    # Copy of the current ratings without the per-slot history, for handing to other threads or processes
+    def copy(self):
+        model = EloModel.__new__(EloModel)
+        model.__dict__.update(self.__dict__)
+        model.ratings = self.ratings.copy()
+        model.applied = {}
+        return model
+
+    def expected_margins(self, home_ids, away_ids):
+        return (self.ratings[home_ids] + self.home_advantage - self.ratings[away_ids]) * POINTS_PER_RATING
+
+    def win_probabilities(self, home_ids, away_ids):
+        return 1 / (1 + np.exp(-self.expected_margins(home_ids, away_ids) / MARGIN_SCALE))
+
+    # Home and away scores of shape (samples, games). Margins are logistic around the rating edge and
+    # totals normal; games level after regulation go to overtime, won by a field goal or left tied.
+    # Draws are float32 and the arithmetic int32 since this runs for every simulated game.
+    def sample_scores(self, rng, home_ids, away_ids, num_samples):
+        shape = (num_samples, len(home_ids))
+        uniform = rng.random(shape, dtype=np.float32)
+        np.clip(uniform, 1e-7, 1 - 1e-7, out=uniform)
+        logistic = np.log(uniform / (1 - uniform))
+        logistic *= MARGIN_SCALE
+        logistic += self.expected_margins(home_ids, away_ids).astype(np.float32)
+        margin = np.rint(logistic).astype(np.int32)
+        total = rng.standard_normal(shape, dtype=np.float32)
+        total *= self.total_sd
+        total += self.mean_total
+        total = np.maximum(np.rint(total).astype(np.int32), np.abs(margin))
+        # Total and margin need the same parity for whole-number scores
+        total += (total - margin) & 1
+        home = (total + margin) >> 1
+        away = (total - margin) >> 1
+        level = np.flatnonzero(margin == 0)
+        if len(level):
+            overtime = rng.random(len(level))
+            home_edge = self.win_probabilities(home_ids, away_ids)[level % shape[1]]
+            decided = overtime >= self.overtime_tie_prob
+            home_wins = overtime < self.overtime_tie_prob + (1 - self.overtime_tie_prob) * home_edge
+            home.ravel()[level] += 3 * (decided & home_wins)
+            away.ravel()[level] += 3 * (decided & ~home_wins)
+        return home, away
+
+    # A plausible final score for a picked winner, used when only the result is entered. With the
+    # game's (week, game) slot the edge comes from the teams' ratings before that game, so results
+    # entered for later weeks do not move the score of an earlier one.
+    def typical_score(self, home_team, away_team, result, slot=None):
+        home_id, away_id = self.team_ids[home_team], self.team_ids[away_team]
+        if slot is None:
+            home_rating, away_rating = self.ratings[home_id], self.ratings[away_id]
+        else:
+            home_rating, away_rating = self.pregame_ratings(slot, home_id, away_id)
+        edge = (home_rating + self.home_advantage - away_rating) * POINTS_PER_RATING
+        if result == 'tie':
+            points = round(self.mean_total / 2)
+            return points, points
+        margin = max(3, round(abs(edge)))
+        winner = round((self.mean_total + margin) / 2)
+        loser = max(0, winner - margin)
+        return (winner, loser) if result == 'home' else (loser, winner)
+
+    # Ratings of two teams going into a game slot: those stored when the slot's result was counted,
+    # or for an open slot the current ratings less every shift from that slot onwards
+    def pregame_ratings(self, slot, home_id, away_id):
+        applied = self.applied.get(slot)
+        if applied is not None and applied[:2] == (home_id, away_id):
+            return applied[3]
+        ratings = {home_id: self.ratings[home_id], away_id: self.ratings[away_id]}
+        for other, (other_home, other_away, shift, _, _) in self.applied.items():
+            if other >= slot:
+                if other_home in ratings:
+                    ratings[other_home] -= shift
+                if other_away in ratings:
+                    ratings[other_away] += shift
+        return float(ratings[home_id]), float(ratings[away_id])
+
+    # Elo shift for a result given the teams' pregame ratings, with a margin-of-victory multiplier
+    # that damps runaway favourites
+    def _shift(self, home_rating, away_rating, home_score, away_score):
+        edge = home_rating + self.home_advantage - away_rating
+        expected = 1 / (1 + 10 ** (-edge / 400))
+        actual = 1.0 if home_score > away_score else 0.0 if home_score < away_score else 0.5
+        margin = abs(home_score - away_score)
+        winner_edge = edge if home_score >= away_score else -edge
+        multiplier = math.log(margin + 1) * 2.2 / (winner_edge * 0.001 + 2.2) if margin else 1.0
+        return self.k * multiplier * (actual - expected)
+
+    # Replace the result counted for a game slot, game_result=None clears it. Ratings end up as if
+    # every result had been entered in slot order: results already counted for later slots are taken
+    # off and counted again on top, which costs nothing when results come in week by week.
+    def set_result(self, week, game, game_result):
+        slot = (week, game)
+        later = sorted(other for other in self.applied if other > slot)
+        for other in [slot] + later:
+            if other in self.applied:
+                home_id, away_id, shift, _, _ = self.applied[other]
+                self.ratings[home_id] -= shift
+                self.ratings[away_id] += shift
+        self.applied.pop(slot, None)
+        if game_result is not None:
+            home_id, away_id = self.team_ids[game_result['home_team']], self.team_ids[game_result['away_team']]
+            self._apply(slot, home_id, away_id, (game_result['home_score'], game_result['away_score']))
+        for other in later:
+            home_id, away_id, _, _, scores = self.applied[other]
+            self._apply(other, home_id, away_id, scores)
+
+    def _apply(self, slot, home_id, away_id, scores):
+        pregame = float(self.ratings[home_id]), float(self.ratings[away_id])
+        shift = self._shift(*pregame, *scores)
+        self.ratings[home_id] += shift
+        self.ratings[away_id] -= shift
+        self.applied[slot] = (home_id, away_id, shift, pregame, scores)
@@ -0,0 +1,117 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+# Timings and counters for the app's main operations. While disabled every hook costs one
+# attribute check; when enabled each span is aggregated per name and kept in a bounded event
+# log that can be exported as a Chrome trace (chrome://tracing or Perfetto).
+class Profiler:
+    def __init__(self, max_events=100000):
+        self.enabled = False
+        self.stats = {}
+        self.counters = {}
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.counters.clear()
+            self.events.clear()
+            self._origin = time.perf_counter()
+
+    def record(self, name, start, duration):
+        with self._lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                entry = self.stats[name] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += duration
+            entry[2] = max(entry[2], duration)
+            self.events.append((name, start - self._origin, duration, threading.get_ident()))
+
+    def span(self, name):
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    # Spans as (name, calls, total, mean, max) in seconds, slowest total first
+    def summary(self):
+        with self._lock:
+            rows = [(name, calls, total, total / calls, longest) for name, (calls, total, longest) in self.stats.items()]
+        return sorted(rows, key=lambda row: -row[2])
+
+    def to_dict(self):
+        return {
+            'spans': [{'name': name, 'calls': calls, 'total_ms': total * 1000, 'mean_ms': mean * 1000,
+                       'max_ms': longest * 1000} for name, calls, total, mean, longest in self.summary()],
+            'counters': dict(self.counters),
+        }
+
+    def export_json(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def export_chrome_trace(self, path):
+        pid = os.getpid()
+        with self._lock:
+            events = [{'name': name, 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6, 'pid': pid, 'tid': tid}
+                      for name, start, duration, tid in self.events]
+            events += [{'name': name, 'ph': 'C', 'ts': 0, 'pid': pid, 'args': {name: value}}
+                       for name, value in self.counters.items()]
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+# The process-wide profiler every hook reports to
+profiler = Profiler()
+
+
+# Decorator timing each call of a function under name while the profiler is enabled
+def timed(name):
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.record(name, start, time.perf_counter() - start)
+        return wrapper
+    return decorate
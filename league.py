@@ -0,0 +1,175 @@
+import json
+import os
+
+from instrumentation import timed
+from standings_store import StandingsStore
+from season_engine import SeasonEngine
+from schedule_import import ScheduleError, import_schedule
+from session_store import empty_week_data
+
+# Season logic without any GUI import, shared by the Tk app and the batch command line tool
+
+
+# Load team data from a JSON file
+def load_team_data(file_path):
+    with open(file_path, 'r') as file:
+        data = json.load(file)
+    return data['teams']
+
+
+# Shape of a league: season length and playoff sizes. Conference and division groups are indexed
+# where they are used (season_engine, simulation, clinch), keyed by team id. Settings missing from
+# the 'league' section of team_data.json default to the NFL's.
+class LeagueConfig:
+    def __init__(self, teams, weeks=17, games_per_week=None, wildcards=3, playoff_byes=1):
+        self.teams = teams
+        self.weeks = weeks
+        self.games_per_week = games_per_week if games_per_week is not None else len(teams) // 2
+        self.wildcards = wildcards
+        self.playoff_byes = playoff_byes
+        if weeks < 1 or self.games_per_week < 1:
+            raise ValueError("A league needs at least one week with at least one game")
+        if 2 * self.games_per_week > len(teams):
+            raise ValueError(f"{len(teams)} teams cannot play {self.games_per_week} games in one week")
+
+    def empty_week_data(self):
+        return empty_week_data(self.weeks, self.games_per_week)
+
+
+def load_league_config(file_path, teams):
+    with open(file_path, 'r') as file:
+        settings = json.load(file).get('league', {})
+    return LeagueConfig(teams, **{key: settings[key] for key in ('weeks', 'games_per_week', 'wildcards', 'playoff_byes')
+                                  if key in settings})
+
+
+# Initialize team standings
+def initialize_standings(teams):
+    return StandingsStore(teams)
+
+
+# Update standings based on game results
+@timed('standings.update')
+def update_standings(standings, game_result):
+    standings.apply_week([game_result])
+
+
+# Teams sorted best first by record, then division and conference wins and points
+@timed('standings.sort')
+def calculate_standings(teams, standings):
+    return sorted(teams, key=lambda x: standings.sort_key(x['name']), reverse=True)
+
+
+# Games entered in week_data without a result the app can score, as (week, game slot, game).
+# A result such as a mistyped score is never counted, so the game is still to be played.
+def remaining_slots(week_data, standings):
+    slots = []
+    for week in week_data:
+        for slot, game in enumerate(week_data[week]):
+            if game.get('home_team') in standings and game.get('away_team') in standings and \
+                    not is_result(game.get('result') or ''):
+                slots.append((week, slot, {'home_team': game['home_team'], 'away_team': game['away_team']}))
+    return slots
+
+
+# Games entered in week_data without a result yet
+def remaining_games(week_data, standings):
+    return [game for _, _, game in remaining_slots(week_data, standings)]
+
+
+# A typed final score such as "24-17" as (home, away), or None; en and em dashes count as hyphens
+def parse_score(text):
+    home, separator, away = text.replace(' ', '').replace('\u2013', '-').replace('\u2014', '-').partition('-')
+    if separator and home.isascii() and home.isdigit() and away.isascii() and away.isdigit():
+        return int(home), int(away)
+    return None
+
+
+OUTCOMES = {"Home Win": 'home', "Away Win": 'away', "Tie": 'tie'}
+
+
+# Whether a game slot's result text is one result_scores can score
+def is_result(text):
+    return text in OUTCOMES or parse_score(text) is not None
+
+
+# Scores for a game slot's result text: a typed final score, or for a picked winner ("Home Win",
+# "Away Win", "Tie") a score typical for the matchup going into that (week, game) slot so points
+# tiebreakers stay meaningful
+def result_scores(home_team, away_team, result, model, slot=None):
+    scores = parse_score(result)
+    if scores is None:
+        outcome = OUTCOMES.get(result)
+        if outcome is not None:
+            scores = model.typical_score(home_team, away_team, outcome, slot)
+    return scores
+
+
+# Seeded team names of each conference, best seed first
+def compute_seeds(engine):
+    return {conference: [team['name'] for team in seeded] for conference, seeded in engine.playoff_teams().items()}
+
+
+def _resolve(index, game, where):
+    names = [index.lookup(game.get(field, '')) for field in ('home_team', 'away_team')]
+    if None in names:
+        raise ScheduleError([f"{where}: unknown team in {game.get('away_team')!r} at {game.get('home_team')!r}"])
+    return names
+
+
+# Scored results and unplayed games of a scenario file. CSV and JSON lines files are schedules
+# where rows with scores are results; a JSON file holds 'results' and 'schedule' lists, and saved
+# sessions also work since their unplayed week_data slots count as the schedule.
+def read_scenario(path, index):
+    if os.path.splitext(path)[1].lower() != '.json':
+        results, schedule = [], []
+        for _, game in import_schedule(path, index).games():
+            if game['home_score'] is None:
+                schedule.append({'home_team': game['home_team'], 'away_team': game['away_team']})
+            else:
+                results.append(game)
+        return results, schedule
+    with open(path, 'r') as file:
+        data = json.load(file)
+    results = []
+    for number, result in enumerate(data.get('results', []), start=1):
+        home_team, away_team = _resolve(index, result, f"result {number}")
+        results.append({'home_team': home_team, 'away_team': away_team,
+                        'home_score': int(result['home_score']), 'away_score': int(result['away_score'])})
+    games = list(data.get('schedule', []))
+    for week, slots in sorted(data.get('week_data', {}).items(), key=lambda item: int(item[0])):
+        games.extend(slot for slot in slots
+                     if slot.get('home_team') and slot.get('away_team') and not is_result(slot.get('result') or ''))
+    schedule = []
+    for number, game in enumerate(games, start=1):
+        home_team, away_team = _resolve(index, game, f"scheduled game {number}")
+        schedule.append({'home_team': home_team, 'away_team': away_team})
+    return results, schedule
+
+
+def standings_rows(engine):
+    rows = []
+    for rank, team in enumerate(engine.league_order(), start=1):
+        record = engine.standings[team['name']]
+        rows.append(dict(rank=rank, team=team['name'], conference=team['conference'], division=team['division'],
+                         **record))
+    return rows
+
+
+# Seeds, standings and (when num_samples > 0) playoff odds for recorded results plus a schedule,
+# counted on top of base standings ({name: record}) when given
+def evaluate(teams, results, schedule, num_samples=0, seed=None, num_wildcards=3, base=None):
+    engine = SeasonEngine(teams, StandingsStore.from_dict(teams, base) if base else None, num_wildcards=num_wildcards)
+    for game, result in enumerate(results):
+        engine.set_result(0, game, result)
+    odds = None
+    if num_samples > 0:
+        # Imported here so seeding and standings work without NumPy installed
+        from game_model import EloModel
+        from simulation import simulate_season
+        model = EloModel(teams)
+        for game, result in enumerate(results):
+            model.set_result(0, game, result)
+        odds = simulate_season(teams, engine.standings.to_dict(), schedule, num_samples,
+                               num_wildcards=num_wildcards, seed=seed, model=model, played=results)
+    return {'seeds': compute_seeds(engine), 'standings': standings_rows(engine), 'odds': odds}
@@ -0,0 +1,69 @@
+import glob
+import math
+import os
+import tkinter as tk
+
+
+# Team logos as small PhotoImages, decoded on first use and shared by every widget showing them.
+# Downscaled thumbnails are kept in cache_dir under the source file's mtime, so a full-size logo
+# is decoded only once after it changes and later runs load the thumbnail directly.
+class LogoCache:
+    def __init__(self, master, teams, size=20, cache_dir='logo_cache'):
+        self.master = master
+        self.size = size
+        self.cache_dir = cache_dir
+        self.paths = {team['name']: team.get('logo') for team in teams}
+        # Holding the references here keeps Tk from freeing images still shown in labels and rows
+        self.images = {}
+
+    # Thumbnail of the team's logo, or None when it has none or it cannot be read
+    def team_logo(self, name):
+        path = self.paths.get(name)
+        return self.get(path) if path else None
+
+    def get(self, path):
+        if path not in self.images:
+            self.images[path] = self._load(path)
+        return self.images[path]
+
+    def _thumbnail_prefix(self, path):
+        return f"{os.path.splitext(os.path.basename(path))[0]}.{self.size}."
+
+    def _thumbnail_path(self, path, mtime_ns):
+        return os.path.join(self.cache_dir, f"{self._thumbnail_prefix(path)}{mtime_ns}.png")
+
+    def _load(self, path):
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        thumbnail_path = self._thumbnail_path(path, mtime_ns)
+        if os.path.exists(thumbnail_path):
+            try:
+                return tk.PhotoImage(master=self.master, file=thumbnail_path)
+            except tk.TclError:
+                pass
+        try:
+            full = tk.PhotoImage(master=self.master, file=path)
+        except tk.TclError:
+            return None
+        factor = max(1, math.ceil(max(full.width(), full.height()) / self.size))
+        thumbnail = full.subsample(factor, factor)
+        del full
+        self._store(path, thumbnail, thumbnail_path)
+        return thumbnail
+
+    # Write the thumbnail and drop those made from older versions of the same logo
+    def _store(self, path, thumbnail, thumbnail_path):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = thumbnail_path + '.tmp'
+            thumbnail.write(temp_path, format='png')
+            os.replace(temp_path, thumbnail_path)
+            pattern = os.path.join(glob.escape(self.cache_dir), glob.escape(self._thumbnail_prefix(path)) + '*.png')
+            for stale in glob.glob(pattern):
+                if stale != thumbnail_path:
+                    os.remove(stale)
+        except (OSError, tk.TclError):
+            # Without a writable cache the logo is simply decoded again next run
+            pass
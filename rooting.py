@@ -0,0 +1,159 @@
+import numpy as np
+
+from instrumentation import profiler, timed
+from simulation import AWAY_WIN, HOME_WIN, SeasonArrays, odds_from_histogram, sample_season, seed_histogram
+
+SIDES = {HOME_WIN: 'home', AWAY_WIN: 'away'}
+
+
+# Which remaining games matter to each team, from one set of simulated seasons. Seed counts given
+# each game's result come from masked matrix products over the same samples, for every game and
+# team at once; a week of rooting picks is scored by replaying those samples with the week's games
+# set to the picks. Games of one week are sampled independently of the rest, so the replay gives
+# the odds conditioned on the picks without simulating again.
+class RootingGuide:
+    @timed('rooting.simulate')
+    def __init__(self, teams, standings, slots, num_samples=20000, home_win_prob=0.5, tie_prob=0.0, num_wildcards=3,
+                 batch_size=5000, seed=None, cancelled=None, model=None, played=()):
+        # slots are the unplayed games as (week, game slot, game), see league.remaining_slots;
+        # played the scored results behind standings
+        self.slots = [(week, game) for week, game, _ in slots]
+        self.season = season = SeasonArrays(teams, standings, [game for _, _, game in slots], num_wildcards, played)
+        self.seed = seed
+        self.batch_size = batch_size
+        self.width = width = season.num_seeds + 1
+        rng = np.random.default_rng(seed)
+        # by_result[r, g, t * width + k]: samples where game g ended in result r and team t got seed k
+        self.by_result = np.zeros((2, season.num_games, season.num_teams * width), dtype=np.int64)
+        self.results = np.zeros((2, season.num_games), dtype=np.int64)
+        self.counts = np.zeros((season.num_teams, width), dtype=np.int64)
+        kept_outcomes, kept_scores = [], []
+        columns = np.arange(season.num_teams) * width
+        done = 0
+        self.complete = False
+        while done < num_samples:
+            if cancelled is not None and cancelled():
+                return
+            batch = min(batch_size, num_samples - done)
+            outcomes, scores = sample_season(season, rng, batch, home_win_prob, tie_prob, model)
+            seeds = season.seed(season.tally(outcomes, scores), rng)
+            self.counts += seed_histogram(season, seeds)
+            placed = np.zeros((batch, season.num_teams * width), dtype=np.float32)
+            np.put_along_axis(placed, columns + seeds.astype(np.int64), 1, axis=1)
+            for result in SIDES:
+                won = (outcomes == result).astype(np.float32)
+                # float32 sums of 0/1 products are exact for any batch under 2**24 samples
+                self.by_result[result] += (won.T @ placed).astype(np.int64)
+                self.results[result] += won.sum(axis=0).astype(np.int64)
+            kept_outcomes.append(outcomes)
+            kept_scores.append(scores)
+            done += batch
+        profiler.count('simulation.samples', done)
+        self.outcomes = np.concatenate(kept_outcomes) if kept_outcomes else np.zeros((0, season.num_games), np.int8)
+        self.scores = None if model is None or not kept_scores else \
+            (np.concatenate([s[0] for s in kept_scores]), np.concatenate([s[1] for s in kept_scores]))
+        self._baseline = None
+        self._given = None
+        self.complete = True
+
+    def odds(self):
+        return odds_from_histogram(self.season, self.counts)
+
+    def weeks(self):
+        return sorted({week for week, _ in self.slots})
+
+    # Seed distribution of every team given each game's result, shape (2, games, teams, width); a
+    # result that never came up in the samples falls back to the unconditioned distribution
+    def _conditional(self):
+        if self._given is not None:
+            return self._given
+        season = self.season
+        overall = self.counts / max(self.counts[0].sum(), 1)
+        given = self.by_result.reshape(2, season.num_games, season.num_teams, self.width).astype(np.float64)
+        seen = self.results[:, :, None, None]
+        self._given = np.where(seen > 0, given / np.maximum(seen, 1), overall)
+        return self._given
+
+    # Remaining games ranked by how far their result moves the team's seed distribution (total
+    # variation distance, which counts missing the playoffs as a seed), with the result to root for.
+    # Only games that can matter are listed: at least one side is in the team's conference and some
+    # seed probability moves by more than z standard errors, so sampling noise is never a pick.
+    def games(self, name, week=None, z=3.0):
+        season = self.season
+        team_id = season.team_ids[name]
+        given = self._conditional()[:, :, team_id, :]
+        playoffs = 1 - given[:, :, 0]
+        # Seed worth: the best seed counts most, missing the playoffs nothing
+        worth = given[:, :, 1:] @ np.arange(self.width - 1, 0, -1)
+        shift = given[HOME_WIN] - given[AWAY_WIN]
+        leverage = 0.5 * np.abs(shift).sum(axis=1)
+        seen = np.maximum(self.results, 1)[:, :, None]
+        error = np.sqrt((given * (1 - given) / seen).sum(axis=0))
+        significant = (np.abs(shift) > z * error).any(axis=1) & (self.results > 0).all(axis=0)
+        conference = season.conference_of[team_id]
+        involved = (season.conference_of[season.home] == conference) | (season.conference_of[season.away] == conference)
+        rows = []
+        for idx, (slot_week, game) in enumerate(self.slots):
+            if week is not None and slot_week != week or not (involved[idx] and significant[idx]):
+                continue
+            home_edge = (playoffs[HOME_WIN, idx] - playoffs[AWAY_WIN, idx], worth[HOME_WIN, idx] - worth[AWAY_WIN, idx])
+            root_for = None
+            if home_edge != (0, 0):
+                root_for = 'home' if home_edge > (0, 0) else 'away'
+            rows.append({
+                'week': slot_week, 'game': game,
+                'home_team': self.season.names[self.season.home[idx]],
+                'away_team': self.season.names[self.season.away[idx]],
+                'root_for': root_for,
+                'playoffs': {'home': float(playoffs[HOME_WIN, idx]), 'away': float(playoffs[AWAY_WIN, idx])},
+                'top_seed': {'home': float(given[HOME_WIN, idx, 1]), 'away': float(given[AWAY_WIN, idx, 1])},
+                'leverage': float(leverage[idx]),
+            })
+        return sorted(rows, key=lambda row: (-row['leverage'], row['week'], row['game']))
+
+    # Seed counts of the kept samples with some games' results replaced, {game index: HOME_WIN or AWAY_WIN}.
+    # Every replay breaks remaining ties with the same draws, so replays differ only through the picks.
+    @timed('rooting.replay')
+    def _replay(self, picks):
+        season = self.season
+        outcomes = self.outcomes.copy() if picks else self.outcomes
+        scores = self.scores
+        if picks and scores is not None:
+            scores = (scores[0].copy(), scores[1].copy())
+        for idx, result in picks.items():
+            outcomes[:, idx] = result
+            if scores is not None:
+                # A flipped game keeps its two scores with the sides swapped; a tie is won in overtime
+                home, away = scores[0][:, idx], scores[1][:, idx]
+                winner = np.maximum(home, away) + 3 * (home == away)
+                loser = np.minimum(home, away)
+                scores[0][:, idx], scores[1][:, idx] = (winner, loser) if result == HOME_WIN else (loser, winner)
+        rng = np.random.default_rng(self.seed)
+        counts = np.zeros((season.num_teams, self.width), dtype=np.int64)
+        for start in range(0, len(outcomes), self.batch_size):
+            batch = slice(start, start + self.batch_size)
+            batch_scores = None if scores is None else (scores[0][batch], scores[1][batch])
+            seeds = season.seed(season.tally(outcomes[batch], batch_scores), rng)
+            counts += seed_histogram(season, seeds)
+        return counts
+
+    # The team's pick in each game of a week that matters to it, and its odds before and after all
+    # of them go its way
+    def best_week(self, name, week):
+        picks = [row for row in self.games(name, week) if row['root_for'] is not None]
+        index = {slot: idx for idx, slot in enumerate(self.slots)}
+        if self._baseline is None:
+            self._baseline = self._replay({})
+        after = self._replay({index[(row['week'], row['game'])]: HOME_WIN if row['root_for'] == 'home' else AWAY_WIN
+                              for row in picks})
+        return {'week': week, 'picks': picks, 'before': odds_from_histogram(self.season, self._baseline)[name],
+                'after': odds_from_histogram(self.season, after)[name]}
+
+    # Ranked games and the best picks for a week (the first week with games left by default)
+    def report(self, name, week=None, limit=None):
+        weeks = self.weeks()
+        if week is None and weeks:
+            week = weeks[0]
+        games = self.games(name)
+        return {'team': name, 'odds': self.odds()[name], 'games': games[:limit] if limit else games,
+                'best_week': self.best_week(name, week) if week in weeks else None}
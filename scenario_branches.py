@@ -0,0 +1,156 @@
+# Named what-if branches of a season that share their common history.
+# Each branch points at a layer of game slot changes on top of its parent layer. Layers below a
+# fork are frozen and shared, so forking is O(1) and a branch only stores the games it changed.
+
+# Layer chains longer than this are flattened into a single layer to keep lookups short
+MAX_DEPTH = 32
+
+
+# origin is the layer a flattened layer stands in for: lookups stop at the flattened copy, while
+# diff and merge still reach the history it shares with other branches through it
+class Layer:
+    __slots__ = ('parent', 'changes', 'depth', 'frozen', 'origin', 'level')
+
+    def __init__(self, parent, changes=None, origin=None):
+        self.parent = parent
+        self.changes = changes if changes is not None else {}
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.frozen = False
+        self.origin = origin
+        # Height in the branch history, which flattening does not reset
+        below = self.below()
+        self.level = below.level + 1 if below is not None else 0
+
+    def below(self):
+        return self.origin if self.origin is not None else self.parent
+
+    def get(self, key, default=None):
+        layer = self
+        while layer is not None:
+            if key in layer.changes:
+                return layer.changes[key]
+            layer = layer.parent
+        return default
+
+    def flatten(self):
+        layers = []
+        layer = self
+        while layer is not None:
+            layers.append(layer.changes)
+            layer = layer.parent
+        merged = {}
+        for changes in reversed(layers):
+            merged.update(changes)
+        return merged
+
+
+# Lowest layer in the history of both chains, and the changes made above it on each side. A
+# flattened layer's changes hold every slot, so these can include slots that did not change.
+def _split(a, b):
+    above_a, above_b = [], []
+    while a is not b:
+        if b is None or (a is not None and a.level >= b.level):
+            above_a.append(a.changes)
+            a = a.below()
+        else:
+            above_b.append(b.changes)
+            b = b.below()
+    return a, above_a, above_b
+
+
+def _touched(changes_list):
+    keys = set()
+    for changes in changes_list:
+        keys.update(changes)
+    return keys
+
+
+# Branch contents for the season as it stands: the week_data slot and engine result of every filled game
+def season_base(week_data, engine):
+    base = {}
+    for week, slots in week_data.items():
+        for game, slot in enumerate(slots):
+            if slot:
+                base[(int(week), game)] = (dict(slot), engine.result(int(week), game))
+    return base
+
+
+# Values are (slot, game_result) pairs keyed by (week, game); a missing key is an empty slot
+class ScenarioTree:
+    def __init__(self, base=None, name='main'):
+        root = Layer(None, dict(base or {}))
+        self.heads = {name: Layer(root)}
+        root.frozen = True
+
+    def names(self):
+        return list(self.heads)
+
+    def get(self, name, key, default=None):
+        return self.heads[name].get(key, default)
+
+    def set(self, name, key, value):
+        head = self.heads[name]
+        if head.frozen:
+            head = self.heads[name] = Layer(head)
+        if head.depth > MAX_DEPTH:
+            head = self.heads[name] = Layer(None, head.flatten(), origin=head)
+        head.changes[key] = value
+
+    # New branch sharing everything the source branch holds; both write to fresh layers from here on
+    def fork(self, source, name):
+        if name in self.heads:
+            raise KeyError(f"Branch '{name}' already exists")
+        head = self.heads[source]
+        head.frozen = True
+        self.heads[name] = head
+
+    def delete(self, name):
+        if len(self.heads) == 1:
+            raise ValueError("Cannot delete the last branch")
+        del self.heads[name]
+
+    def items(self, name):
+        return {key: value for key, value in self.heads[name].flatten().items() if value is not None}
+
+    # Slots that differ between two branches as {key: (value in a, value in b)}.
+    # Only layers above their common ancestor are visited, so the cost follows the divergence.
+    def diff(self, a, b):
+        head_a, head_b = self.heads[a], self.heads[b]
+        _, above_a, above_b = _split(head_a, head_b)
+        differences = {}
+        for key in _touched(above_a) | _touched(above_b):
+            value_a, value_b = head_a.get(key), head_b.get(key)
+            if value_a != value_b:
+                differences[key] = (value_a, value_b)
+        return differences
+
+    # Bring the changes made on source since the branches split into target. Slots both
+    # branches changed differently are conflicts, settled by prefer ('target' or 'source').
+    def merge(self, source, target, prefer='target'):
+        head_source, head_target = self.heads[source], self.heads[target]
+        common, above_source, above_target = _split(head_source, head_target)
+        changed_on_target = _touched(above_target)
+        conflicts = {}
+        for key in _touched(above_source):
+            value = head_source.get(key)
+            current = head_target.get(key)
+            base = common.get(key) if common is not None else None
+            if value == current or value == base:
+                continue
+            if key in changed_on_target and current != base:
+                conflicts[key] = (current, value)
+                if prefer != 'source':
+                    continue
+            self.set(target, key, value)
+        return conflicts
+
+    # Switch an engine and week_data from showing one branch to another, touching only differing slots.
+    # Returns the changed slots as (week, game, slot, game_result).
+    def checkout(self, current, name, engine, week_data):
+        changed = []
+        for (week, game), (_, value) in self.diff(current, name).items():
+            slot, game_result = value if value is not None else ({}, None)
+            week_data[week][game] = dict(slot)
+            engine.set_result(week, game, game_result)
+            changed.append((week, game, dict(slot), game_result))
+        return changed
@@ -0,0 +1,217 @@
+import csv
+import json
+import os
+
+RESULT_LABELS = ("Home Win", "Away Win", "Tie")
+# Schedule file formats by extension: .json is one array of game objects, .jsonl/.ndjson one object per line
+FORMATS = {'.csv': 'csv', '.json': 'json', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+# Column names accepted for each field, in CSV headers and JSON line keys alike
+FIELD_ALIASES = {
+    'week': ('week', 'wk'),
+    'home_team': ('home_team', 'home'),
+    'away_team': ('away_team', 'away'),
+    'home_score': ('home_score', 'home_points', 'home_pts'),
+    'away_score': ('away_score', 'away_points', 'away_pts'),
+}
+
+
+class ScheduleError(ValueError):
+    def __init__(self, problems):
+        self.problems = problems
+        shown = problems[:20]
+        more = f"\n... and {len(problems) - len(shown)} more" if len(problems) > len(shown) else ''
+        super().__init__('\n'.join(shown) + more)
+
+
+def _normalize(text):
+    return ' '.join(str(text).split()).casefold()
+
+
+# Lookup from every way a team may be written to its full name: abbreviation, full name,
+# nickname, city when only one team plays there, and any 'aliases' listed in team_data.json
+class TeamIndex:
+    def __init__(self, teams):
+        self.names = {}
+        ambiguous = set()
+        for team in teams:
+            self.names[_normalize(team['name'])] = team['name']
+            self.names[_normalize(team['abbreviation'])] = team['name']
+            for alias in team.get('aliases', ()):
+                self.names[_normalize(alias)] = team['name']
+        for team in teams:
+            city, _, nickname = team['name'].rpartition(' ')
+            for key in (_normalize(city), _normalize(nickname)):
+                if not key or key in ambiguous:
+                    continue
+                if self.names.get(key, team['name']) != team['name']:
+                    # "New York" or "Los Angeles" could be either team, so neither gets it
+                    ambiguous.add(key)
+                    del self.names[key]
+                else:
+                    self.names[key] = team['name']
+        self.abbreviations = [team['abbreviation'] for team in teams]
+
+    # Full team name, or None when the text does not name exactly one team
+    def lookup(self, text):
+        return self.names.get(_normalize(text))
+
+
+def _pick(record, field):
+    for key in FIELD_ALIASES[field]:
+        value = record.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _read_rows(file, file_format):
+    if file_format == 'csv':
+        reader = csv.DictReader(file)
+        if reader.fieldnames:
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        for row in reader:
+            yield reader.line_num, row
+    elif file_format == 'json':
+        try:
+            records = json.load(file)
+        except json.JSONDecodeError as error:
+            yield error.lineno, error
+            return
+        if not isinstance(records, list):
+            raise ScheduleError(["a .json schedule must be an array of game objects"])
+        # Numbered by position in the array, there being no one line per game
+        yield from enumerate(records, start=1)
+    else:
+        for line_number, line in enumerate(file, start=1):
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as error:
+                    yield line_number, error
+
+
+# Games of a season grouped by week, each as {'home_team', 'away_team', 'home_score', 'away_score'};
+# scores are None for games not played yet
+class Schedule:
+    def __init__(self, weeks):
+        self.weeks = weeks
+
+    def games(self):
+        for week in sorted(self.weeks):
+            for game in self.weeks[week]:
+                yield week, game
+
+    # Fill the imported weeks of week_data and bring the engine's results in line with them.
+    # Only slots that differ are touched, so re-importing a corrected feed costs little.
+    # Returns the changed slots as (week, game, slot, game_result) for journaling.
+    def apply(self, week_data, engine):
+        changed = []
+        for week, games in sorted(self.weeks.items()):
+            slots = week_data[week]
+            for game in range(len(slots)):
+                entry = games[game] if game < len(games) else None
+                slot, game_result = {}, None
+                if entry is not None:
+                    slot = {'home_team': entry['home_team'], 'away_team': entry['away_team'], 'result': ''}
+                    if entry['home_score'] is not None:
+                        game_result = dict(entry)
+                        slot['result'] = result_label(entry['home_score'], entry['away_score'])
+                if slots[game] == slot and engine.result(week, game) == game_result:
+                    continue
+                slots[game] = slot
+                engine.set_result(week, game, game_result)
+                changed.append((week, game, slot, game_result))
+        return changed
+
+
+def result_label(home_score, away_score):
+    if home_score > away_score:
+        return RESULT_LABELS[0]
+    if away_score > home_score:
+        return RESULT_LABELS[1]
+    return RESULT_LABELS[2]
+
+
+# Stream a schedule from CSV (header row with week, home, away and optional scores), a JSON array or
+# JSON lines, resolving team names through index. The format comes from the extension (see FORMATS)
+# unless given. Every problem found is reported together in one ScheduleError.
+def import_schedule(path, index, num_weeks=17, games_per_week=16, games_per_team=None, file_format=None):
+    if file_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in FORMATS:
+            raise ScheduleError([f"{os.path.basename(path)}: not a schedule file; use {', '.join(FORMATS)}"])
+        file_format = FORMATS[extension]
+    elif file_format not in FORMATS.values():
+        raise ScheduleError([f"unknown schedule format {file_format!r}"])
+    weeks = {}
+    teams_in_week = {}
+    matchups = {}
+    games_played = {}
+    problems = []
+    with open(path, 'r', newline='') as file:
+        for line_number, record in _read_rows(file, file_format):
+            where = f"{'game' if file_format == 'json' else 'line'} {line_number}"
+            if isinstance(record, Exception):
+                problems.append(f"{where}: not valid JSON ({record.msg})")
+                continue
+            if not isinstance(record, dict):
+                problems.append(f"{where}: expected a game object")
+                continue
+            try:
+                week = int(_pick(record, 'week'))
+            except (TypeError, ValueError):
+                problems.append(f"{where}: missing or invalid week")
+                continue
+            if not 1 <= week <= num_weeks:
+                problems.append(f"{where}: week {week} is outside 1-{num_weeks}")
+                continue
+            names = []
+            for field in ('home_team', 'away_team'):
+                text = _pick(record, field)
+                name = index.lookup(text) if text is not None else None
+                if name is None:
+                    problems.append(f"{where}: unknown {field.replace('_', ' ')} {text!r}")
+                names.append(name)
+            if None in names:
+                continue
+            home_team, away_team = names
+            if home_team == away_team:
+                problems.append(f"{where}: {home_team} cannot play itself")
+                continue
+            scores = [_pick(record, 'home_score'), _pick(record, 'away_score')]
+            if scores.count(None) == 1:
+                problems.append(f"{where}: only one score given")
+                continue
+            if scores[0] is not None:
+                try:
+                    scores = [int(score) for score in scores]
+                except ValueError:
+                    problems.append(f"{where}: scores must be whole numbers")
+                    continue
+            playing = teams_in_week.setdefault(week, {})
+            for name in (home_team, away_team):
+                if name in playing:
+                    problems.append(f"{where}: {name} already plays in week {week} (line {playing[name]})")
+            if home_team in playing or away_team in playing:
+                continue
+            if (home_team, away_team) in matchups:
+                problems.append(f"{where}: duplicate matchup {away_team} at {home_team} "
+                                f"(line {matchups[(home_team, away_team)]})")
+                continue
+            games = weeks.setdefault(week, [])
+            if len(games) == games_per_week:
+                problems.append(f"{where}: week {week} has more than {games_per_week} games")
+                continue
+            playing[home_team] = playing[away_team] = line_number
+            matchups[(home_team, away_team)] = line_number
+            for name in (home_team, away_team):
+                games_played[name] = games_played.get(name, 0) + 1
+            games.append({'home_team': home_team, 'away_team': away_team,
+                          'home_score': scores[0], 'away_score': scores[1]})
+    if games_per_team is not None:
+        for name in sorted(set(index.names.values())):
+            if games_played.get(name, 0) != games_per_team:
+                problems.append(f"{name} plays {games_played.get(name, 0)} games, expected {games_per_team}")
+    if problems:
+        raise ScheduleError(problems)
+    return Schedule(weeks)
@@ -0,0 +1,148 @@
+from bisect import bisect_left, insort
+
+from instrumentation import timed
+from seeding_cache import base_hash, outcome_hash
+from standings_store import StandingsStore
+from tiebreakers import TiebreakTables
+
+
+# Teams of one group kept in standings order, re-ranked one team at a time
+class RankedGroup:
+    def __init__(self, team_ids, key_fn):
+        self.key_fn = key_fn
+        self.current = {team_id: (key_fn(team_id), team_id) for team_id in team_ids}
+        self.entries = sorted(self.current.values())
+
+    def update(self, team_id):
+        old = self.current[team_id]
+        new = (self.key_fn(team_id), team_id)
+        if new == old:
+            return False
+        del self.entries[bisect_left(self.entries, old)]
+        insort(self.entries, new)
+        self.current[team_id] = new
+        return True
+
+    def order(self):
+        return [team_id for _, team_id in self.entries]
+
+
+# Season state where each game slot holds its current result and changes are applied as deltas
+class SeasonEngine:
+    def __init__(self, teams, standings=None, num_wildcards=3, seed_cache=None, game_model=None):
+        self.teams = teams
+        self.standings = standings if standings is not None else StandingsStore(teams)
+        self.num_wildcards = num_wildcards
+        self.slots = {}
+        # Zobrist key of the current outcomes, used to look seedings up in seed_cache
+        self.seed_cache = seed_cache
+        self.outcome_key = base_hash(teams, self.standings.to_dict(), num_wildcards)
+        # Ratings (see game_model.EloModel) that follow every result set here
+        self.game_model = game_model
+        self.tiebreakers = TiebreakTables(teams, self.standings)
+
+        team_ids = self.standings.team_ids
+        self.conference_of = [None] * len(teams)
+        self.division_of = [None] * len(teams)
+        conference_members = {}
+        division_members = {}
+        for team in teams:
+            team_id = team_ids[team['name']]
+            division = (team['conference'], team['division'])
+            self.conference_of[team_id] = team['conference']
+            self.division_of[team_id] = division
+            conference_members.setdefault(team['conference'], []).append(team_id)
+            division_members.setdefault(division, []).append(team_id)
+        self.conference_divisions = {conference: [division for division in division_members if division[0] == conference]
+                                     for conference in conference_members}
+
+        self.league = RankedGroup(range(len(teams)), self._rank_key)
+        self.conferences = {conference: RankedGroup(members, self._pct_key)
+                            for conference, members in conference_members.items()}
+        self.divisions = {division: RankedGroup(members, self._pct_key)
+                          for division, members in division_members.items()}
+        self._seeds = {}
+        self._changes = set()
+
+    # Ascending sort on this key gives calculate_standings order, ties kept in team order
+    def _rank_key(self, team_id):
+        return tuple(-value for value in self.standings.sort_key(self.standings.names[team_id]))
+
+    # Division and conference groups are kept in win-percentage order; ties are broken on read
+    def _pct_key(self, team_id):
+        return -self.tiebreakers.pct(team_id)
+
+    def result(self, week, game):
+        return self.slots.get((week, game))
+
+    # Replace the result stored in a game slot, game_result=None clears it
+    @timed('engine.set_result')
+    def set_result(self, week, game, game_result):
+        team_ids = self.standings.team_ids
+        touched = set()
+        previous = self.slots.pop((week, game), None)
+        if previous is not None:
+            home_id, away_id = team_ids[previous['home_team']], team_ids[previous['away_team']]
+            self.standings.unrecord(home_id, away_id, previous['home_score'], previous['away_score'])
+            self.tiebreakers.unrecord(home_id, away_id, previous['home_score'], previous['away_score'])
+            touched.update((home_id, away_id))
+            self.outcome_key ^= outcome_hash(week, game, previous)
+        if game_result is not None:
+            home_id, away_id = team_ids[game_result['home_team']], team_ids[game_result['away_team']]
+            self.standings.record(home_id, away_id, game_result['home_score'], game_result['away_score'])
+            self.tiebreakers.record(home_id, away_id, game_result['home_score'], game_result['away_score'])
+            self.slots[(week, game)] = game_result
+            touched.update((home_id, away_id))
+            self.outcome_key ^= outcome_hash(week, game, game_result)
+        if self.game_model is not None:
+            self.game_model.set_result(week, game, game_result)
+        return self.rerank(touched)
+
+    # Re-rank only the groups containing the given teams, returns the teams whose key changed
+    def rerank(self, team_ids):
+        changed = set()
+        for team_id in team_ids:
+            if self.league.update(team_id):
+                changed.add(team_id)
+            self.conferences[self.conference_of[team_id]].update(team_id)
+            self.divisions[self.division_of[team_id]].update(team_id)
+        # Strength of victory/schedule reach across conferences, so any tie anywhere may resolve differently
+        self._seeds.clear()
+        changed = {self.standings.names[team_id] for team_id in changed}
+        self._changes |= changed
+        return changed
+
+    # Teams whose standings changed since the last call, for views that redraw incrementally
+    def take_changes(self):
+        changes, self._changes = self._changes, set()
+        return changes
+
+    def league_order(self):
+        return [self.teams[team_id] for team_id in self.league.order()]
+
+    def division_order(self, conference, division):
+        order = self.tiebreakers.order(self.divisions[(conference, division)].order(), 'division')
+        return [self.teams[team_id] for team_id in order]
+
+    # Division winners ranked by record, then the best remaining teams of the conference
+    @timed('engine.seeds')
+    def seeds(self, conference):
+        if conference not in self._seeds and self.seed_cache is not None:
+            cached = self.seed_cache.get((self.outcome_key, conference))
+            if cached is not None:
+                self._seeds[conference] = cached
+        if conference not in self._seeds:
+            tiebreakers = self.tiebreakers
+            leaders = [tiebreakers.order(self.divisions[division].order(), 'division', limit=1)[0]
+                       for division in self.conference_divisions[conference]]
+            leaders.sort(key=self._pct_key)
+            seeds = tiebreakers.order(leaders, 'wildcard')
+            contenders = [team_id for team_id in self.conferences[conference].order() if team_id not in seeds]
+            seeds += tiebreakers.order(contenders, 'wildcard', limit=self.num_wildcards)
+            self._seeds[conference] = seeds
+            if self.seed_cache is not None:
+                self.seed_cache.put((self.outcome_key, conference), seeds)
+        return [self.teams[team_id] for team_id in self._seeds[conference]]
+
+    def playoff_teams(self):
+        return {conference: self.seeds(conference) for conference in self.conferences}
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+RESULT_FIELDS = ('home_team', 'away_team', 'home_score', 'away_score')
+# Stamped on saved caches; bump it whenever seeding or tiebreak rules change, so seedings worked out
+# under the old rules are not loaded back
+SEEDING_VERSION = 2
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(json.dumps(value).encode(), digest_size=8).digest(), 'big')
+
+
+# Zobrist value of one game slot holding one result. A season's key is the XOR of the values of
+# all filled slots, so setting, clearing or flipping a game changes the key with two XORs,
+# and the same outcomes give the same key whatever order they were entered in.
+def outcome_hash(week, game, game_result):
+    if game_result is None:
+        return 0
+    return _hash64([week, game] + [game_result[field] for field in RESULT_FIELDS])
+
+
+# Key of the state a season starts from: the league layout, wildcard count and base standings
+def base_hash(teams, standings, num_wildcards):
+    return _hash64([league_shape(teams, num_wildcards), standings])
+
+
+# The league layout and wildcard count a saved cache was built for
+def league_shape(teams, num_wildcards):
+    return [[[team['name'], team['conference'], team['division']] for team in teams], num_wildcards]
+
+
+# Seedings keyed by season outcome key and conference, least recently used dropped first.
+# shape (see league_shape) is saved with the entries, and a file saved for another league is not loaded.
+class SeedingCache:
+    def __init__(self, max_entries=100000, shape=None):
+        self.max_entries = max_entries
+        self.shape = shape
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        seeds = self.entries.get(key)
+        if seeds is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return seeds
+
+    def put(self, key, seeds):
+        self.entries[key] = seeds
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    # Entries are written oldest first so loading them back keeps the LRU order
+    def save(self, path):
+        entries = [[f"{outcome_key:016x}", conference, seeds] for (outcome_key, conference), seeds in self.entries.items()]
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'version': SEEDING_VERSION, 'shape': self.shape, 'entries': entries}, file)
+        os.replace(temp_path, path)
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            # A damaged cache file only costs recomputation
+            return False
+        if data.get('version') != SEEDING_VERSION or data.get('shape') != self.shape:
+            return False
+        for outcome_key, conference, seeds in data['entries']:
+            self.put((int(outcome_key, 16), conference), seeds)
+        return True
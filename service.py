@@ -0,0 +1,389 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from clinch import ClinchSolver
+from game_model import EloModel
+from rooting import RootingGuide
+from league import (compute_seeds, evaluate, load_league_config, load_team_data, remaining_slots, result_scores,
+                    standings_rows)
+from schedule_import import TeamIndex
+from session_store import SessionStore, base_standings, restore_engine
+
+# Long-running JSON service over local HTTP: the teams and the saved session stay loaded, so
+# dashboards and bots polling for seeds, standings, odds or what-ifs skip the per-query startup.
+#
+#   GET  /seeds               seeded team names per conference, best seed first
+#   GET  /standings           league standings rows
+#   GET  /odds?samples=N      playoff odds over the unplayed games
+#   POST /whatif              seeds and standings (and odds with "samples") after supplied outcomes:
+#                             {"outcomes": [{"week": 5, "game": 3, "result": "Home Win"},
+#                                           {"home_team": "KC", "away_team": "BUF", "result": "24-17"}],
+#                              "samples": 0}
+#   GET  /rooting?team=KC     the team's remaining games ranked by leverage and its best picks for
+#                             the coming week (or &week=N); &limit=N keeps the top games only
+#   GET  /clinch?team=KC      clinched and eliminated division, playoff and top seed races, magic
+#                             numbers and the fewest outcomes that clinch; every team without &team
+#   GET  /status              session version and cache counters
+#
+# The session files are watched rather than written: a save or pick in the app shows up in the
+# next query's answer and invalidates every cached response.
+
+MAX_SAMPLES = 1000000
+ROOTING_SAMPLES = 20000
+MAX_BODY = 1 << 20
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+
+class QueryError(ValueError):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def whole_number(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise QueryError(f"{name} must be a whole number, not {value!r}")
+
+
+class QueryService:
+    def __init__(self, team_data_file, session_file, workers=None, max_entries=1024, seed=0):
+        self.teams = load_team_data(team_data_file)
+        self.config = load_league_config(team_data_file, self.teams)
+        self.index = TeamIndex(self.teams)
+        self.session = SessionStore(session_file, num_weeks=self.config.weeks,
+                                    games_per_week=self.config.games_per_week, repair=False)
+        self.workers = workers
+        self.max_entries = max_entries
+        # A fixed seed keeps repeated odds queries consistent with each other
+        self.seed = seed
+        self.version = 0
+        self._signature = None
+        self._pool = None
+        self._guide = None
+        self._clinch = None
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refresh()
+
+    # Size and mtime of the snapshot and journal; any change means results were recorded or saved
+    def _files_signature(self):
+        signature = []
+        for path in (self.session.snapshot_path, self.session.journal_path):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    # Reload the session if its files changed; cached answers belong to the version they were made for
+    def refresh(self):
+        signature = self._files_signature()
+        if signature == self._signature:
+            return False
+        data = self.session.load()
+        self.game_model = EloModel(self.teams)
+        self.engine = restore_engine(self.teams, data, game_model=self.game_model, num_wildcards=self.config.wildcards)
+        self.week_data = data['week_data'] if data else self.config.empty_week_data()
+        # Standings from before the recorded results, which evaluate() counts them on top of
+        self.base = base_standings(self.engine)
+        self._signature = signature
+        self.version += 1
+        self._cache.clear()
+        return True
+
+    # Scored results of the current session plus overrides, and the games still unplayed, as
+    # evaluate() takes them
+    def _season(self, overrides=None):
+        overrides = overrides or {}
+        slots = dict(self.engine.slots)
+        slots.update(overrides)
+        results = [slots[slot] for slot in sorted(slots)]
+        schedule = [game for week, slot, game in self._unplayed() if (week, slot) not in overrides]
+        return results, schedule
+
+    # Unplayed games in schedule order, decided the same way as in the app
+    def _unplayed(self):
+        return sorted(remaining_slots(self.week_data, self.engine.standings), key=lambda item: item[:2])
+
+    # Game slot and scored result for one supplied outcome, addressed by week and game or by its teams
+    def _outcome(self, outcome, taken):
+        if not isinstance(outcome, dict):
+            raise QueryError(f"Outcome {outcome!r} is not an object")
+        if 'week' in outcome and 'game' in outcome:
+            week, game = whole_number(outcome['week'], 'week'), whole_number(outcome['game'], 'game')
+            if week not in self.week_data or not 0 <= game < len(self.week_data[week]):
+                raise QueryError(f"No game slot {game} in week {week}")
+            entry = self.week_data[week][game]
+            home_team = self.index.lookup(outcome.get('home_team', entry.get('home_team', '')))
+            away_team = self.index.lookup(outcome.get('away_team', entry.get('away_team', '')))
+            if home_team is None or away_team is None:
+                raise QueryError(f"Week {week} game {game} has no teams; give home_team and away_team")
+        else:
+            home_team = self.index.lookup(str(outcome.get('home_team', '')))
+            away_team = self.index.lookup(str(outcome.get('away_team', '')))
+            if home_team is None or away_team is None:
+                raise QueryError(f"Unknown team in {outcome.get('away_team')!r} at {outcome.get('home_team')!r}")
+            # The first unplayed meeting, in the given week if there is one
+            week = whole_number(outcome['week'], 'week') if 'week' in outcome else None
+            slot = next(((slot_week, game) for slot_week, game, entry in self._unplayed()
+                         if week in (None, slot_week) and entry['home_team'] == home_team
+                         and entry['away_team'] == away_team and (slot_week, game) not in taken), None)
+            if slot is None:
+                raise QueryError(f"No unplayed game with {away_team} at {home_team}")
+            week, game = slot
+        if 'home_score' in outcome and 'away_score' in outcome:
+            scores = (whole_number(outcome['home_score'], 'home_score'),
+                      whole_number(outcome['away_score'], 'away_score'))
+        else:
+            scores = result_scores(home_team, away_team, str(outcome.get('result', '')), self.game_model,
+                                   (week, game))
+            if scores is None:
+                raise QueryError(f"Result {outcome.get('result')!r} is not \"Home Win\", \"Away Win\", "
+                                 f"\"Tie\" or a score such as \"24-17\"")
+        return (week, game), {'home_team': home_team, 'away_team': away_team,
+                              'home_score': scores[0], 'away_score': scores[1]}
+
+    def _samples(self, value, default):
+        try:
+            samples = int(value if value is not None else default)
+        except (TypeError, ValueError):
+            raise QueryError(f"samples must be a whole number, not {value!r}")
+        if not 0 <= samples <= MAX_SAMPLES:
+            raise QueryError(f"samples must be between 0 and {MAX_SAMPLES}")
+        return samples
+
+    def _executor(self):
+        if self._pool is None:
+            # Spawned rather than forked, since the event loop process already runs threads
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    # The rooting guide of the current session version, built once on a thread and shared by every team's query
+    async def _rooting_guide(self):
+        if self._guide is None or self._guide[0] != self.version or \
+                (self._guide[1].done() and self._guide[1].exception() is not None):
+            standings, slots, model = self.engine.standings.to_dict(), self._unplayed(), self.game_model.copy()
+            played = list(self.engine.slots.values())
+            future = asyncio.get_running_loop().run_in_executor(
+                None, lambda: RootingGuide(self.teams, standings, slots, ROOTING_SAMPLES,
+                                           num_wildcards=self.config.wildcards, seed=self.seed, model=model,
+                                           played=played))
+            self._guide = (self.version, future)
+        return await asyncio.shield(self._guide[1])
+
+    # Clinch statuses of every team for the current session version, worked out once on a thread
+    async def _clinch_report(self):
+        if self._clinch is None or self._clinch[0] != self.version or \
+                (self._clinch[1].done() and self._clinch[1].exception() is not None):
+            solver = ClinchSolver(self.engine, [game for _, _, game in self._unplayed()])
+            self._clinch = (self.version, asyncio.get_running_loop().run_in_executor(None, solver.report))
+        return await asyncio.shield(self._clinch[1])
+
+    # Run evaluate() off the event loop; simulations go to worker processes
+    async def _evaluate(self, results, schedule, samples):
+        loop = asyncio.get_running_loop()
+        executor = self._executor() if samples > 0 else None
+        return await loop.run_in_executor(executor, evaluate, self.teams, results, schedule, samples, self.seed,
+                                          self.config.wildcards, self.base)
+
+    async def _compute(self, kind, params):
+        if kind == 'seeds':
+            return {'seeds': compute_seeds(self.engine)}
+        if kind == 'standings':
+            return {'standings': standings_rows(self.engine)}
+        if kind == 'odds':
+            results, schedule = self._season()
+            samples = self._samples(params.get('samples'), 100000)
+            if samples == 0:
+                raise QueryError("Odds need at least one sample")
+            report = await self._evaluate(results, schedule, samples)
+            return {'odds': report['odds'], 'samples': samples}
+        if kind == 'rooting':
+            team = self.index.lookup(str(params.get('team', '')))
+            if team is None:
+                raise QueryError(f"Unknown team {params.get('team')!r}")
+            try:
+                week = int(params['week']) if params.get('week') is not None else None
+                limit = int(params['limit']) if params.get('limit') is not None else None
+            except (TypeError, ValueError):
+                raise QueryError("week and limit must be whole numbers")
+            guide = await self._rooting_guide()
+            return await asyncio.get_running_loop().run_in_executor(None, guide.report, team, week, limit)
+        if kind == 'clinch':
+            team = None
+            if params.get('team') is not None:
+                team = self.index.lookup(str(params['team']))
+                if team is None:
+                    raise QueryError(f"Unknown team {params['team']!r}")
+            report = await self._clinch_report()
+            return {'clinch': report if team is None else {team: report[team]}}
+        if kind == 'whatif':
+            outcomes = params.get('outcomes', [])
+            if not isinstance(outcomes, list):
+                raise QueryError("outcomes must be a list")
+            overrides = {}
+            for outcome in outcomes:
+                slot, game_result = self._outcome(outcome, overrides)
+                overrides[slot] = game_result
+            results, schedule = self._season(overrides)
+            report = await self._evaluate(results, schedule, self._samples(params.get('samples'), 0))
+            report['outcomes'] = [dict(game_result, week=week, game=game)
+                                  for (week, game), game_result in sorted(overrides.items())]
+            return report
+        raise QueryError(f"Unknown query {kind!r}", 404)
+
+    # Cached answer for the current session version; identical queries already running share one computation
+    async def query(self, kind, params):
+        self.refresh()
+        key = (self.version, kind, json.dumps(params, sort_keys=True))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._compute(kind, params))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        # A client hanging up must not cancel the computation others are waiting on
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or key[0] != self.version:
+            return
+        self._cache[key] = task.result()
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def status(self):
+        self.refresh()
+        return {'version': self.version, 'results': len(self.engine.slots), 'cached': len(self._cache),
+                'in_flight': len(self._in_flight), 'hits': self.hits, 'misses': self.misses,
+                'coalesced': self.coalesced}
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def route(self, method, target, body):
+        url = urlsplit(target)
+        kind = url.path.strip('/')
+        if kind == 'status':
+            return self.status()
+        if kind == 'whatif':
+            if method != 'POST':
+                raise QueryError("Use POST with a JSON body for what-if queries", 405)
+            try:
+                params = json.loads(body or b'{}')
+            except (UnicodeDecodeError, json.JSONDecodeError) as error:
+                raise QueryError(f"Request body is not valid JSON: {error}")
+            if not isinstance(params, dict):
+                raise QueryError("Request body must be a JSON object")
+            return await self.query(kind, params)
+        if method != 'GET':
+            raise QueryError(f"Use GET for /{kind}", 405)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        return await self.query(kind, params)
+
+    # One HTTP/1.1 connection; requests are answered in turn until the client closes it
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                length = headers.get('content-length', '0')
+                if not (length.isascii() and length.isdigit()):
+                    # Anything but a plain non-negative decimal leaves the body's end unknown
+                    await self._respond(writer, 400, {'error': f"Invalid Content-Length {length!r}"}, False)
+                    break
+                length = int(length)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {'error': "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                try:
+                    status, payload = 200, await self.route(method.upper(), target, body)
+                except QueryError as error:
+                    status, payload = error.status, {'error': str(error)}
+                except Exception as error:
+                    status, payload = 500, {'error': f"{type(error).__name__}: {error}"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                     f"\r\n".encode() + body)
+        await writer.drain()
+
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(service.handle, host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving playoff queries on http://{address[0]}:{address[1]}/", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer seeds, standings, playoff odds and what-if queries "
+                                                 "as JSON over local HTTP, keeping the season loaded.")
+    parser.add_argument('--teams', default='team_data.json', help="team data file")
+    parser.add_argument('--session', default='game_data.json', help="saved session to serve, reloaded when it changes")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on")
+    parser.add_argument('--port', type=int, default=8765, help="port to listen on")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for odds (default: all cores)")
+    parser.add_argument('--cache-size', type=int, default=1024, help="cached responses kept per session version")
+    args = parser.parse_args(argv)
+
+    service = QueryService(args.teams, args.session, args.workers, args.cache_size)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
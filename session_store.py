@@ -0,0 +1,142 @@
+import json
+import os
+
+from season_engine import SeasonEngine
+from standings_store import StandingsStore
+
+
+def empty_week_data(num_weeks=17, games_per_week=16):
+    return {week: [{} for _ in range(games_per_week)] for week in range(1, num_weeks + 1)}
+
+
+# Session data kept as a snapshot file plus an append-only journal of changes since it was written.
+# Every pick costs one appended line; compact() folds the journal into a new snapshot.
+# With repair=False a torn journal tail is skipped but left in place, for readers of a session
+# that another process is still writing.
+class SessionStore:
+    def __init__(self, snapshot_path, journal_path=None, compact_every=500, durable=False, num_weeks=17,
+                 games_per_week=16, repair=True):
+        self.snapshot_path = snapshot_path
+        self.num_weeks = num_weeks
+        self.games_per_week = games_per_week
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + '.journal'
+        self.compact_every = compact_every
+        self.durable = durable
+        self.repair = repair
+        self._journal = None
+        self.pending = 0
+
+    # Snapshot plus replayed journal as {'week_data', 'results', 'standings', 'base'}, or None if
+    # nothing is saved. base is the standings the results are counted on top of: the whole record of
+    # an older standings-only save, or None when the results are all there is.
+    def load(self):
+        data = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as file:
+                data = json.load(file)
+        if data is not None and not ('week_data' in data or 'results' in data):
+            # Older saves hold only the standings, with no results behind them
+            data = {'standings': data, 'base': data}
+        entries = self._read_journal()
+        if data is None and not entries:
+            return None
+        data = data or {}
+        week_data = empty_week_data(self.num_weeks, self.games_per_week)
+        for week, slots in data.get('week_data', {}).items():
+            # Saved under another league shape, the week is padded or cut to the current one
+            if int(week) in week_data:
+                week_data[int(week)] = slots[:self.games_per_week] + [{} for _ in range(self.games_per_week - len(slots))]
+        results = {(int(result['week']), int(result['game'])): result for result in data.get('results', [])
+                   if self._in_shape(int(result['week']), int(result['game']))}
+        for entry in entries:
+            week, game = int(entry['week']), int(entry['game'])
+            if not self._in_shape(week, game):
+                # A slot the current league shape has no room for
+                continue
+            week_data[week][game] = entry['slot']
+            if entry['result'] is None:
+                results.pop((week, game), None)
+            else:
+                results[(week, game)] = dict(entry['result'], week=week, game=game)
+        self.pending = len(entries)
+        return {'week_data': week_data, 'results': list(results.values()), 'standings': data.get('standings'),
+                'base': data.get('base')}
+
+    def _in_shape(self, week, game):
+        return 1 <= week <= self.num_weeks and 0 <= game < self.games_per_week
+
+    def _read_journal(self):
+        if not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        valid_bytes = 0
+        with open(self.journal_path, 'rb') as file:
+            for line in file:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+                valid_bytes += len(line)
+        if self.repair and valid_bytes < os.path.getsize(self.journal_path):
+            # Cut a torn final line from a crash mid-write so new entries start on a clean line
+            with open(self.journal_path, 'r+b') as file:
+                file.truncate(valid_bytes)
+        return entries
+
+    # Append one game slot change; result is the scored game or None when it was cleared
+    def record(self, week, game, slot, result):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a')
+        self._journal.write(json.dumps({'week': week, 'game': game, 'slot': slot, 'result': result}) + '\n')
+        self._journal.flush()
+        if self.durable:
+            os.fsync(self._journal.fileno())
+        self.pending += 1
+
+    def should_compact(self):
+        return self.pending >= self.compact_every
+
+    # Write a full snapshot atomically, then start an empty journal. Besides the total standings it
+    # holds the base standings without any slot's result, so results are never counted twice.
+    def compact(self, week_data, engine):
+        results = [dict(result, week=week, game=game) for (week, game), result in engine.slots.items()]
+        data = {'standings': engine.standings.to_dict(), 'base': base_standings(engine), 'week_data': week_data,
+                'results': results}
+        temp_path = self.snapshot_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        # Replaying entries already in the snapshot is harmless, so a crash here loses nothing
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, 'w')
+        self.pending = 0
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+# An engine's standings with every slot's result taken back out
+def base_standings(engine):
+    base = StandingsStore.from_dict(engine.teams, engine.standings.to_dict())
+    for result in engine.slots.values():
+        base.unrecord(base.team_ids[result['home_team']], base.team_ids[result['away_team']],
+                      result['home_score'], result['away_score'])
+    return base.to_dict()
+
+
+# Rebuild the season engine from loaded session data: the base standings with every recorded result replayed
+def restore_engine(teams, data, seed_cache=None, game_model=None, num_wildcards=3):
+    options = {'num_wildcards': num_wildcards, 'seed_cache': seed_cache, 'game_model': game_model}
+    if data is None:
+        return SeasonEngine(teams, **options)
+    base = StandingsStore.from_dict(teams, data['base']) if data.get('base') else None
+    engine = SeasonEngine(teams, base, **options)
+    for result in sorted(data['results'], key=lambda result: (result['week'], result['game'])):
+        game_result = {field: result[field] for field in ('home_team', 'away_team', 'home_score', 'away_score')}
+        engine.set_result(result['week'], result['game'], game_result)
+    return engine
@@ -0,0 +1,531 @@
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from instrumentation import profiler, timed
+
+# Outcome codes used in the sampled outcome matrices
+HOME_WIN = 0
+AWAY_WIN = 1
+TIE = 2
+
+# Fields of the head-to-head tables: a team's record and points against one opponent
+H2H_FIELDS = ('wins', 'losses', 'ties', 'points_for', 'points_against')
+
+
+# Split week data into recorded results and unplayed games
+def split_week_data(week_data):
+    recorded = []
+    remaining = []
+    for week in sorted(week_data, key=int):
+        for game in week_data[week]:
+            if not game.get('home_team') or not game.get('away_team'):
+                continue
+            if 'home_score' in game and 'away_score' in game:
+                recorded.append(game)
+            else:
+                remaining.append({'home_team': game['home_team'], 'away_team': game['away_team']})
+    return recorded, remaining
+
+
+def win_pcts(wins, losses, ties):
+    games = wins + losses + ties
+    return np.where(games > 0, (wins + 0.5 * ties) / np.maximum(games, 1), 0.0)
+
+
+# Competition ranks (1, 2, 2, 4, ...) along each row, best first
+def competition_ranks(values, reverse):
+    keys = -values if reverse else values
+    keys = keys - keys.min()
+    num_rows, num_columns = keys.shape
+    flat = (keys + (int(keys.max()) + 1) * np.arange(num_rows)[:, None]).ravel()
+    ahead = np.searchsorted(np.sort(flat), flat, side='left') - num_columns * np.repeat(np.arange(num_rows), num_columns)
+    return ahead.reshape(num_rows, num_columns) + 1
+
+
+# Precomputed team indices, game incidence matrices and played-game tiebreak tables for a season.
+# played holds the scored results already counted in standings; the head-to-head, division,
+# conference and common-game records the tiebreakers read come from them, as in
+# tiebreakers.TiebreakTables, so each sample is seeded the way SeasonEngine.seeds would seed it.
+class SeasonArrays:
+    def __init__(self, teams, standings, remaining_games, num_wildcards=3, played=()):
+        self.teams = teams
+        self.names = [team['name'] for team in teams]
+        self.team_ids = {name: idx for idx, name in enumerate(self.names)}
+        self.num_teams = n = len(teams)
+        self.num_wildcards = num_wildcards
+
+        conference_names = sorted({team['conference'] for team in teams})
+        division_names = sorted({(team['conference'], team['division']) for team in teams})
+        self.conference_of = np.array([conference_names.index(team['conference']) for team in teams])
+        self.division_of = np.array([division_names.index((team['conference'], team['division'])) for team in teams])
+        self.conference_names = conference_names
+        self.conference_members = [np.flatnonzero(self.conference_of == c) for c in range(len(conference_names))]
+        self.division_members = [np.flatnonzero(self.division_of == d) for d in range(len(division_names))]
+        self.conference_divisions = [
+            [d for d, (conference, _) in enumerate(division_names) if conference == conference_name]
+            for conference_name in conference_names
+        ]
+        # Wildcards come from the teams left once every division has its winner, however few that is
+        self.num_conference_wildcards = [min(num_wildcards, len(members) - len(divisions))
+                                         for members, divisions in zip(self.conference_members, self.conference_divisions)]
+        self.num_seeds = max(len(divisions) + wildcards
+                             for divisions, wildcards in zip(self.conference_divisions, self.num_conference_wildcards))
+
+        self.base = {field: np.array([standings[name].get(field, 0) for name in self.names], dtype=np.int64)
+                     for field in ('wins', 'losses', 'ties', 'points_scored', 'points_allowed')}
+
+        # h2h[f, a, b]: team a's H2H_FIELDS[f] against team b over the played games
+        self.h2h = np.zeros((len(H2H_FIELDS), n, n), dtype=np.int64)
+        for game in played:
+            home, away = self.team_ids[game['home_team']], self.team_ids[game['away_team']]
+            home_score, away_score = game['home_score'], game['away_score']
+            result = 0 if home_score > away_score else 1 if home_score < away_score else 2
+            self.h2h[result, home, away] += 1
+            self.h2h[(1, 0, 2)[result], away, home] += 1
+            self.h2h[3:, home, away] += (home_score, away_score)
+            self.h2h[3:, away, home] += (away_score, home_score)
+        same_division = self.division_of[:, None] == self.division_of[None, :]
+        same_conference = self.conference_of[:, None] == self.conference_of[None, :]
+        for prefix, same in (('division_', same_division), ('conference_', same_conference)):
+            for field in range(len(H2H_FIELDS)):
+                self.base[prefix + H2H_FIELDS[field]] = (self.h2h[field] * same).sum(axis=1)
+
+        self.home = np.array([self.team_ids[game['home_team']] for game in remaining_games], dtype=np.int64)
+        self.away = np.array([self.team_ids[game['away_team']] for game in remaining_games], dtype=np.int64)
+        self.num_games = len(remaining_games)
+        # Columns [0, n) count the home side of a game, [n, 2n) the away side
+        self.incidence = np.zeros((self.num_games, 2 * n), dtype=np.float32)
+        self.incidence[np.arange(self.num_games), self.home] = 1
+        self.incidence[np.arange(self.num_games), n + self.away] = 1
+        # Rows [0, games) credit a game's home team, [games, 2 games) its away team
+        self.sides = np.concatenate([self.incidence[:, :n], self.incidence[:, n:]])
+        self.division_games = np.flatnonzero(self.division_of[self.home] == self.division_of[self.away])
+        self.conference_games = np.flatnonzero(self.conference_of[self.home] == self.conference_of[self.away])
+
+        # Games between every pair once the season is complete, and who has played whom
+        self.games_between = self.h2h[:3].sum(axis=0)
+        np.add.at(self.games_between, (self.home, self.away), 1)
+        np.add.at(self.games_between, (self.away, self.home), 1)
+        self.opponents = self.games_between > 0
+
+    # Sample an outcome matrix of shape (samples, games)
+    def sample_outcomes(self, rng, num_samples, home_win_prob=0.5, tie_prob=0.0):
+        home_win_prob = np.broadcast_to(np.asarray(home_win_prob, dtype=np.float64), (self.num_games,))
+        tie_prob = np.broadcast_to(np.asarray(tie_prob, dtype=np.float64), (self.num_games,))
+        draws = rng.random((num_samples, self.num_games))
+        outcomes = np.full((num_samples, self.num_games), AWAY_WIN, dtype=np.int8)
+        outcomes[draws < home_win_prob * (1 - tie_prob)] = HOME_WIN
+        outcomes[draws >= 1 - tie_prob] = TIE
+        return outcomes
+
+    # Wins, losses and ties credited by a subset of games, each of shape (samples, teams)
+    def _record(self, outcomes, games=None):
+        incidence = self.incidence if games is None else self.incidence[games]
+        n = self.num_teams
+        by_home_win = (outcomes == HOME_WIN).astype(np.float32) @ incidence
+        by_away_win = (outcomes == AWAY_WIN).astype(np.float32) @ incidence
+        by_tie = (outcomes == TIE).astype(np.float32) @ incidence
+        return (by_home_win[:, :n] + by_away_win[:, n:], by_home_win[:, n:] + by_away_win[:, :n],
+                by_tie[:, :n] + by_tie[:, n:])
+
+    # Points for and against credited by a subset of games
+    def _points(self, scores, games=None):
+        incidence = self.incidence if games is None else self.incidence[games]
+        n = self.num_teams
+        home, away = (side if games is None else side[:, games] for side in scores)
+        # float32 sums stay exact well past any season's point total
+        by_home = home.astype(np.float32) @ incidence
+        by_away = away.astype(np.float32) @ incidence
+        return by_home[:, :n] + by_away[:, n:], by_away[:, :n] + by_home[:, n:]
+
+    # Final records for every sample, each of shape (samples, teams): overall, division and
+    # conference, plus point totals when scores (home, away) were sampled; without scores the
+    # remaining games add no points. Each game's credits are kept for the head-to-head steps.
+    def tally(self, outcomes, scores=None):
+        totals = {}
+        for prefix, games in (('', None), ('division_', self.division_games), ('conference_', self.conference_games)):
+            sampled = self._record(outcomes if games is None else outcomes[:, games], games)
+            if scores is not None:
+                sampled += self._points(scores, games)
+            fields = ('wins', 'losses', 'ties', 'points_scored', 'points_allowed') if not prefix else \
+                tuple(prefix + field for field in H2H_FIELDS)
+            for field, value in zip(fields, sampled):
+                totals[field] = self.base[field] + value.astype(np.int64)
+            for field in fields[len(sampled):]:
+                totals[field] = np.broadcast_to(self.base[field], outcomes.shape[:1] + (self.num_teams,))
+        totals['pct'] = win_pcts(totals['wins'], totals['losses'], totals['ties'])
+        # by_game[f][s, g]: what game g credits to its home side (columns [0, games)) and its away
+        # side (columns [games, 2 games)) for H2H_FIELDS[f] in sample s
+        won, lost, drawn = (outcomes == HOME_WIN), (outcomes == AWAY_WIN), (outcomes == TIE)
+        totals['by_game'] = [np.concatenate(sides, axis=1).astype(np.float32)
+                             for sides in ((won, lost), (lost, won), (drawn, drawn))]
+        totals['by_game'] += [None, None] if scores is None else \
+            [np.concatenate(sides, axis=1).astype(np.float32) for sides in (scores, scores[::-1])]
+        return totals
+
+    # Each team's combined H2H_FIELDS against a per-sample set of opponents, shape (5, rows, teams)
+    def _versus(self, totals, rows, opponents, fields=len(H2H_FIELDS)):
+        combined = opponents.astype(np.float32) @ self.h2h[:fields].transpose(0, 2, 1).astype(np.float32)
+        if self.num_games:
+            # A game counts for its home team when the away team is in the set, and the other way round
+            against = np.concatenate([opponents[:, self.away], opponents[:, self.home]], axis=1)
+            for field in range(fields):
+                credited = totals['by_game'][field]
+                if credited is not None:
+                    combined[field] += np.where(against, credited[rows], 0) @ self.sides
+        return combined
+    # Opponents every tied team has played, not counting the tied teams themselves
+    def _common_opponents(self, tied):
+        missing = tied.astype(np.float64) @ (~self.opponents).astype(np.float64)
+        return (missing == 0) & ~tied
+
+    # Tiebreaking steps as in tiebreakers.TiebreakTables, for many samples at once: each takes the
+    # tied teams as a (rows, teams) mask and returns values (higher is better) and whether the
+    # step applies in each row
+
+    def _head_to_head(self, totals, rows, tied, record=None):
+        wins, losses, ties = self._versus(totals, rows, tied, 3) if record is None else record
+        applicable = ~(tied & (wins + losses + ties == 0)).any(axis=1)
+        return win_pcts(wins, losses, ties), applicable
+
+    def _head_to_head_sweep(self, totals, rows, tied, record=None):
+        wins, losses, ties = self._versus(totals, rows, tied, 3) if record is None else record
+        played_all = tied.astype(np.float64) @ self.opponents.T.astype(np.float64) == tied.sum(axis=1, keepdims=True) - 1
+        sweeper = tied & played_all & (losses + ties == 0)
+        swept = tied & played_all & (wins + ties == 0)
+        has_sweeper = sweeper.any(axis=1)
+        values = np.where(has_sweeper[:, None], sweeper, ~swept).astype(np.float64)
+        return values, has_sweeper | swept.any(axis=1)
+
+    # Two-team wildcard ties go by head-to-head record, larger ones only by a sweep
+    def _wildcard_head_to_head(self, totals, rows, tied):
+        two = tied.sum(axis=1) == 2
+        record = self._versus(totals, rows, tied, 3)
+        values, applicable = self._head_to_head(totals, rows, tied, record)
+        sweep_values, sweep_applicable = self._head_to_head_sweep(totals, rows, tied, record)
+        return np.where(two[:, None], values, sweep_values), np.where(two, applicable, sweep_applicable)
+
+    def _division_pct(self, totals, rows, tied):
+        return win_pcts(*(totals['division_' + field][rows] for field in H2H_FIELDS[:3])), True
+
+    def _conference_pct(self, totals, rows, tied):
+        return win_pcts(*(totals['conference_' + field][rows] for field in H2H_FIELDS[:3])), True
+
+    def _common_games(self, totals, rows, tied, minimum=1):
+        wins, losses, ties = self._versus(totals, rows, self._common_opponents(tied), 3)
+        applicable = ~(tied & (wins + losses + ties < minimum)).any(axis=1)
+        return win_pcts(wins, losses, ties), applicable
+
+    def _common_games_min_four(self, totals, rows, tied):
+        return self._common_games(totals, rows, tied, minimum=4)
+
+    # Combined record of the opponents beaten (victory) or played (schedule), from final records
+    def _strength(self, totals, rows, beaten):
+        records = [totals[field][rows].astype(np.float64) for field in H2H_FIELDS[:3]]
+        if not beaten:
+            return win_pcts(*(record @ self.games_between.T for record in records))
+        combined = [record @ self.h2h[0].T for record in records]
+        if self.num_games:
+            won = totals['by_game'][0][rows]
+            for total, record in zip(combined, records):
+                total += (won * np.concatenate([record[:, self.away], record[:, self.home]], axis=1)) @ self.sides
+        return win_pcts(*combined)
+
+    def _strength_of_victory(self, totals, rows, tied):
+        return self._strength(totals, rows, beaten=True), True
+
+    def _strength_of_schedule(self, totals, rows, tied):
+        return self._strength(totals, rows, beaten=False), True
+
+    def _points_ranking(self, totals, rows, pools):
+        values = np.zeros((len(rows), self.num_teams))
+        for pool in pools:
+            scored = competition_ranks(totals['points_scored'][rows][:, pool], reverse=True)
+            allowed = competition_ranks(totals['points_allowed'][rows][:, pool], reverse=False)
+            values[:, pool] = -(scored + allowed)
+        return values
+
+    # Tied teams share a conference, so ranking every conference separately covers them all
+    def _conference_points_ranking(self, totals, rows, tied):
+        return self._points_ranking(totals, rows, self.conference_members), True
+
+    def _league_points_ranking(self, totals, rows, tied):
+        return self._points_ranking(totals, rows, [np.arange(self.num_teams)]), True
+
+    def _common_net_points(self, totals, rows, tied):
+        points_for, points_against = self._versus(totals, rows, self._common_opponents(tied))[3:]
+        return points_for - points_against, True
+
+    def _conference_net_points(self, totals, rows, tied):
+        return (totals['conference_points_for'][rows] - totals['conference_points_against'][rows]).astype(np.float64), True
+
+    def _net_points(self, totals, rows, tied):
+        return (totals['points_scored'][rows] - totals['points_allowed'][rows]).astype(np.float64), True
+
+    def _procedure(self, kind):
+        if kind == 'division':
+            return [self._head_to_head, self._division_pct, self._common_games, self._conference_pct,
+                    self._strength_of_victory, self._strength_of_schedule, self._conference_points_ranking,
+                    self._league_points_ranking, self._common_net_points, self._net_points]
+        return [self._wildcard_head_to_head, self._conference_pct, self._common_games_min_four,
+                self._strength_of_victory, self._strength_of_schedule, self._conference_points_ranking,
+                self._league_points_ranking, self._conference_net_points, self._net_points]
+
+    # Best team of each row's tied teams, as TiebreakTables.best_of; rows are sample indices
+    def _best_of(self, totals, rows, tied, kind):
+        tied = tied.copy()
+        undecided = np.flatnonzero(tied.sum(axis=1) > 1)
+        while len(undecided):
+            if kind == 'wildcard':
+                tied[undecided] = self._best_per_division(totals, rows[undecided], tied[undecided])
+            pending = undecided[tied[undecided].sum(axis=1) > 1]
+            for step in self._procedure(kind):
+                if not len(pending):
+                    break
+                candidates = tied[pending]
+                values, applicable = step(totals, rows[pending], candidates)
+                best = np.where(candidates, values, -np.inf).max(axis=1)
+                survivors = candidates & (values == best[:, None])
+                # Eliminating any club restarts the procedure for the rest
+                reduced = applicable & (survivors.sum(axis=1) < candidates.sum(axis=1))
+                tied[pending[reduced]] = survivors[reduced]
+                pending = pending[~reduced]
+            if len(pending):
+                # Coin toss: a drawn lottery when sampling, otherwise team_data.json order as in the engine
+                lottery = totals['lottery'][rows[pending]] if totals.get('lottery') is not None else \
+                    np.broadcast_to(-np.arange(self.num_teams), (len(pending), self.num_teams))
+                winners = np.argmax(np.where(tied[pending], lottery, np.iinfo(np.int64).min), axis=1)
+                tied[pending] = False
+                tied[pending, winners] = True
+            undecided = undecided[tied[undecided].sum(axis=1) > 1]
+        return np.argmax(tied, axis=1)
+
+    # Wildcard ties start by keeping only the highest-ranked club of each division
+    def _best_per_division(self, totals, rows, tied):
+        for members in self.division_members:
+            group = np.zeros_like(tied)
+            group[:, members] = tied[:, members]
+            shared = np.flatnonzero(group.sum(axis=1) > 1)
+            if len(shared):
+                winners = self._best_of(totals, rows[shared], group[shared], 'division')
+                tied[np.ix_(shared, members)] = False
+                tied[shared, winners] = True
+        return tied
+
+    # Up to limit teams of each sample's candidates in order, as TiebreakTables.order: the best
+    # win percentage first, ties broken by the procedure; -1 once a sample runs out of candidates
+    def _order(self, totals, candidates, kind, limit):
+        remaining = candidates.copy()
+        picked = np.full((len(candidates), limit), -1, dtype=np.int64)
+        for position in range(limit):
+            rows = np.flatnonzero(remaining.any(axis=1))
+            if not len(rows):
+                break
+            pct = np.where(remaining[rows], totals['pct'][rows], -1.0)
+            tied = remaining[rows] & (pct == pct.max(axis=1, keepdims=True))
+            winners = self._best_of(totals, rows, tied, kind)
+            picked[rows, position] = winners
+            remaining[rows, winners] = False
+        return picked
+
+    # Seed of every team in every sample (0 = missed the playoffs), by SeasonEngine.seeds' rules:
+    # division winners ranked first, then the best other teams of the conference. With rng,
+    # ties the whole procedure leaves level go to a per-sample lottery instead of team order.
+    def seed(self, totals, rng=None):
+        num_samples = totals['wins'].shape[0]
+        if rng is not None:
+            totals['lottery'] = rng.permuted(np.broadcast_to(np.arange(self.num_teams), (num_samples, self.num_teams)),
+                                             axis=1)
+        rows = np.arange(num_samples)[:, None]
+        seeds = np.zeros((num_samples, self.num_teams), dtype=np.int8)
+        for conference, divisions in enumerate(self.conference_divisions):
+            leaders = np.zeros((num_samples, self.num_teams), dtype=bool)
+            for division in divisions:
+                members = np.zeros_like(leaders)
+                members[:, self.division_members[division]] = True
+                leaders[rows, self._order(totals, members, 'division', 1)] = True
+            ranked = self._order(totals, leaders, 'wildcard', len(divisions))
+            seeds[rows, ranked] = np.arange(1, len(divisions) + 1)
+
+            contenders = np.zeros_like(leaders)
+            contenders[:, self.conference_members[conference]] = True
+            contenders &= ~leaders
+            num_wildcards = self.num_conference_wildcards[conference]
+            wildcards = self._order(totals, contenders, 'wildcard', num_wildcards)
+            seeds[rows, wildcards] = np.arange(len(divisions) + 1, len(divisions) + 1 + num_wildcards)
+        return seeds
+
+
+# Outcomes of one batch of simulated season completions, plus (home, away) scores when a game
+# model (see game_model.EloModel) is given, or None
+def sample_season(season, rng, num_samples, home_win_prob=0.5, tie_prob=0.0, model=None):
+    if model is None:
+        return season.sample_outcomes(rng, num_samples, home_win_prob, tie_prob), None
+    scores = model.sample_scores(rng, season.home, season.away, num_samples)
+    outcomes = np.where(scores[0] > scores[1], HOME_WIN, np.where(scores[0] < scores[1], AWAY_WIN, TIE)).astype(np.int8)
+    return outcomes, scores
+
+
+# Seed counts per team from one batch of simulated season completions. With a game model
+# scores are sampled too and decide the point-based tiebreaks.
+def simulate_batch(season, rng, num_samples, home_win_prob=0.5, tie_prob=0.0, model=None):
+    outcomes, scores = sample_season(season, rng, num_samples, home_win_prob, tie_prob, model)
+    seeds = season.seed(season.tally(outcomes, scores), rng)
+    return outcomes, seeds
+
+
+# Count how often each team lands on each seed, column 0 = eliminated
+def seed_histogram(season, seeds):
+    width = season.num_seeds + 1
+    flat = np.arange(season.num_teams) * width + seeds.astype(np.int64)
+    return np.bincount(flat.ravel(), minlength=season.num_teams * width).reshape(season.num_teams, width)
+
+
+# Convert seed counts into per-team probabilities
+def odds_from_histogram(season, counts):
+    total = counts[0].sum()
+    num_division_seeds = {conference: len(divisions) for conference, divisions in enumerate(season.conference_divisions)}
+    odds = {}
+    for idx, name in enumerate(season.names):
+        probabilities = counts[idx] / total if total else np.zeros(season.num_seeds + 1)
+        division_seeds = num_division_seeds[season.conference_of[idx]]
+        odds[name] = {
+            'seeds': [float(p) for p in probabilities[1:]],
+            'division_title': float(probabilities[1:division_seeds + 1].sum()),
+            'playoffs': float(probabilities[1:].sum()),
+            'eliminated': float(probabilities[0]),
+        }
+    return odds
+
+
+# Monte Carlo playoff odds over the remaining schedule; played are the scored results behind standings
+@timed('simulation.simulate_season')
+def simulate_season(teams, standings, remaining_games, num_samples=100000, home_win_prob=0.5,
+                    tie_prob=0.0, num_wildcards=3, batch_size=5000, seed=None, cancelled=None, model=None, played=()):
+    season = SeasonArrays(teams, standings, remaining_games, num_wildcards, played)
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((season.num_teams, season.num_seeds + 1), dtype=np.int64)
+    done = 0
+    while done < num_samples:
+        # Checked between batches so a superseded background run stops early
+        if cancelled is not None and cancelled():
+            return None
+        batch = min(batch_size, num_samples - done)
+        _, seeds = simulate_batch(season, rng, batch, home_win_prob, tie_prob, model)
+        counts += seed_histogram(season, seeds)
+        done += batch
+    profiler.count('simulation.samples', done)
+    return odds_from_histogram(season, counts)
+
+
+# Seed counts for one shard of a parallel run. The season arrays are rebuilt only when a
+# worker sees a new run, so later shards of the same run skip the setup.
+_worker_run = {}
+
+
+def _simulate_shard(run_key, season_args, seed_sequence, num_samples, home_win_prob, tie_prob, batch_size, model):
+    if _worker_run.get('key') != run_key:
+        _worker_run['key'] = run_key
+        _worker_run['season'] = SeasonArrays(*season_args)
+    season = _worker_run['season']
+    rng = np.random.default_rng(seed_sequence)
+    counts = np.zeros((season.num_teams, season.num_seeds + 1), dtype=np.int64)
+    done = 0
+    while done < num_samples:
+        batch = min(batch_size, num_samples - done)
+        _, seeds = simulate_batch(season, rng, batch, home_win_prob, tie_prob, model)
+        counts += seed_histogram(season, seeds)
+        done += batch
+    return counts
+
+
+# Largest confidence interval half-width over every team's playoff probability
+def playoff_half_width(counts, z=1.96):
+    total = counts[0].sum()
+    if not total:
+        return float('inf')
+    playoffs = counts[:, 1:].sum(axis=1) / total
+    return float(z * np.sqrt(playoffs * (1 - playoffs) / total).max())
+
+
+# Monte Carlo odds sharded over a process pool that stays up between runs.
+# Shard k always draws from child k of SeedSequence(seed), and shards are merged in index order,
+# so a given seed gives identical odds for any number of workers, early stopping included.
+class ParallelSimulator:
+    def __init__(self, workers=None, start_method='spawn'):
+        self.workers = workers or os.cpu_count() or 1
+        self.start_method = start_method
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def _executor(self):
+        if self._pool is None:
+            context = multiprocessing.get_context(self.start_method) if self.start_method else None
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=context)
+        return self._pool
+
+    # progress(samples_done, num_samples, half_width) is called after each merged shard;
+    # with tolerance set the run stops once every playoff probability is known to within it
+    @timed('simulation.parallel_run')
+    def run(self, teams, standings, remaining_games, num_samples=1000000, home_win_prob=0.5, tie_prob=0.0,
+            num_wildcards=3, shard_size=25000, batch_size=5000, seed=None, tolerance=None, z=1.96,
+            progress=None, cancelled=None, model=None, played=()):
+        season_args = (teams, standings, remaining_games, num_wildcards, list(played))
+        season = SeasonArrays(*season_args)
+        sizes = [min(shard_size, num_samples - start) for start in range(0, num_samples, shard_size)]
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(sizes))
+        run_key = uuid.uuid4().hex
+        pool = self._executor()
+        pending = {}
+        finished = {}
+        counts = np.zeros((season.num_teams, season.num_seeds + 1), dtype=np.int64)
+        stopped = False
+        submitted = 0
+        merged = 0
+        done = 0
+        try:
+            while merged < len(sizes) and not stopped:
+                # Keep a couple of shards per worker queued so none sits idle
+                while len(pending) < 2 * self.workers and submitted < len(sizes):
+                    future = pool.submit(_simulate_shard, run_key, season_args, seed_sequences[submitted],
+                                         sizes[submitted], home_win_prob, tie_prob, batch_size, model)
+                    pending[future] = submitted
+                    submitted += 1
+                completed, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                if cancelled is not None and cancelled():
+                    return None
+                for future in completed:
+                    finished[pending.pop(future)] = future.result()
+                while merged in finished and not stopped:
+                    counts += finished.pop(merged)
+                    done += sizes[merged]
+                    merged += 1
+                    half_width = playoff_half_width(counts, z)
+                    if progress is not None:
+                        progress(done, num_samples, half_width)
+                    stopped = tolerance is not None and half_width <= tolerance
+        finally:
+            for future in pending:
+                future.cancel()
+        profiler.count('simulation.samples', done)
+        return odds_from_histogram(season, counts)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# One-off parallel run that starts and stops its own pool
+def simulate_parallel(teams, standings, remaining_games, workers=None, **options):
+    with ParallelSimulator(workers) as simulator:
+        return simulator.run(teams, standings, remaining_games, **options)
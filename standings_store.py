@@ -0,0 +1,130 @@
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+STANDINGS_FIELDS = ('wins', 'losses', 'ties', 'division_wins', 'conference_wins', 'points_scored', 'points_allowed')
+
+
+# Dict-like view of one team's row in a StandingsStore
+class TeamRecord(MutableMapping):
+    __slots__ = ('_store', '_team_id')
+
+    def __init__(self, store, team_id):
+        self._store = store
+        self._team_id = team_id
+
+    def __getitem__(self, field):
+        return self._store.counters[field][self._team_id]
+
+    def __setitem__(self, field, value):
+        self._store.counters[field][self._team_id] = value
+        self._store.invalidate(self._team_id)
+
+    def __delitem__(self, field):
+        raise TypeError("Standings fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(STANDINGS_FIELDS)
+
+    def __len__(self):
+        return len(STANDINGS_FIELDS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+# Standings kept as one integer array per counter, indexed by team id
+class StandingsStore(Mapping):
+    def __init__(self, teams):
+        self.names = [team['name'] for team in teams]
+        self.team_ids = {name: team_id for team_id, name in enumerate(self.names)}
+        self.conference_of = [team.get('conference') for team in teams]
+        self.division_of = [(team.get('conference'), team.get('division')) for team in teams]
+        self.counters = {field: array('q', bytes(8 * len(self.names))) for field in STANDINGS_FIELDS}
+        self._records = [TeamRecord(self, team_id) for team_id in range(len(self.names))]
+        self._sort_keys = [None] * len(self.names)
+
+    # Build a store from the plain {name: {field: value}} layout used in save files
+    @classmethod
+    def from_dict(cls, teams, standings):
+        store = cls(teams)
+        for name, record in standings.items():
+            if name not in store.team_ids:
+                continue
+            team_id = store.team_ids[name]
+            for field in STANDINGS_FIELDS:
+                store.counters[field][team_id] = record.get(field, 0)
+        return store
+
+    def __getitem__(self, name):
+        return self._records[self.team_ids[name]]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.team_ids
+
+    def to_dict(self):
+        return {name: dict(self._records[team_id]) for team_id, name in enumerate(self.names)}
+
+    def invalidate(self, team_id):
+        self._sort_keys[team_id] = None
+
+    # Add one game to the counters of both teams, or take it back out with sign=-1
+    def record(self, home_id, away_id, home_score, away_score, sign=1):
+        counters = self.counters
+        if home_score > away_score:
+            winner_id = home_id
+            counters['wins'][home_id] += sign
+            counters['losses'][away_id] += sign
+        elif away_score > home_score:
+            winner_id = away_id
+            counters['wins'][away_id] += sign
+            counters['losses'][home_id] += sign
+        else:
+            winner_id = None
+            counters['ties'][home_id] += sign
+            counters['ties'][away_id] += sign
+        if winner_id is not None:
+            if self.division_of[home_id] == self.division_of[away_id]:
+                counters['division_wins'][winner_id] += sign
+            if self.conference_of[home_id] == self.conference_of[away_id]:
+                counters['conference_wins'][winner_id] += sign
+        counters['points_scored'][home_id] += sign * home_score
+        counters['points_allowed'][home_id] += sign * away_score
+        counters['points_scored'][away_id] += sign * away_score
+        counters['points_allowed'][away_id] += sign * home_score
+        self._sort_keys[home_id] = None
+        self._sort_keys[away_id] = None
+
+    def unrecord(self, home_id, away_id, home_score, away_score):
+        self.record(home_id, away_id, home_score, away_score, sign=-1)
+
+    # Apply a list of game results in one pass
+    def apply_week(self, results):
+        team_ids = self.team_ids
+        for game_result in results:
+            self.record(team_ids[game_result['home_team']], team_ids[game_result['away_team']],
+                        game_result['home_score'], game_result['away_score'])
+
+    # Sort key used by calculate_standings, cached until the team's record changes
+    def sort_key(self, name):
+        team_id = self.team_ids[name]
+        key = self._sort_keys[team_id]
+        if key is None:
+            counters = self.counters
+            points_scored = counters['points_scored'][team_id]
+            key = (
+                counters['wins'][team_id],
+                -counters['losses'][team_id],
+                counters['ties'][team_id],
+                counters['division_wins'][team_id],
+                counters['conference_wins'][team_id],
+                points_scored - counters['points_allowed'][team_id],
+                points_scored
+            )
+            self._sort_keys[team_id] = key
+        return key
@@ -0,0 +1,196 @@
+from tkinter import ttk
+
+
+# Treeview whose rows keep stable item ids; sync only touches rows whose text or position changed.
+# image_for(iid) gives the image shown in a row's tree column, looked up once when the row is created.
+class DiffTable:
+    def __init__(self, parent, columns, widths, image_for=None):
+        self.tree = ttk.Treeview(parent, columns=columns, show='tree headings', selectmode='none')
+        self.tree.column('#0', width=60, stretch=False)
+        for column, width in zip(columns, widths):
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=width, anchor='w' if column in ('Team', 'Operation', 'Game', 'Clinches With') else 'center')
+        self.tree.pack(expand=True, fill='both')
+        self.values = {}
+        self.attached = {}
+        self.image_for = image_for
+
+    def add_group(self, iid, text):
+        self.tree.insert('', 'end', iid=iid, text=text, open=True)
+        self.attached[iid] = []
+
+    # rows is the full display order for one parent as (item id, values) pairs
+    def sync(self, parent, rows):
+        tree = self.tree
+        current = self.attached[parent]
+        wanted = {iid for iid, _ in rows}
+        for iid in [iid for iid in current if iid not in wanted]:
+            tree.detach(iid)
+            current.remove(iid)
+        for index, (iid, values) in enumerate(rows):
+            if iid not in self.values:
+                image = self.image_for(iid) if self.image_for is not None else None
+                tree.insert(parent, index, iid=iid, values=values, **({'image': image} if image else {}))
+                current.insert(index, iid)
+            else:
+                if self.values[iid] != values:
+                    tree.item(iid, values=values)
+                if index >= len(current) or current[index] != iid:
+                    tree.move(iid, parent, index)
+                    if iid in current:
+                        current.remove(iid)
+                    current.insert(index, iid)
+            self.values[iid] = values
+
+
+def record_values(rank, team, standings):
+    record = standings[team['name']]
+    return (rank, team['name'], record['wins'], record['losses'], record['ties'])
+
+
+# League standings with one persistent row per team
+class StandingsView:
+    def __init__(self, tab, image_for=None):
+        self.table = DiffTable(tab, ('Rank', 'Team', 'W', 'L', 'T'), (50, 220, 50, 50, 50), image_for)
+        self.table.tree.configure(height=32)
+        self.table.tree.column('#0', width=40)
+        self.table.attached[''] = []
+        self.engine = None
+
+    # Rows are rebuilt only for teams in the engine's change set or whose rank moved
+    def render(self, engine):
+        changed = engine.take_changes()
+        if engine is not self.engine:
+            self.engine = engine
+            changed = None
+        rows = []
+        for rank, team in enumerate(engine.league_order(), start=1):
+            iid = team['name']
+            values = self.table.values.get(iid)
+            if changed is None or iid in changed or values is None or values[0] != rank:
+                values = record_values(rank, team, engine.standings)
+            rows.append((iid, values))
+        self.table.sync('', rows)
+
+
+# Seeded teams of each conference, moved between positions instead of redrawn
+class PlayoffPictureView:
+    def __init__(self, tab, image_for=None):
+        self.table = DiffTable(tab, ('Seed', 'Team', 'W', 'L', 'T'), (50, 220, 50, 50, 50), image_for)
+        self.table.tree.configure(height=16)
+
+    # The top byes seeds of each conference are marked as skipping the first round
+    def render(self, playoff_teams, standings, byes=0):
+        for conference, seeded in playoff_teams.items():
+            if conference not in self.table.attached:
+                self.table.add_group(conference, f"{conference} Playoff Picture")
+            rows = [(team['name'], record_values(f"{seed} (bye)" if seed <= byes else seed, team, standings))
+                    for seed, team in enumerate(seeded, start=1)]
+            self.table.sync(conference, rows)
+
+
+# Playoff, division title and top seed probabilities per conference
+class OddsView:
+    def __init__(self, tab):
+        self.table = DiffTable(tab, ('Team', 'Playoffs', 'Division', '#1 Seed'), (220, 80, 80, 80))
+        self.table.tree.configure(height=34)
+
+    def render(self, teams, odds):
+        conferences = {}
+        for team in teams:
+            conferences.setdefault(team['conference'], []).append(team['name'])
+        for conference, names in sorted(conferences.items()):
+            if conference not in self.table.attached:
+                self.table.add_group(conference, conference)
+            names = sorted(names, key=lambda name: (-odds[name]['playoffs'], -odds[name]['seeds'][0], name))
+            rows = [(name, (name, f"{odds[name]['playoffs']:.1%}", f"{odds[name]['division_title']:.1%}",
+                            f"{odds[name]['seeds'][0]:.1%}")) for name in names]
+            self.table.sync(conference, rows)
+
+
+STATUS_TEXT = {'clinched': "Clinched", 'eliminated': "Eliminated", 'alive': ""}
+
+
+# The fewest picks that clinch a playoff spot, as "winner over loser" per game; none are found when
+# only tiebreakers could settle it or the search ran out
+def clinching_text(outcomes):
+    if outcomes is None:
+        return "Not found"
+    return ", ".join(f"{game['winner']} over "
+                     f"{game['away_team'] if game['winner'] == game['home_team'] else game['home_team']}"
+                     for game in outcomes)
+
+
+# Clinch and elimination status of every team by conference, from clinch.ClinchSolver.report
+class ClinchView:
+    def __init__(self, tab):
+        self.table = DiffTable(tab, ('Team', 'Division', 'Playoffs', '#1 Seed', 'Magic #', 'Clinches With'),
+                               (220, 90, 90, 90, 70, 420))
+        self.table.tree.configure(height=34)
+
+    def render(self, teams, report):
+        conferences = {}
+        for team in teams:
+            conferences.setdefault(team['conference'], []).append(team['name'])
+        for conference, names in sorted(conferences.items()):
+            if conference not in self.table.attached:
+                self.table.add_group(conference, conference)
+            rows = []
+            for name in sorted(names):
+                status = report[name]
+                # Magic numbers and clinching picks only mean something while the race is open
+                magic = status['division_magic_number'] if status['division'] == 'alive' else ""
+                clinch = clinching_text(status['clinching_outcomes']) if status['playoffs'] == 'alive' else ""
+                rows.append((name, (name, STATUS_TEXT[status['division']], STATUS_TEXT[status['playoffs']],
+                                    STATUS_TEXT[status['top_seed']], magic, clinch)))
+            self.table.sync(conference, rows)
+
+
+def rooting_values(row):
+    root_for = row[f"{row['root_for']}_team"] if row['root_for'] else "Either"
+    return (f"Week {row['week']}: {row['away_team']} at {row['home_team']}", root_for,
+            f"{row['playoffs']['home']:.1%}", f"{row['playoffs']['away']:.1%}", f"{row['leverage']:.1%}")
+
+
+# One team's rooting guide: the best picks for the coming week, then every remaining game by leverage
+class RootingView:
+    def __init__(self, tab):
+        self.table = DiffTable(tab, ('Game', 'Root For', 'If Home Wins', 'If Away Wins', 'Leverage'),
+                               (320, 200, 90, 90, 80))
+        self.table.tree.configure(height=30)
+        self.table.add_group('week', "This Week")
+        self.table.add_group('games', "Remaining Games by Leverage")
+
+    def render(self, report):
+        best_week = report['best_week']
+        if best_week is None:
+            self.table.tree.item('week', text="No games left")
+            self.table.sync('week', [])
+        else:
+            self.table.tree.item('week', text=f"Week {best_week['week']} picks: playoffs "
+                                              f"{best_week['before']['playoffs']:.1%} -> {best_week['after']['playoffs']:.1%}")
+            self.table.sync('week', [(f"pick:{row['week']}:{row['game']}", rooting_values(row))
+                                     for row in best_week['picks']])
+        self.table.sync('games', [(f"game:{row['week']}:{row['game']}", rooting_values(row)) for row in report['games']])
+
+
+# Profiler spans slowest first, then the counters and the seeding cache's
+# (see seeding_cache.SeedingCache.stats), refreshed on demand
+class DiagnosticsView:
+    def __init__(self, tab):
+        self.table = DiffTable(tab, ('Operation', 'Calls', 'Total ms', 'Mean ms', 'Max ms'), (220, 70, 90, 90, 90))
+        self.table.tree.configure(height=30)
+        self.table.add_group('spans', "Timings")
+        self.table.add_group('counters', "Counters")
+        self.table.add_group('seed_cache', "Seeding Cache")
+
+    def render(self, profiler, seed_cache_stats=None):
+        self.table.sync('spans', [(f"span:{name}", (name, calls, f"{total * 1000:.1f}", f"{mean * 1000:.3f}",
+                                                     f"{longest * 1000:.3f}"))
+                                  for name, calls, total, mean, longest in profiler.summary()])
+        self.table.sync('counters', [(f"counter:{name}", (name, value, '', '', ''))
+                                     for name, value in sorted(profiler.counters.items())])
+        if seed_cache_stats is not None:
+            self.table.sync('seed_cache', [(f"seed_cache:{name}",
+                                            (name, f"{value:.1%}" if name == 'hit_rate' else value, '', '', ''))
+                                           for name, value in seed_cache_stats.items()])
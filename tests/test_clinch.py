@@ -0,0 +1,159 @@
+import itertools
+import random
+
+from clinch import ALIVE, CLINCHED, ELIMINATED, ClinchSolver, max_flow
+from season_engine import SeasonEngine
+
+
+def league(divisions=('East', 'West'), size=3):
+    return [{'name': f"{division[0].lower()}{number}", 'conference': 'A', 'division': division}
+            for division in divisions for number in range(1, size + 1)]
+
+
+def engine_with(teams, results, num_wildcards=1):
+    engine = SeasonEngine(teams, num_wildcards=num_wildcards)
+    for game, (winner, loser) in enumerate(results):
+        engine.set_result(0, game, {'home_team': winner, 'away_team': loser, 'home_score': 1, 'away_score': 0})
+    return engine
+
+
+def schedule(*games):
+    return [{'home_team': home_team, 'away_team': away_team} for home_team, away_team in games]
+
+
+# Final points of every team for every way the open games can end (home win, away win or tie),
+# with the games in fixed won by the given team
+def completions(solver, fixed=None):
+    fixed = fixed or {}
+    open_games = [index for index in range(len(solver.games)) if index not in fixed]
+    for outcome in itertools.product((0, 1, 2), repeat=len(open_games)):
+        points = list(solver.points)
+        for winner in fixed.values():
+            points[winner] += 2
+        for index, result in zip(open_games, outcome):
+            home_id, away_id = solver.games[index]
+            if result == 2:
+                points[home_id] += 1
+                points[away_id] += 1
+            else:
+                points[home_id if result == 0 else away_id] += 2
+        yield points
+
+
+def division_of(solver, team_id):
+    team = solver.teams[team_id]
+    return [other for other, rival in enumerate(solver.teams) if other != team_id
+            and (rival['conference'], rival['division']) == (team['conference'], team['division'])]
+
+
+# Whether the team is in the playoffs for these points however every tie is broken (surely), or
+# could be with every tie broken its way (possibly)
+def in_playoffs(solver, team_id, points, surely):
+    def ahead(other):
+        return points[other] >= points[team_id] if surely else points[other] > points[team_id]
+    if not any(ahead(rival) for rival in division_of(solver, team_id)):
+        return True
+    conference = solver.teams[team_id]['conference']
+    others = [other for other, team in enumerate(solver.teams)
+              if other != team_id and team['conference'] == conference and ahead(other)]
+    # One team ahead in each division can be its winner; the rest take wildcards ahead of this team
+    divisions = {solver.teams[other]['division'] for other in others}
+    return len(others) - len(divisions) < solver.engine.num_wildcards
+
+
+def test_max_flow():
+    capacity = {'s': {'a': 3, 'b': 2}, 'a': {'b': 1, 't': 2}, 'b': {'t': 3}}
+    assert max_flow(capacity, 's', 't') == 5
+
+
+def test_known_positions():
+    teams = league()
+    # e1 is 3-0, e2 0-3 and e3 1-2; two games left
+    engine = engine_with(teams, [('e1', 'e2'), ('e1', 'e3'), ('e1', 'w1'), ('e3', 'e2'), ('w1', 'e2'), ('w2', 'e3')])
+    solver = ClinchSolver(engine, schedule(('e2', 'e3'), ('w1', 'w2')))
+    team_ids = engine.standings.team_ids
+    e1, e2, e3 = team_ids['e1'], team_ids['e2'], team_ids['e3']
+    # e3 can reach at most 4 points against e1's 6
+    assert solver.division_status(e1) == CLINCHED
+    assert solver.playoff_status(e1) == CLINCHED
+    assert solver.division_magic_number(e1) == 0
+    # e2 tops out at 2 points
+    assert solver.division_status(e2) == ELIMINATED
+    assert solver.division_status(e3) == ELIMINATED
+
+
+def test_division_elimination_needs_the_flow():
+    teams = league()
+    # e1 and e2 have 6 points and still meet; e3 has 4 with one game left, so it can reach 6 and
+    # neither rival is above that alone, but their meeting lifts at least one of them past it
+    engine = engine_with(teams, [('e1', 'w1'), ('e1', 'w2'), ('e1', 'w3'), ('e2', 'w1'), ('e2', 'w2'), ('e2', 'w3'),
+                                 ('e3', 'w1'), ('e3', 'w2')])
+    solver = ClinchSolver(engine, schedule(('e1', 'e2'), ('e3', 'w1')))
+    team_ids = engine.standings.team_ids
+    e1, e2, e3 = team_ids['e1'], team_ids['e2'], team_ids['e3']
+    low, high = solver.bounds()
+    assert max(low[e1], low[e2]) <= high[e3]
+    assert solver.division_status(e3) == ELIMINATED
+    for points in completions(solver):
+        assert max(points[e1], points[e2]) > points[e3]
+
+
+def test_magic_number():
+    teams = league()
+    # e1 3-0 (6 points), e2 1-2 (2 points) with three games left
+    engine = engine_with(teams, [('e1', 'w1'), ('e1', 'w2'), ('e1', 'w3'), ('e2', 'w1'), ('w2', 'e2'), ('w3', 'e2'),
+                                 ('w1', 'e3'), ('w2', 'e3'), ('w3', 'e3')])
+    remaining = schedule(('e2', 'w1'), ('e2', 'w2'), ('e3', 'w3'))
+    solver = ClinchSolver(engine, remaining)
+    e1 = engine.standings.team_ids['e1']
+    # e2 can reach 6, e3 4: one e1 win or e2 loss puts e1 out of reach of both
+    assert solver.division_magic_number(e1) == 1
+    assert solver.division_status(e1) == ALIVE
+    clinch = solver.clinching_scenario(e1)
+    assert clinch is not None and len(clinch) == 1 and clinch[0]['winner'] != 'e2'
+
+
+def random_position(rng):
+    teams = league()
+    names = [team['name'] for team in teams]
+    played = [tuple(rng.sample(names, 2)) for _ in range(rng.randint(4, 10))]
+    engine = engine_with(teams, played)
+    remaining = schedule(*[tuple(rng.sample(names, 2)) for _ in range(rng.randint(1, 6))])
+    return engine, ClinchSolver(engine, remaining)
+
+
+def test_answers_hold_in_every_completion():
+    rng = random.Random(11)
+    for _ in range(150):
+        engine, solver = random_position(rng)
+        outcomes = list(completions(solver))
+        for team_id in range(len(solver.teams)):
+            rivals = division_of(solver, team_id)
+            division = solver.division_status(team_id)
+            if division == CLINCHED:
+                assert all(all(points[rival] < points[team_id] for rival in rivals) for points in outcomes)
+            elif division == ELIMINATED:
+                assert all(any(points[rival] > points[team_id] for rival in rivals) for points in outcomes)
+            playoffs = solver.playoff_status(team_id)
+            if playoffs == CLINCHED:
+                assert all(in_playoffs(solver, team_id, points, surely=True) for points in outcomes)
+            elif playoffs == ELIMINATED:
+                assert not any(in_playoffs(solver, team_id, points, surely=False) for points in outcomes)
+            # Clinching outcomes must clinch in every completion that includes them, and no
+            # smaller set of outcomes may pass the same check
+            clinch = solver.clinching_scenario(team_id)
+            if clinch:
+                fixed = {}
+                for outcome in clinch:
+                    index = next(index for index, game in enumerate(solver.remaining_games)
+                                 if index not in fixed and dict(game, winner=outcome['winner']) == outcome)
+                    fixed[index] = engine.standings.team_ids[outcome['winner']]
+                assert solver.playoff_status(team_id, fixed) == CLINCHED
+                for points in completions(solver, fixed):
+                    assert in_playoffs(solver, team_id, points, surely=True)
+                choices = [(index, winner) for index, game in enumerate(solver.games) for winner in game]
+                for smaller in itertools.combinations(choices, len(clinch) - 1):
+                    indices = [index for index, _ in smaller]
+                    if len(set(indices)) == len(indices):
+                        assert solver.playoff_status(team_id, dict(smaller)) != CLINCHED
+
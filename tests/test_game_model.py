@@ -0,0 +1,50 @@
+import numpy as np
+
+from game_model import EloModel
+from league import parse_score, remaining_slots
+
+
+def blowout(home, away):
+    return {'home_team': home, 'away_team': away, 'home_score': 45, 'away_score': 3}
+
+
+def test_typical_score_uses_ratings_from_before_the_slot():
+    model = EloModel([{'name': name} for name in 'ABCD'])
+    opening = model.typical_score('A', 'B', 'home', (1, 0))
+    for week in range(2, 12):
+        model.set_result(week, 0, blowout('A', 'C'))
+    assert model.typical_score('A', 'B', 'home', (1, 0)) == opening
+    assert model.typical_score('A', 'B', 'home', (12, 0)) != opening
+
+
+def test_replacing_a_result_restores_the_ratings():
+    model = EloModel([{'name': name} for name in 'ABCD'])
+    model.set_result(1, 0, blowout('A', 'B'))
+    model.set_result(1, 0, None)
+    assert model.ratings.tolist() == [1500.0] * 4
+    assert model.applied == {}
+
+
+def test_ratings_match_a_replay_in_week_order():
+    teams = [{'name': name} for name in 'ABCD']
+    live = EloModel(teams)
+    # Later weeks first, then an earlier week sharing their teams, then a corrected result
+    live.set_result(3, 0, blowout('A', 'B'))
+    live.set_result(2, 1, {'home_team': 'C', 'away_team': 'A', 'home_score': 20, 'away_score': 17})
+    live.set_result(1, 0, blowout('B', 'C'))
+    live.set_result(2, 1, {'home_team': 'C', 'away_team': 'A', 'home_score': 10, 'away_score': 27})
+    replayed = EloModel(teams)
+    for (week, game), (home_id, away_id, _, _, (home_score, away_score)) in sorted(live.applied.items()):
+        replayed.set_result(week, game, {'home_team': 'ABCD'[home_id], 'away_team': 'ABCD'[away_id],
+                                         'home_score': home_score, 'away_score': away_score})
+    assert np.allclose(live.ratings, replayed.ratings)
+    for slot, (_, _, shift, pregame, _) in live.applied.items():
+        assert np.allclose((shift, *pregame), (replayed.applied[slot][2], *replayed.applied[slot][3]))
+
+
+def test_unscorable_results_leave_the_game_unplayed():
+    assert parse_score("24–17") == (24, 17)
+    week_data = {1: [{'home_team': 'A', 'away_team': 'B', 'result': "24-17"},
+                     {'home_team': 'C', 'away_team': 'D', 'result': "24 to 17"},
+                     {'home_team': 'A', 'away_team': 'C', 'result': "Tie"}]}
+    assert remaining_slots(week_data, 'ABCD') == [(1, 1, {'home_team': 'C', 'away_team': 'D'})]
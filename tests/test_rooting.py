@@ -0,0 +1,104 @@
+import numpy as np
+
+from game_model import EloModel
+from rooting import RootingGuide
+from season_engine import SeasonEngine
+from simulation import AWAY_WIN, HOME_WIN, odds_from_histogram, sample_season, seed_histogram
+
+
+# Two conferences of two two-team divisions; every team plays once a week
+def league():
+    return [{'name': f"{conference}{division}{number}", 'conference': conference, 'division': division,
+             'rating': 1400.0 + 25 * index}
+            for index, (conference, division, number) in enumerate(
+                (conference, division, number) for conference in 'AN' for division in 'EW' for number in (1, 2))]
+
+
+def weeks_of_games(teams, rng, weeks):
+    slots = []
+    for week in weeks:
+        order = rng.permutation(len(teams))
+        for game in range(len(teams) // 2):
+            home, away = order[2 * game], order[2 * game + 1]
+            slots.append((week, game, {'home_team': teams[home]['name'], 'away_team': teams[away]['name']}))
+    return slots
+
+
+# Two scored weeks behind the standings, three weeks left, and the engine holding the scored weeks
+def tiny_season(seed=4):
+    teams = league()
+    rng = np.random.default_rng(seed)
+    model = EloModel(teams)
+    engine = SeasonEngine(teams, num_wildcards=1)
+    played = []
+    for week, game, slot in weeks_of_games(teams, rng, (1, 2)):
+        home, away = model.sample_scores(rng, [model.team_ids[slot['home_team']]],
+                                         [model.team_ids[slot['away_team']]], 1)
+        played.append(dict(slot, home_score=int(home[0, 0]), away_score=int(away[0, 0])))
+        engine.set_result(week, game, played[-1])
+    return teams, engine, played, weeks_of_games(teams, rng, (3, 4, 5)), model
+
+
+def guide_for(num_samples, batch_size, seed=9):
+    teams, engine, played, slots, model = tiny_season()
+    guide = RootingGuide(teams, engine.standings.to_dict(), slots, num_samples, num_wildcards=1,
+                         batch_size=batch_size, seed=seed, model=model, played=played)
+    return guide, engine, slots, model
+
+
+def test_conditional_seeds_match_filtering_the_samples():
+    guide, _, _, model = guide_for(3000, 1000)
+    season = guide.season
+    # The same draws the guide made, batch by batch, with each sample's seeds kept
+    rng = np.random.default_rng(9)
+    outcomes, seeds = [], []
+    for _ in range(3):
+        batch, scores = sample_season(season, rng, 1000, model=model)
+        seeds.append(season.seed(season.tally(batch, scores), rng))
+        outcomes.append(batch)
+    outcomes, seeds = np.concatenate(outcomes), np.concatenate(seeds)
+    assert np.array_equal(outcomes, guide.outcomes)
+    given = guide._conditional()
+    for game in range(season.num_games):
+        for result in (HOME_WIN, AWAY_WIN):
+            kept = seeds[outcomes[:, game] == result]
+            assert len(kept) == guide.results[result, game] > 0
+            expected = seed_histogram(season, kept) / len(kept)
+            assert np.allclose(given[result, game], expected)
+
+
+# Seed counts of the kept samples with the picks forced, played out by the engine one sample at a time
+def engine_counts(guide, engine, slots, picks):
+    season = guide.season
+    counts = np.zeros((season.num_teams, guide.width), dtype=np.int64)
+    for sample in range(len(guide.outcomes)):
+        replayed = SeasonEngine(engine.teams, num_wildcards=1)
+        for (week, game), game_result in engine.slots.items():
+            replayed.set_result(week, game, game_result)
+        for idx, (week, game, slot) in enumerate(slots):
+            home, away = int(guide.scores[0][sample, idx]), int(guide.scores[1][sample, idx])
+            if idx in picks:
+                # A forced game keeps its scores, the winner taking the higher one (a tie goes to overtime)
+                winner, loser = max(home, away) + 3 * (home == away), min(home, away)
+                home, away = (winner, loser) if picks[idx] == HOME_WIN else (loser, winner)
+            replayed.set_result(week, game, dict(slot, home_score=home, away_score=away))
+        seeded = {team['name']: seed for seeds in replayed.playoff_teams().values()
+                  for seed, team in enumerate(seeds, start=1)}
+        counts += seed_histogram(season, np.array([[seeded.get(name, 0) for name in season.names]]))
+    return counts
+
+
+def test_best_week_replay_matches_forcing_the_picks():
+    guide, engine, slots, _ = guide_for(300, 100)
+    season = guide.season
+    # The team with the most picks in week 3
+    name = max(season.names, key=lambda name: (len(guide.best_week(name, 3)['picks']), name))
+    report = guide.best_week(name, 3)
+    assert report['picks']
+    index = {(week, game): idx for idx, (week, game, _) in enumerate(slots)}
+    picks = {index[(row['week'], row['game'])]: HOME_WIN if row['root_for'] == 'home' else AWAY_WIN
+             for row in report['picks']}
+    after = odds_from_histogram(season, engine_counts(guide, engine, slots, picks))[name]
+    before = odds_from_histogram(season, engine_counts(guide, engine, slots, {}))[name]
+    assert report['after'] == after and report['before'] == before
+    assert after['playoffs'] > before['playoffs']
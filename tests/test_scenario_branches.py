@@ -0,0 +1,97 @@
+import pytest
+
+from scenario_branches import MAX_DEPTH, ScenarioTree, season_base
+from season_engine import SeasonEngine
+
+
+def league():
+    return [{'name': f"{conference}{division}{number}", 'conference': conference, 'division': division}
+            for conference in 'AN' for division in 'EW' for number in range(1, 4)]
+
+
+# A game slot's (slot, game_result) value as the app stores it
+def pick(home_team, away_team, home_score, away_score):
+    return ({'home_team': home_team, 'away_team': away_team, 'result': f"{home_score}-{away_score}"},
+            {'home_team': home_team, 'away_team': away_team, 'home_score': home_score, 'away_score': away_score})
+
+
+OPENER = pick('AE1', 'AW1', 24, 17)
+
+
+def test_diff_lists_only_slots_that_differ():
+    tree = ScenarioTree({(1, 0): OPENER})
+    tree.fork('main', 'upset')
+    tree.set('upset', (1, 0), pick('AE1', 'AW1', 10, 27))
+    tree.set('upset', (1, 1), pick('NE1', 'NW1', 3, 0))
+    # Changed on both sides to the same value, so no difference
+    tree.set('upset', (2, 0), pick('AE2', 'NE2', 7, 7))
+    tree.set('main', (2, 0), pick('AE2', 'NE2', 7, 7))
+    assert tree.diff('main', 'upset') == {(1, 0): (OPENER, pick('AE1', 'AW1', 10, 27)),
+                                          (1, 1): (None, pick('NE1', 'NW1', 3, 0))}
+    assert tree.diff('upset', 'main') == {key: (b, a) for key, (a, b) in tree.diff('main', 'upset').items()}
+    assert tree.diff('main', 'main') == {}
+
+
+@pytest.mark.parametrize('prefer', ['target', 'source'])
+def test_merge_brings_changes_over_and_settles_conflicts(prefer):
+    tree = ScenarioTree({(1, 0): OPENER})
+    tree.fork('main', 'what-if')
+    tree.set('what-if', (1, 1), pick('NE1', 'NW1', 3, 0))
+    tree.set('what-if', (1, 0), pick('AE1', 'AW1', 0, 3))
+    tree.set('main', (1, 0), pick('AE1', 'AW1', 31, 0))
+    conflicts = tree.merge('what-if', 'main', prefer=prefer)
+    assert conflicts == {(1, 0): (pick('AE1', 'AW1', 31, 0), pick('AE1', 'AW1', 0, 3))}
+    assert tree.get('main', (1, 1)) == pick('NE1', 'NW1', 3, 0)
+    expected = pick('AE1', 'AW1', 31, 0) if prefer == 'target' else pick('AE1', 'AW1', 0, 3)
+    assert tree.get('main', (1, 0)) == expected
+    # A slot changed on the source and put back is no change to bring over
+    tree.fork('main', 'undo')
+    tree.set('undo', (1, 1), pick('NE1', 'NW1', 0, 3))
+    tree.set('undo', (1, 1), pick('NE1', 'NW1', 3, 0))
+    tree.set('main', (1, 1), None)
+    assert tree.merge('undo', 'main') == {} and tree.get('main', (1, 1)) is None
+
+
+def test_long_chains_are_flattened_without_losing_history():
+    tree = ScenarioTree({(1, 0): OPENER})
+    tree.fork('main', 'early')
+    tree.set('early', (1, 0), pick('AE1', 'AW1', 0, 3))
+    # Every fork freezes main's head, so each following change starts another layer
+    for number in range(MAX_DEPTH + 2):
+        tree.fork('main', f"copy{number}")
+        tree.set('main', (2, number % 4), pick('NE1', 'NW1', number, 0))
+    head = tree.heads['main']
+    assert head.depth <= MAX_DEPTH and head.level > MAX_DEPTH
+    assert tree.get('main', (1, 0)) == OPENER and tree.get('main', (2, 1)) == pick('NE1', 'NW1', MAX_DEPTH + 1, 0)
+    assert tree.items('copy3') == {(1, 0): OPENER, **{(2, number): pick('NE1', 'NW1', number, 0) for number in range(3)}}
+    # The flattened head holds every slot, yet only the slots that differ are reported, and the
+    # early branch's change is no conflict since main never touched that game
+    assert set(tree.diff('main', 'early')) == {(1, 0), (2, 0), (2, 1), (2, 2), (2, 3)}
+    assert tree.merge('early', 'main') == {}
+    assert tree.get('main', (1, 0)) == pick('AE1', 'AW1', 0, 3)
+
+
+def test_checkout_replays_only_differing_games_into_the_engine():
+    teams = league()
+    week_data = {1: [{}, {}], 2: [{}, {}]}
+    engine = SeasonEngine(teams)
+    for (week, game), (slot, game_result) in ((1, 0), OPENER), ((1, 1), pick('NE1', 'NW1', 3, 0)):
+        week_data[week][game] = dict(slot)
+        engine.set_result(week, game, game_result)
+    tree = ScenarioTree(season_base(week_data, engine))
+    tree.fork('main', 'upset')
+    tree.set('upset', (1, 0), pick('AE1', 'AW1', 10, 27))
+    tree.set('upset', (1, 1), None)
+    tree.set('upset', (2, 1), pick('AW2', 'NE2', 14, 13))
+    changed = tree.checkout('main', 'upset', engine, week_data)
+    assert sorted((week, game) for week, game, _, _ in changed) == [(1, 0), (1, 1), (2, 1)]
+    # The engine ends where a fresh one playing the branch's games would
+    replayed = SeasonEngine(teams)
+    for (week, game), (_, game_result) in tree.items('upset').items():
+        replayed.set_result(week, game, game_result)
+    assert engine.standings.to_dict() == replayed.standings.to_dict()
+    assert engine.playoff_teams() == replayed.playoff_teams()
+    assert week_data == {1: [pick('AE1', 'AW1', 10, 27)[0], {}], 2: [{}, pick('AW2', 'NE2', 14, 13)[0]]}
+    assert tree.checkout('upset', 'upset', engine, week_data) == []
+    tree.checkout('upset', 'main', engine, week_data)
+    assert engine.result(1, 0) == OPENER[1] and engine.result(2, 1) is None
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from schedule_import import ScheduleError, TeamIndex, import_schedule
+
+TEAMS = [{'name': 'Buffalo Bills', 'abbreviation': 'BUF'}, {'name': 'Miami Dolphins', 'abbreviation': 'MIA'},
+         {'name': 'Kansas City Chiefs', 'abbreviation': 'KC'}, {'name': 'Denver Broncos', 'abbreviation': 'DEN'}]
+GAMES = [{'week': 1, 'home': 'BUF', 'away': 'MIA', 'home_score': 24, 'away_score': 17},
+         {'week': 1, 'home': 'KC', 'away': 'DEN'}]
+
+
+def imported(path):
+    return [(week, game['home_team'], game['home_score']) for week, game in
+            import_schedule(str(path), TeamIndex(TEAMS), games_per_week=2).games()]
+
+
+@pytest.mark.parametrize('name', ['schedule.jsonl', 'schedule.ndjson'])
+def test_json_lines(tmp_path, name):
+    path = tmp_path / name
+    path.write_text(''.join(json.dumps(game) + '\n' for game in GAMES))
+    assert imported(path) == [(1, 'Buffalo Bills', 24), (1, 'Kansas City Chiefs', None)]
+
+
+def test_json_array(tmp_path):
+    path = tmp_path / 'schedule.json'
+    path.write_text(json.dumps(GAMES, indent=2))
+    assert imported(path) == [(1, 'Buffalo Bills', 24), (1, 'Kansas City Chiefs', None)]
+
+
+def test_json_that_is_not_an_array(tmp_path):
+    path = tmp_path / 'schedule.json'
+    path.write_text(json.dumps({'games': GAMES}))
+    with pytest.raises(ScheduleError, match='array'):
+        imported(path)
+
+
+@pytest.mark.parametrize('name', ['schedule.txt', 'schedule'])
+def test_unknown_extension(tmp_path, name):
+    path = tmp_path / name
+    path.write_text(json.dumps(GAMES[0]) + '\n')
+    with pytest.raises(ScheduleError, match='not a schedule file'):
+        imported(path)
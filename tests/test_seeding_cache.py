@@ -0,0 +1,87 @@
+import json
+
+from season_engine import SeasonEngine
+from seeding_cache import SEEDING_VERSION, SeedingCache, league_shape
+
+
+def league():
+    return [{'name': f"{conference}{division}{number}", 'conference': conference, 'division': division}
+            for conference in 'AN' for division in 'EW' for number in range(1, 4)]
+
+
+def game(home_team, away_team, home_score, away_score):
+    return {'home_team': home_team, 'away_team': away_team, 'home_score': home_score, 'away_score': away_score}
+
+
+GAMES = {(1, 0): game('AE1', 'AW1', 24, 17), (1, 1): game('NE2', 'NW3', 10, 10), (2, 0): game('AW2', 'AE1', 31, 3)}
+
+
+def test_outcome_key_ignores_entry_order():
+    teams = league()
+    forward, backward = SeasonEngine(teams), SeasonEngine(teams)
+    for slot in sorted(GAMES):
+        forward.set_result(*slot, GAMES[slot])
+    # Entered the other way round, with a result flipped and put back and one cleared and refilled
+    for slot in sorted(GAMES, reverse=True):
+        backward.set_result(*slot, game('AE3', 'AW3', 0, 7))
+        backward.set_result(*slot, None)
+        backward.set_result(*slot, GAMES[slot])
+    assert forward.outcome_key == backward.outcome_key
+    forward.set_result(2, 0, game('AW2', 'AE1', 3, 31))
+    assert forward.outcome_key != backward.outcome_key
+
+
+def test_same_outcomes_reuse_the_cached_seeds():
+    teams = league()
+    cache = SeedingCache()
+    first = SeasonEngine(teams, seed_cache=cache)
+    for slot, result in GAMES.items():
+        first.set_result(*slot, result)
+    seeds = first.playoff_teams()
+    second = SeasonEngine(teams, seed_cache=cache)
+    for slot, result in reversed(list(GAMES.items())):
+        second.set_result(*slot, result)
+    misses = cache.misses
+    assert second.playoff_teams() == seeds
+    assert cache.misses == misses and cache.hits == len(seeds)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = SeedingCache(max_entries=2)
+    cache.put((1, 'A'), [1])
+    cache.put((2, 'A'), [2])
+    assert cache.get((1, 'A')) == [1]
+    cache.put((3, 'A'), [3])
+    assert cache.get((2, 'A')) is None
+    assert cache.get((1, 'A')) == [1] and cache.get((3, 'A')) == [3]
+    assert cache.stats() == {'entries': 2, 'hits': 3, 'misses': 1, 'evictions': 1, 'hit_rate': 0.75}
+
+
+def test_saved_entries_load_back_in_lru_order(tmp_path):
+    path = str(tmp_path / 'seed_cache.json')
+    shape = league_shape(league(), 3)
+    cache = SeedingCache(shape=shape)
+    for key in range(3):
+        cache.put((key, 'A'), [key])
+    cache.get((0, 'A'))
+    cache.save(path)
+    loaded = SeedingCache(max_entries=2, shape=shape)
+    assert loaded.load(path)
+    assert list(loaded.entries) == [(2, 'A'), (0, 'A')]
+
+
+def test_files_for_other_rules_or_leagues_are_not_loaded(tmp_path):
+    path = str(tmp_path / 'seed_cache.json')
+    teams = league()
+    cache = SeedingCache(shape=league_shape(teams, 3))
+    cache.put((7, 'A'), [1, 2])
+    cache.save(path)
+    assert not SeedingCache(shape=league_shape(teams, 2)).load(path)
+    assert not SeedingCache(shape=league_shape(teams[:-1], 3)).load(path)
+    with open(path) as file:
+        data = json.load(file)
+    data['version'] = SEEDING_VERSION - 1
+    with open(path, 'w') as file:
+        json.dump(data, file)
+    stale = SeedingCache(shape=league_shape(teams, 3))
+    assert not stale.load(path) and len(stale) == 0
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from service import QueryError, QueryService
+from session_store import SessionStore
+
+TEAM_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'team_data.json')
+MEETING = {'home_team': 'Baltimore Ravens', 'away_team': 'Pittsburgh Steelers'}
+
+
+class Writer:
+    def __init__(self):
+        self.data = b''
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def respond_to(request):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(request)
+        reader.feed_eof()
+        writer = Writer()
+        # Malformed requests are answered before any query runs, so no league needs loading
+        await QueryService.__new__(QueryService).handle(reader, writer)
+        return writer.data
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('length', ['abc', '-5', '+5', '1e3', ' '])
+def test_invalid_content_length_is_a_bad_request(length):
+    response = respond_to(f"POST /whatif HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode())
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+    assert b"Invalid Content-Length" in response
+
+
+# A service over a standings-only save, the format of the shipped game_data.json
+@pytest.fixture
+def service(tmp_path):
+    snapshot = tmp_path / 'game_data.json'
+    snapshot.write_text(json.dumps({'Baltimore Ravens': {'wins': 5, 'losses': 1}}))
+    service = QueryService(TEAM_DATA, str(snapshot))
+    yield service
+    service.shutdown()
+
+
+def record_pick(service, week, game, result):
+    session = SessionStore(service.session.snapshot_path)
+    session.record(week, game, dict(MEETING, result="Home Win"), dict(MEETING, **result))
+    session.close()
+
+
+def wins(report, team):
+    return next(row['wins'] for row in report['standings'] if row['team'] == team)
+
+
+def test_cached_answers_are_dropped_when_the_session_changes(service):
+    first = asyncio.run(service.query('standings', {}))
+    asyncio.run(service.query('standings', {}))
+    assert (service.hits, service.misses) == (1, 1)
+    record_pick(service, 1, 0, {'home_score': 24, 'away_score': 17})
+    second = asyncio.run(service.query('standings', {}))
+    assert service.version == 2 and service.misses == 2
+    assert wins(first, 'Baltimore Ravens') == 5 and wins(second, 'Baltimore Ravens') == 6
+
+
+def test_identical_queries_in_flight_share_one_computation(service):
+    query = {'outcomes': [dict(MEETING, week=1, game=0, result="Home Win")]}
+
+    async def together():
+        return await asyncio.gather(*(service.query('whatif', query) for _ in range(3)))
+    answers = asyncio.run(together())
+    assert service.misses == 1 and service.coalesced == 2
+    assert answers[0] is answers[1] is answers[2]
+
+
+def test_whatif_counts_outcomes_on_top_of_the_saved_standings(service):
+    report = asyncio.run(service.query('whatif', {'outcomes': [
+        dict(MEETING, week=1, game=0, home_score=10, away_score=13)]}))
+    assert wins(report, 'Baltimore Ravens') == 5 and wins(report, 'Pittsburgh Steelers') == 1
+    assert report['outcomes'] == [dict(MEETING, week=1, game=0, home_score=10, away_score=13)]
+
+
+def test_whatif_without_outcomes_agrees_with_seeds_and_standings(service):
+    record_pick(service, 1, 0, {'home_score': 24, 'away_score': 17})
+    report = asyncio.run(service.query('whatif', {}))
+    assert report['seeds'] == asyncio.run(service.query('seeds', {}))['seeds']
+    assert report['standings'] == asyncio.run(service.query('standings', {}))['standings']
+
+
+@pytest.mark.parametrize('outcome', [dict(MEETING, week='five', game=0, result="Home Win"),
+                                     dict(MEETING, week=1, game=None, result="Home Win"),
+                                     dict(MEETING, home_score='ten', away_score=3)])
+def test_malformed_outcomes_are_client_errors(service, outcome):
+    with pytest.raises(QueryError) as error:
+        asyncio.run(service.query('whatif', {'outcomes': [outcome]}))
+    assert error.value.status == 400
+
+
+def test_clinch_reports_the_saved_standings(service):
+    # No games are scheduled, so the Ravens' 5-1 against everyone else's 0-0 settles every race
+    report = asyncio.run(service.query('clinch', {'team': 'Baltimore Ravens'}))['clinch']
+    assert list(report) == ['Baltimore Ravens']
+    assert report['Baltimore Ravens']['division'] == report['Baltimore Ravens']['top_seed'] == 'clinched'
+    steelers = asyncio.run(service.query('clinch', {}))['clinch']['Pittsburgh Steelers']
+    assert steelers['division'] == 'eliminated'
+    with pytest.raises(QueryError):
+        asyncio.run(service.query('clinch', {'team': 'Nowhere'}))
@@ -0,0 +1,53 @@
+import json
+
+from session_store import SessionStore, restore_engine
+
+
+def write_session(tmp_path, week_data, entries):
+    snapshot = tmp_path / 'game_data.json'
+    snapshot.write_text(json.dumps({'standings': {}, 'week_data': week_data, 'results': []}))
+    (tmp_path / 'game_data.journal').write_text(''.join(json.dumps(entry) + '\n' for entry in entries))
+    return str(snapshot)
+
+
+def entry(week, game, result=None):
+    return {'week': week, 'game': game, 'slot': {'home_team': 'A', 'away_team': 'B'}, 'result': result}
+
+
+def test_weeks_are_padded_and_cut_to_the_league_shape(tmp_path):
+    week_data = {'1': [{'home_team': 'A'}], '2': [{} for _ in range(5)], '9': [{}]}
+    data = SessionStore(write_session(tmp_path, week_data, []), num_weeks=3, games_per_week=3).load()
+    assert sorted(data['week_data']) == [1, 2, 3]
+    assert all(len(slots) == 3 for slots in data['week_data'].values())
+    assert data['week_data'][1][0] == {'home_team': 'A'}
+
+
+def test_journal_entries_outside_the_league_shape_are_skipped(tmp_path):
+    score = {'home_team': 'A', 'away_team': 'B', 'home_score': 21, 'away_score': 14}
+    entries = [entry(1, 7, score), entry(4, 0, score), entry(2, 1, score)]
+    data = SessionStore(write_session(tmp_path, {}, entries), num_weeks=3, games_per_week=2).load()
+    assert [(result['week'], result['game']) for result in data['results']] == [(2, 1)]
+    assert data['week_data'][2][1] == entries[2]['slot']
+    assert len(data['week_data'][1]) == 2
+
+
+TEAMS = [{'name': 'Baltimore Ravens', 'conference': 'AFC', 'division': 'North'},
+         {'name': 'Pittsburgh Steelers', 'conference': 'AFC', 'division': 'North'}]
+PICK = {'home_team': 'Baltimore Ravens', 'away_team': 'Pittsburgh Steelers', 'home_score': 20, 'away_score': 10}
+
+
+def test_standings_only_save_keeps_its_records_through_picks_and_saves(tmp_path):
+    snapshot = tmp_path / 'game_data.json'
+    snapshot.write_text(json.dumps({'Baltimore Ravens': {'wins': 5, 'losses': 1},
+                                    'Pittsburgh Steelers': {'wins': 3, 'losses': 3}}))
+    session = SessionStore(str(snapshot), num_weeks=2, games_per_week=1)
+    engine = restore_engine(TEAMS, session.load())
+    engine.set_result(1, 0, dict(PICK))
+    session.record(1, 0, {'home_team': PICK['home_team'], 'away_team': PICK['away_team'], 'result': "Home Win"}, PICK)
+    # Reloaded from the journal, then from a compacted snapshot
+    for _ in range(2):
+        reloaded = restore_engine(TEAMS, SessionStore(str(snapshot), num_weeks=2, games_per_week=1).load())
+        assert reloaded.standings.to_dict() == engine.standings.to_dict()
+        assert reloaded.standings['Baltimore Ravens']['wins'] == 6
+        session.compact({1: [{}], 2: [{}]}, engine)
+    session.close()
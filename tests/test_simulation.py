@@ -0,0 +1,158 @@
+import os
+
+import numpy as np
+
+from game_model import EloModel
+from league import evaluate, load_team_data
+from season_engine import SeasonEngine
+from simulation import HOME_WIN, AWAY_WIN, ParallelSimulator, SeasonArrays, sample_season, simulate_season
+from standings_store import StandingsStore
+
+TEAM_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'team_data.json')
+
+
+def league(shape):
+    return [{'name': f"{conference}{division}{number}", 'conference': conference, 'division': str(division)}
+            for conference, divisions, size in shape for division in range(divisions) for number in range(size)]
+
+
+def random_schedule(teams, rng, num_games):
+    games = []
+    for _ in range(num_games):
+        home, away = rng.choice(len(teams), 2, replace=False)
+        games.append({'home_team': teams[home]['name'], 'away_team': teams[away]['name']})
+    return games
+
+
+# Low scores so records, points and common games tie often and the later tiebreak steps get used
+def low_scores(rng, num_samples, num_games):
+    scores = rng.integers(0, 3, (num_samples, num_games)), rng.integers(0, 3, (num_samples, num_games))
+    outcomes = np.where(scores[0] > scores[1], HOME_WIN, np.where(scores[0] < scores[1], AWAY_WIN, 2))
+    return outcomes.astype(np.int8), scores
+
+
+def score(games, scores):
+    return [dict(game, home_score=int(home), away_score=int(away)) for game, home, away in zip(games, *scores)]
+
+
+# The engine's seeds for base standings plus results, as {team name: seed}
+def engine_seeds(teams, base, results):
+    engine = SeasonEngine(teams, StandingsStore.from_dict(teams, base))
+    for game, result in enumerate(results):
+        engine.set_result(1, game, result)
+    return {team['name']: seed for seeded in engine.playoff_teams().values()
+            for seed, team in enumerate(seeded, start=1)}
+
+
+def check_against_engine(shape, num_wildcards, model=False, num_samples=150, seed=5):
+    rng = np.random.default_rng(seed)
+    teams = league(shape)
+    # Standings from before the recorded games count in records and points but not head-to-head
+    base = {team['name']: {'wins': int(rng.integers(0, 2)), 'points_scored': int(rng.integers(0, 3))}
+            for team in teams}
+    home, away = low_scores(rng, 1, 2 * len(teams))[1]
+    played = score(random_schedule(teams, rng, 2 * len(teams)), (home[0], away[0]))
+    engine = SeasonEngine(teams, StandingsStore.from_dict(teams, base))
+    for game, result in enumerate(played):
+        engine.set_result(0, game, result)
+    games = random_schedule(teams, rng, 2 * len(teams))
+    season = SeasonArrays(teams, engine.standings.to_dict(), games, num_wildcards, played)
+    if model:
+        outcomes, scores = sample_season(season, rng, num_samples, model=EloModel(teams))
+    else:
+        outcomes, scores = low_scores(rng, num_samples, len(games))
+    seeds = season.seed(season.tally(outcomes, scores))
+    for sample in range(num_samples):
+        expected = engine_seeds(teams, base, played + score(games, (scores[0][sample], scores[1][sample])))
+        assert seeds[sample].tolist() == [expected.get(name, 0) for name in season.names], f"sample {sample}"
+    return season
+
+
+def test_seeds_match_engine():
+    check_against_engine([('A', 4, 4), ('N', 4, 4)], num_wildcards=3)
+
+
+def test_seeds_match_engine_with_sampled_scores():
+    check_against_engine([('A', 4, 4), ('N', 4, 4)], num_wildcards=3, model=True)
+
+
+def test_small_conference_never_seeds_a_division_winner_twice():
+    # Two divisions of two: only two teams are left for three wildcard spots
+    season = check_against_engine([('A', 2, 2), ('N', 3, 3)], num_wildcards=3)
+    assert season.num_conference_wildcards == [2, 3]
+    assert season.num_seeds == 6
+
+
+def test_odds_sum_to_one_per_seed():
+    rng = np.random.default_rng(1)
+    teams = league([('A', 2, 2), ('N', 2, 3)])
+    base = {team['name']: {} for team in teams}
+    odds = simulate_season(teams, base, random_schedule(teams, rng, 20), num_samples=2000, num_wildcards=3, seed=2)
+    for conference, slots in (('A', 4), ('N', 5)):
+        members = [team['name'] for team in teams if team['conference'] == conference]
+        assert abs(sum(odds[name]['playoffs'] for name in members) - slots) < 1e-9
+
+
+# With no games left every sample is the finished season, so the odds are the engine's seeds exactly
+def check_finished_season(teams, results, base=None):
+    base = base or {team['name']: {} for team in teams}
+    engine = SeasonEngine(teams, StandingsStore.from_dict(teams, base))
+    for game, result in enumerate(results):
+        engine.set_result(0, game, result)
+    odds = simulate_season(teams, engine.standings.to_dict(), [], num_samples=50, seed=3, played=results)
+    expected = engine_seeds(teams, base, results)
+    for name, team_odds in odds.items():
+        seed = expected.get(name, 0)
+        assert team_odds['eliminated'] == (seed == 0), name
+        assert team_odds['seeds'] == [float(seed == k) for k in range(1, len(team_odds['seeds']) + 1)], name
+
+
+def test_finished_season_division_goes_to_head_to_head():
+    teams = load_team_data(TEAM_DATA)
+    # Ravens and Steelers both 2-1; the Ravens won the meeting, the Steelers have more division wins.
+    # The Chiefs' 1-0 is the AFC's best record, so they are the top seed.
+    results = score([{'home_team': home, 'away_team': away} for home, away in (
+        ('Baltimore Ravens', 'Pittsburgh Steelers'), ('Baltimore Ravens', 'Buffalo Bills'),
+        ('Kansas City Chiefs', 'Baltimore Ravens'), ('Pittsburgh Steelers', 'Cincinnati Bengals'),
+        ('Pittsburgh Steelers', 'Cleveland Browns'))], ([24] * 5, [17] * 5))
+    report = evaluate(teams, results, [], num_samples=50, seed=1)
+    assert report['seeds']['AFC'][:2] == ['Kansas City Chiefs', 'Baltimore Ravens']
+    assert report['odds']['Kansas City Chiefs']['seeds'][0] == 1.0
+    assert report['odds']['Baltimore Ravens']['division_title'] == 1.0
+    assert report['odds']['Pittsburgh Steelers']['division_title'] == 0.0
+
+
+def test_finished_seasons_match_engine():
+    teams = load_team_data(TEAM_DATA)
+    rng = np.random.default_rng(11)
+    model = EloModel(teams)
+    # Enough games that no two teams are level after every tiebreak step and reach the coin toss
+    for num_games in (120, 200, 272):
+        games = random_schedule(teams, rng, num_games)
+        home = np.array([model.team_ids[game['home_team']] for game in games])
+        away = np.array([model.team_ids[game['away_team']] for game in games])
+        scores = model.sample_scores(rng, home, away, 1)
+        base = {team['name']: {'wins': int(rng.integers(0, 3)), 'losses': int(rng.integers(0, 3))} for team in teams}
+        check_finished_season(teams, score(games, (scores[0][0], scores[1][0])), base)
+
+
+# Seeded runs give the same odds however many workers share the shards, since every shard draws from
+# its own seed and shards are merged in order; early stopping then happens after the same shard
+def test_parallel_odds_do_not_depend_on_the_worker_count():
+    rng = np.random.default_rng(8)
+    teams = league([('A', 2, 3), ('N', 2, 3)])
+    base = {team['name']: {'wins': int(rng.integers(0, 3))} for team in teams}
+    games = random_schedule(teams, rng, 24)
+    runs = {}
+    for workers in (1, 4):
+        with ParallelSimulator(workers, start_method='spawn') as simulator:
+            for model in (None, EloModel(teams)):
+                for tolerance in (None, 0.03):
+                    progress = []
+                    odds = simulator.run(teams, base, games, num_samples=4000, num_wildcards=2, shard_size=250,
+                                         batch_size=100, seed=3, tolerance=tolerance, model=model,
+                                         progress=lambda done, total, half_width: progress.append(done))
+                    runs.setdefault((model is None, tolerance), []).append((odds, progress))
+    for (_, tolerance), ((one, one_progress), (four, four_progress)) in runs.items():
+        assert one == four and one_progress == four_progress
+        assert one_progress[-1] == 4000 if tolerance is None else one_progress[-1] < 4000
@@ -0,0 +1,157 @@
+import random
+
+from season_engine import SeasonEngine
+from tiebreakers import competition_ranks
+
+
+# Conference A has three four-team divisions; conference B supplies non-conference opponents
+def league():
+    teams = []
+    for conference, divisions in (('A', ('East', 'West', 'North')), ('B', ('South',))):
+        for division in divisions:
+            for number in range(1, 5):
+                teams.append({'name': f"{division[0].lower()}{number}", 'conference': conference, 'division': division})
+    return teams
+
+
+def play(engine, games):
+    for game, (home_team, away_team, home_score, away_score) in enumerate(games, start=len(engine.slots)):
+        engine.set_result(1, game, {'home_team': home_team, 'away_team': away_team,
+                                    'home_score': home_score, 'away_score': away_score})
+
+
+def names(engine, team_ids):
+    return [engine.standings.names[team_id] for team_id in team_ids]
+
+
+def ids(engine, *team_names):
+    return [engine.standings.team_ids[name] for name in team_names]
+
+
+def test_two_team_division_tie_goes_to_head_to_head():
+    engine = SeasonEngine(league())
+    # e1 and e2 both finish 1-1; e1 won the meeting
+    play(engine, [('e1', 'e2', 21, 14), ('e2', 'e3', 24, 10), ('w1', 'e1', 17, 3)])
+    assert [team['name'] for team in engine.division_order('A', 'East')][:2] == ['e1', 'e2']
+
+
+def test_two_team_division_tie_with_split_series_goes_to_division_record():
+    engine = SeasonEngine(league())
+    # Both 2-2 with the series split; e1 is 2-1 in the division, e2 1-2
+    play(engine, [('e1', 'e2', 20, 10), ('e2', 'e1', 20, 10), ('e1', 'e3', 20, 10), ('w1', 'e1', 20, 10),
+                  ('e2', 'w2', 20, 10), ('e4', 'e2', 20, 10)])
+    assert engine.standings['e1']['wins'] == engine.standings['e2']['wins'] == 2
+    order = [team['name'] for team in engine.division_order('A', 'East')]
+    assert order.index('e1') < order.index('e2')
+
+
+def test_three_team_division_tie_restarts_after_each_club():
+    engine = SeasonEngine(league())
+    # e1, e2, e3 all 2-2: e1 beat both others, e2 beat e3
+    play(engine, [('e1', 'e2', 20, 10), ('e1', 'e3', 20, 10), ('w1', 'e1', 20, 10), ('w2', 'e1', 20, 10),
+                  ('e2', 'e3', 20, 10), ('e2', 'w1', 20, 10), ('w2', 'e2', 20, 10),
+                  ('e3', 'w3', 20, 10), ('e3', 'w4', 20, 10)])
+    assert [engine.standings[name]['wins'] for name in ('e1', 'e2', 'e3')] == [2, 2, 2]
+    assert [team['name'] for team in engine.division_order('A', 'East')][:3] == ['e1', 'e2', 'e3']
+
+
+def test_three_team_wildcard_tie_uses_sweep():
+    engine = SeasonEngine(league())
+    # e2, w2 and n2 from different divisions all 2-2; e2 swept the other two, then w2 beat n2
+    play(engine, [('e2', 'w2', 20, 10), ('e2', 'n2', 20, 10), ('s1', 'e2', 20, 10), ('s2', 'e2', 20, 10),
+                  ('w2', 'n2', 20, 10), ('w2', 's1', 20, 10), ('s2', 'w2', 20, 10),
+                  ('n2', 's3', 20, 10), ('n2', 's4', 20, 10)])
+    tables = engine.tiebreakers
+    assert names(engine, tables.order(ids(engine, 'n2', 'w2', 'e2'), 'wildcard')) == ['e2', 'w2', 'n2']
+
+
+def test_three_team_wildcard_tie_without_sweep_goes_to_conference_record():
+    engine = SeasonEngine(league())
+    # A cycle e2 > w2 > n2 > e2 leaves no sweep; n2 has the best conference record (2-1),
+    # then the two-team tie between e2 and w2 goes back to head-to-head
+    play(engine, [('e2', 'w2', 20, 10), ('w2', 'n2', 20, 10), ('n2', 'e2', 20, 10),
+                  ('e2', 's1', 20, 10), ('e3', 'e2', 20, 10),
+                  ('w2', 's2', 20, 10), ('w3', 'w2', 20, 10),
+                  ('n2', 'n3', 20, 10), ('s3', 'n2', 20, 10)])
+    assert [engine.standings[name]['wins'] for name in ('e2', 'w2', 'n2')] == [2, 2, 2]
+    tables = engine.tiebreakers
+    assert tables.head_to_head_sweep(ids(engine, 'e2', 'w2', 'n2')) is None
+    assert names(engine, tables.order(ids(engine, 'e2', 'w2', 'n2'), 'wildcard')) == ['n2', 'e2', 'w2']
+
+
+def test_wildcard_tie_within_a_division_keeps_only_the_division_leader():
+    engine = SeasonEngine(league())
+    # e2 and e3 tied 1-1 in the same division with e3 ahead on head-to-head, w2 also 1-1.
+    # e2 drops out first, then e3 (1-0 in the conference) beats w2 (0-0) on conference record
+    play(engine, [('e3', 'e2', 20, 10), ('e2', 's1', 20, 10), ('s2', 'e3', 20, 10),
+                  ('w2', 's3', 20, 10), ('s4', 'w2', 20, 10)])
+    tables = engine.tiebreakers
+    assert names(engine, [tables.best_of(ids(engine, 'e2', 'e3', 'w2'), 'wildcard')]) == ['e3']
+
+
+def test_common_games_need_four_for_wildcard_ties():
+    engine = SeasonEngine(league())
+    # e2 and w2 share three opponents only
+    play(engine, [('e2', 's1', 20, 10), ('e2', 's2', 20, 10), ('s3', 'e2', 20, 10),
+                  ('w2', 's1', 20, 10), ('s2', 'w2', 20, 10), ('s3', 'w2', 20, 10)])
+    tied = ids(engine, 'e2', 'w2')
+    tables = engine.tiebreakers
+    assert tables.common_opponents(tied) == set(ids(engine, 's1', 's2', 's3'))
+    assert tables.common_games_min_four(tied) is None
+    e2, w2 = tied
+    assert tables.common_games(tied) == {e2: 2 / 3, w2: 1 / 3}
+
+
+def test_strength_of_victory_and_schedule_by_hand():
+    engine = SeasonEngine(league())
+    # Final records: e1 2-0, e2 1-2, e3 0-2, e4 1-0
+    play(engine, [('e1', 'e2', 20, 10), ('e1', 'e3', 20, 10), ('e2', 'e3', 20, 10), ('e4', 'e2', 20, 10)])
+    tables = engine.tiebreakers
+    e1, e2, e3, e4 = ids(engine, 'e1', 'e2', 'e3', 'e4')
+    # e1 beat and played e2 (1-2) and e3 (0-2)
+    assert tables.sov[e1] == [1, 4, 0]
+    assert tables.sos[e1] == [1, 4, 0]
+    # e2 beat e3 (0-2); played e1 (2-0), e3 and e4 (1-0)
+    assert tables.sov[e2] == [0, 2, 0]
+    assert tables.sos[e2] == [3, 2, 0]
+    assert tables.strength_of_victory([e1, e2]) == {e1: 0.2, e2: 0.0}
+
+
+def test_points_rankings_use_competition_ranks():
+    assert competition_ranks({0: 10, 1: 20, 2: 20, 3: 5}, reverse=True) == {1: 1, 2: 1, 0: 3, 3: 4}
+    engine = SeasonEngine(league())
+    play(engine, [('e1', 's1', 30, 10), ('e2', 's2', 30, 20), ('s3', 'e3', 40, 35)])
+    tables = engine.tiebreakers
+    e1, e2, e3 = ids(engine, 'e1', 'e2', 'e3')
+    # Among conference A's 12 teams, scored ranks e3 35 -> 1, e1 = e2 30 -> 2; nine idle teams share
+    # allowed rank 1 at 0 points, then e1 10 -> 10, e2 20 -> 11, e3 40 -> 12
+    ranking = tables.conference_points_ranking([e1, e2, e3])
+    assert ranking == {e1: -12, e2: -13, e3: -13}
+
+
+def table_state(tables):
+    return (tables.h2h, tables.division_record, tables.conference_record, tables.conference_points,
+            tables.sov, tables.sos)
+
+
+def test_incremental_tables_match_a_replay():
+    teams = league()
+    rng = random.Random(7)
+    engine = SeasonEngine(teams)
+    names_ = [team['name'] for team in teams]
+    for step in range(400):
+        slot = (rng.randint(1, 4), rng.randint(0, 7))
+        if rng.random() < 0.25:
+            game_result = None
+        else:
+            home_team, away_team = rng.sample(names_, 2)
+            game_result = {'home_team': home_team, 'away_team': away_team,
+                           'home_score': rng.choice((3, 10, 17, 24)), 'away_score': rng.choice((3, 10, 17, 24))}
+        engine.set_result(*slot, game_result)
+        if step % 20 == 19:
+            replayed = SeasonEngine(teams)
+            for (week, game), result in engine.slots.items():
+                replayed.set_result(week, game, result)
+            assert table_state(engine.tiebreakers) == table_state(replayed.tiebreakers)
+            assert engine.standings.to_dict() == replayed.standings.to_dict()
+            assert engine.playoff_teams() == replayed.playoff_teams()
@@ -0,0 +1,231 @@
+# Fields of a head-to-head row: team's record and points against one opponent
+H2H_WINS, H2H_LOSSES, H2H_TIES, H2H_POINTS_FOR, H2H_POINTS_AGAINST = range(5)
+
+
+def win_pct(wins, losses, ties):
+    games = wins + losses + ties
+    return (wins + 0.5 * ties) / games if games else 0.0
+
+
+# Competition ranking (1, 2, 2, 4, ...) of each team for the given values, best first
+def competition_ranks(values, reverse):
+    ordered = sorted(values.items(), key=lambda item: item[1], reverse=reverse)
+    ranks = {}
+    for position, (team_id, value) in enumerate(ordered):
+        if position and value == ordered[position - 1][1]:
+            ranks[team_id] = ranks[ordered[position - 1][0]]
+        else:
+            ranks[team_id] = position + 1
+    return ranks
+
+
+# Head-to-head, common-opponent and strength aggregates maintained as games are recorded
+class TiebreakTables:
+    def __init__(self, teams, standings):
+        self.teams = teams
+        self.standings = standings
+        num_teams = len(teams)
+        self.conference_of = [team['conference'] for team in teams]
+        self.division_of = [(team['conference'], team['division']) for team in teams]
+        # h2h[a][b] is team a's [wins, losses, ties, points for, points against] against team b
+        self.h2h = [{} for _ in range(num_teams)]
+        self.division_record = [[0, 0, 0] for _ in range(num_teams)]
+        self.conference_record = [[0, 0, 0] for _ in range(num_teams)]
+        self.conference_points = [[0, 0] for _ in range(num_teams)]
+        # Combined [wins, losses, ties] of every opponent beaten (SOV) and played (SOS)
+        self.sov = [[0, 0, 0] for _ in range(num_teams)]
+        self.sos = [[0, 0, 0] for _ in range(num_teams)]
+
+    def overall_record(self, team_id):
+        counters = self.standings.counters
+        return counters['wins'][team_id], counters['losses'][team_id], counters['ties'][team_id]
+
+    def pct(self, team_id):
+        return win_pct(*self.overall_record(team_id))
+
+    # Update the tables for one game; call after the standings store has recorded it
+    def record(self, home_id, away_id, home_score, away_score, sign=1):
+        if home_score > away_score:
+            home_delta, away_delta = (1, 0, 0), (0, 1, 0)
+        elif away_score > home_score:
+            home_delta, away_delta = (0, 1, 0), (1, 0, 0)
+        else:
+            home_delta, away_delta = (0, 0, 1), (0, 0, 1)
+
+        # The two records changed, so every aggregate that includes them moves too
+        for team_id, delta in ((home_id, home_delta), (away_id, away_delta)):
+            for opponent_id, row in self.h2h[team_id].items():
+                games = row[H2H_WINS] + row[H2H_LOSSES] + row[H2H_TIES]
+                for field in range(3):
+                    self.sos[opponent_id][field] += sign * games * delta[field]
+                    self.sov[opponent_id][field] += sign * row[H2H_LOSSES] * delta[field]
+
+        for team_id, opponent_id, delta, points_for, points_against in (
+                (home_id, away_id, home_delta, home_score, away_score),
+                (away_id, home_id, away_delta, away_score, home_score)):
+            row = self.h2h[team_id].setdefault(opponent_id, [0, 0, 0, 0, 0])
+            for field in range(3):
+                row[field] += sign * delta[field]
+            row[H2H_POINTS_FOR] += sign * points_for
+            row[H2H_POINTS_AGAINST] += sign * points_against
+            if not any(row):
+                del self.h2h[team_id][opponent_id]
+
+            opponent_record = self.overall_record(opponent_id)
+            for field in range(3):
+                self.sos[team_id][field] += sign * opponent_record[field]
+                if delta[0]:
+                    self.sov[team_id][field] += sign * opponent_record[field]
+
+            if self.division_of[team_id] == self.division_of[opponent_id]:
+                for field in range(3):
+                    self.division_record[team_id][field] += sign * delta[field]
+            if self.conference_of[team_id] == self.conference_of[opponent_id]:
+                for field in range(3):
+                    self.conference_record[team_id][field] += sign * delta[field]
+                self.conference_points[team_id][0] += sign * points_for
+                self.conference_points[team_id][1] += sign * points_against
+
+    def unrecord(self, home_id, away_id, home_score, away_score):
+        self.record(home_id, away_id, home_score, away_score, sign=-1)
+
+    # Opponents every tied team has played, not counting the tied teams themselves
+    def common_opponents(self, tied):
+        common = set(self.h2h[tied[0]])
+        for team_id in tied[1:]:
+            common &= self.h2h[team_id].keys()
+        return common.difference(tied)
+
+    def _combined(self, team_id, opponents):
+        rows = [self.h2h[team_id][opponent_id] for opponent_id in opponents if opponent_id in self.h2h[team_id]]
+        return [sum(row[field] for row in rows) for field in range(5)]
+
+    # Tiebreaking steps: each maps the tied teams to values (higher is better) or None when not applicable
+
+    def head_to_head(self, tied):
+        records = {team_id: self._combined(team_id, [other for other in tied if other != team_id]) for team_id in tied}
+        if any(sum(record[:3]) == 0 for record in records.values()):
+            return None
+        return {team_id: win_pct(*record[:3]) for team_id, record in records.items()}
+
+    def head_to_head_sweep(self, tied):
+        def swept(team_id, field):
+            return all(other in self.h2h[team_id] and
+                       self.h2h[team_id][other][field] == sum(self.h2h[team_id][other][:3])
+                       for other in tied if other != team_id)
+        for team_id in tied:
+            if swept(team_id, H2H_WINS):
+                return {other: int(other == team_id) for other in tied}
+        losers = [team_id for team_id in tied if swept(team_id, H2H_LOSSES)]
+        if losers:
+            return {team_id: int(team_id not in losers) for team_id in tied}
+        return None
+
+    def division_pct(self, tied):
+        return {team_id: win_pct(*self.division_record[team_id]) for team_id in tied}
+
+    def conference_pct(self, tied):
+        return {team_id: win_pct(*self.conference_record[team_id]) for team_id in tied}
+
+    def common_games(self, tied, minimum=1):
+        opponents = self.common_opponents(tied)
+        records = {team_id: self._combined(team_id, opponents) for team_id in tied}
+        if any(sum(record[:3]) < minimum for record in records.values()):
+            return None
+        return {team_id: win_pct(*record[:3]) for team_id, record in records.items()}
+
+    def common_games_min_four(self, tied):
+        return self.common_games(tied, minimum=4)
+
+    def strength_of_victory(self, tied):
+        return {team_id: win_pct(*self.sov[team_id]) for team_id in tied}
+
+    def strength_of_schedule(self, tied):
+        return {team_id: win_pct(*self.sos[team_id]) for team_id in tied}
+
+    def _points_ranking(self, tied, pool):
+        counters = self.standings.counters
+        scored = competition_ranks({team_id: counters['points_scored'][team_id] for team_id in pool}, reverse=True)
+        allowed = competition_ranks({team_id: counters['points_allowed'][team_id] for team_id in pool}, reverse=False)
+        return {team_id: -(scored[team_id] + allowed[team_id]) for team_id in tied}
+
+    def conference_points_ranking(self, tied):
+        conference = self.conference_of[tied[0]]
+        pool = [team_id for team_id in range(len(self.teams)) if self.conference_of[team_id] == conference]
+        return self._points_ranking(tied, pool)
+
+    def league_points_ranking(self, tied):
+        return self._points_ranking(tied, range(len(self.teams)))
+
+    def common_net_points(self, tied):
+        opponents = self.common_opponents(tied)
+        records = {team_id: self._combined(team_id, opponents) for team_id in tied}
+        return {team_id: record[H2H_POINTS_FOR] - record[H2H_POINTS_AGAINST] for team_id, record in records.items()}
+
+    def conference_net_points(self, tied):
+        return {team_id: self.conference_points[team_id][0] - self.conference_points[team_id][1] for team_id in tied}
+
+    def net_points(self, tied):
+        counters = self.standings.counters
+        return {team_id: counters['points_scored'][team_id] - counters['points_allowed'][team_id] for team_id in tied}
+
+    def procedure(self, kind, num_tied):
+        if kind == 'division':
+            return [self.head_to_head, self.division_pct, self.common_games, self.conference_pct,
+                    self.strength_of_victory, self.strength_of_schedule, self.conference_points_ranking,
+                    self.league_points_ranking, self.common_net_points, self.net_points]
+        head_to_head = self.head_to_head if num_tied == 2 else self.head_to_head_sweep
+        return [head_to_head, self.conference_pct, self.common_games_min_four, self.strength_of_victory,
+                self.strength_of_schedule, self.conference_points_ranking, self.league_points_ranking,
+                self.conference_net_points, self.net_points]
+
+    # Best team among teams with the same record; kind is 'division' or 'wildcard'
+    def best_of(self, tied, kind):
+        tied = list(tied)
+        while len(tied) > 1:
+            if kind == 'wildcard':
+                tied = self._best_per_division(tied)
+                if len(tied) == 1:
+                    break
+            for step in self.procedure(kind, len(tied)):
+                values = step(tied)
+                if values is None:
+                    continue
+                best = max(values.values())
+                survivors = [team_id for team_id in tied if values[team_id] == best]
+                if len(survivors) < len(tied):
+                    # Eliminating any club restarts the procedure for the rest
+                    tied = survivors
+                    break
+            else:
+                # Net touchdowns are not tracked; the coin toss falls to team_data.json order
+                return min(tied)
+        return tied[0]
+
+    # Wildcard ties start by keeping only the highest-ranked club of each division
+    def _best_per_division(self, tied):
+        by_division = {}
+        for team_id in tied:
+            by_division.setdefault(self.division_of[team_id], []).append(team_id)
+        if len(by_division) == len(tied):
+            return tied
+        return [group[0] if len(group) == 1 else self.best_of(group, 'division') for group in by_division.values()]
+
+    # Order teams already sorted by win percentage, breaking each tie; stop after limit teams
+    def order(self, team_ids, kind, limit=None):
+        if limit is None:
+            limit = len(team_ids)
+        ordered = []
+        start = 0
+        while start < len(team_ids) and len(ordered) < limit:
+            end = start + 1
+            pct = self.pct(team_ids[start])
+            while end < len(team_ids) and self.pct(team_ids[end]) == pct:
+                end += 1
+            run = list(team_ids[start:end])
+            while run and len(ordered) < limit:
+                best = run[0] if len(run) == 1 else self.best_of(run, kind)
+                ordered.append(best)
+                run.remove(best)
+            start = end
+        return ordered